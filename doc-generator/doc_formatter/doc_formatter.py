@@ -18,11 +18,15 @@ import sys
 import functools
 from doc_gen_util import DocGenUtilities
 from format_utils import FormatUtils
+from .fragment_cache import FragmentCache
 
 
 class DocFormatter:
     """Generic class for schema documentation formatter"""
 
+    # Rendered fragments, shared by all formatters in this process.
+    fragment_cache = FragmentCache()
+
     def __init__(self, property_data, traverser, config, level=0):
         """Set up the markdown generator.
 
@@ -64,6 +68,17 @@ class DocFormatter:
         # Extend config with some defaults.
         self.config['excluded_pattern_props'] = self.config.get('excluded_pattern_props', [])
 
+        # Compile the exclusion rules from config once, so that filtering costs a set lookup
+        # and (at most) one regexp search per name.
+        self.property_exclusions = self.compile_exclusions(self.config.get('excluded_properties', []),
+                                                           self.config.get('excluded_by_match', []))
+        self.annotation_exclusions = self.compile_exclusions(self.config.get('excluded_annotations', []),
+                                                             self.config.get('excluded_annotations_by_match', []))
+        self.pattern_prop_exclusions = self.compile_exclusions(self.config['excluded_pattern_props'], [])
+        self.schema_exclusions = self.compile_exclusions(self.config.get('excluded_schemas', []),
+                                                         self.config.get('excluded_schemas_by_match', []))
+        self.skipped_schemas = {} # schema_name -> result of skip_schema
+
         # We need this flag to distinguish "slate" markdown from standard markdown:
         self.markdown_mode = config.get('output_format', 'markdown')
 
@@ -130,7 +145,7 @@ class DocFormatter:
         # Don't display version if there is a parent version and this is not newer:
         parent_depth = self.current_depth - 1
         if version and self.current_version.get(parent_depth):
-            if DocGenUtilities.compare_versions(version, self.current_version.get(parent_depth)) <= 0:
+            if DocGenUtilities.version_key(version) <= DocGenUtilities.version_key(self.current_version.get(parent_depth)):
                 version = None
 
 
@@ -466,12 +481,18 @@ class DocFormatter:
     def append_unique_values(self, value_list, target_list):
         """ Unwind possibly-nested list, producing a list of unique strings found. """
 
+        self._append_unique_values(value_list, target_list, set(target_list))
+
+
+    def _append_unique_values(self, value_list, target_list, seen):
+        """ append_unique_values, with a set of the values already in target_list """
+
         for val in value_list:
             if isinstance(val, list):
-                self.append_unique_values(val, target_list)
-            else:
-                if val and val not in target_list:
-                    target_list.append(val)
+                self._append_unique_values(val, target_list, seen)
+            elif val and val not in seen:
+                seen.add(val)
+                target_list.append(val)
 
 
     def output_document(self):
@@ -750,26 +771,33 @@ class DocFormatter:
             warnings.warn("Can't generate fragment for '%(reference)s': could not parse as schema URI." % {'reference': ref})
             return ''
 
-        frag_gen = self.__class__(self.property_data, self.traverser, config, self.level)
-
+        traverser = self.traverser
         if "://" not in ref:
             # Try to find the file locally
             try:
                 filepath = ref.split('#')[0]
-                localpath = os.path.abspath(filepath)
-                fragment_data = DocGenUtilities.load_as_json(localpath)
+                fragment_data = DocGenUtilities.load_as_json(os.path.abspath(filepath))
                 if fragment_data:
                     traverser = self.traverser.copy()
                     traverser.add_schema(filepath, fragment_data)
-                    frag_gen = self.__class__(self.property_data, traverser, config, self.level)
             except Exception as ex:
                 # That's okay, it may still be a URI-style ref without the protocol
                 pass
 
-        prop_info = frag_gen.traverser.find_ref_data(ref)
+        # Fragments are rendered on their own, so the rendering can be reused wherever the same fragment is included.
+        cache_dir = self.config.get('fragment_cache_dir')
+        cache_key = FragmentCache.make_key(self.__class__.__name__, ref, config, self.level, traverser, self.property_data)
+        cached = self.fragment_cache.get(cache_key, cache_dir)
+        if cached:
+            (content, common_properties) = cached
+            self.add_common_properties(common_properties)
+            return content
+
+        # The generator extends its config with defaults. config is shared by the fragments of an intro and is part of
+        # their cache keys, so it should change the same way whether or not a fragment is found in the cache.
+        frag_gen = self.__class__(self.property_data, traverser, dict(config), self.level)
 
-        # Give frag_gen our common_properties to share. This way, we get the updates.
-        frag_gen.common_properties = self.common_properties
+        prop_info = frag_gen.traverser.find_ref_data(ref)
 
         if not prop_info:
             warnings.warn("Can't generate fragment for '%(reference)s': could not find data." % {'reference': ref})
@@ -794,7 +822,20 @@ class DocFormatter:
             if formatted['action_details']:
                 frag_gen.add_action_details(formatted['action_details'])
 
-        return frag_gen.emit()
+        content = frag_gen.emit()
+
+        # Pick up any common properties found in the fragment.
+        self.add_common_properties(frag_gen.common_properties)
+        self.fragment_cache.put(cache_key, content, frag_gen.common_properties, cache_dir)
+
+        return content
+
+
+    def add_common_properties(self, common_properties):
+        """ Add common properties found elsewhere (for example, in a fragment), keeping any we already have """
+        for ref_key, ref_info in common_properties.items():
+            if self.common_properties.get(ref_key) is None:
+                self.common_properties[ref_key] = ref_info
 
 
     def generate_common_properties_doc(self):
@@ -1196,8 +1237,7 @@ class DocFormatter:
                         latest_ref = this_ref
                         latest_version = cleaned_version
                     else:
-                        compare = DocGenUtilities.compare_versions(latest_version, cleaned_version)
-                        if compare < 0:
+                        if DocGenUtilities.version_key(latest_version) < DocGenUtilities.version_key(cleaned_version):
                             latest_version = cleaned_version
                     if match_ref != unversioned_ref: # These are not all versions of the same thing
                         break
@@ -1236,8 +1276,7 @@ class DocFormatter:
     def organize_prop_names(self, prop_names):
         """ Strip out excluded property names, sorting the remainder """
 
-        prop_names = self.exclude_prop_names(prop_names, self.config['excluded_properties'],
-                                       self.config['excluded_by_match'])
+        prop_names = self.filter_excluded_names(prop_names, self.property_exclusions)
         prop_names.sort(key=str.lower)
         return prop_names
 
@@ -1257,17 +1296,13 @@ class DocFormatter:
         if 'Parameters' in subset:
             subsection = 'Parameters'
 
-        filtered_names = []
+        instructions = subset.get(subsection, {})
         if subset.get('Baseline') or subset.get('Include') or subset.get('Version'):
-            filtered_names = [x for x in prop_names]
-            for name, instrs in subset.get(subsection, {}).items():
-                if not instrs.get('Include', True):
-                    if name in filtered_names:
-                        filtered_names.remove(name)
+            omitted = {name for name, instrs in instructions.items() if not instrs.get('Include', True)}
+            filtered_names = [x for x in prop_names if x not in omitted]
         else:
-            for name, instrs in subset.get(subsection, {}).items():
-                if instrs.get('Include', True) and name not in filtered_names:
-                    filtered_names.append(name)
+            # dict keys are already unique, and preserve the subset's ordering.
+            filtered_names = [name for name, instrs in instructions.items() if instrs.get('Include', True)]
 
         return filtered_names
 
@@ -1289,26 +1324,39 @@ class DocFormatter:
                 profile_props = [x for x in profile.keys()]
             else:
                 profile_props = [x for x in profile.get('PropertyRequirements', {}).keys()]
+            profile_props_seen = set(profile_props)
             for x in schema_requires:
-                if x not in profile_props:
+                if x not in profile_props_seen:
                     profile_props.append(x)
+                    profile_props_seen.add(x)
 
             if profile.get('ActionRequirements'):
                 profile_props.append('Actions')
+                profile_props_seen.add('Actions')
 
             if is_action:
-                # Action properties typically start with "#SchemaName.", which is not reflected in the profile:
+                # Action properties typically start with "#SchemaName.", which is not reflected in the profile.
+                # Index the names by their final dotted segment, keeping the first occurrence:
+                names_present = set(prop_names)
+                requires_present = set(schema_requires)
+                names_by_suffix = {}
+                for x in prop_names:
+                    if '.' in x:
+                        names_by_suffix.setdefault(x.rsplit('.', 1)[1], x)
                 filtered = []
                 for prop in profile_props:
-                    if prop in prop_names or prop in schema_requires:
+                    if prop in names_present or prop in requires_present:
                         filtered.append(prop)
-                    else:
+                    elif '.' in prop:
+                        # Unusual; fall back to scanning.
                         matches = [x for x in prop_names if x.endswith('.' + prop)]
                         if matches:
                             filtered.append(matches[0])
+                    elif prop in names_by_suffix:
+                        filtered.append(names_by_suffix[prop])
                 prop_names = filtered
             else:
-                prop_names = list(set(prop_names) & set(profile_props))
+                prop_names = list(set(prop_names) & profile_props_seen)
 
         prop_names.sort(key=str.lower)
         return prop_names
@@ -1317,27 +1365,19 @@ class DocFormatter:
     def exclude_annotations(self, prop_names):
         """ Strip out excluded annotations, sorting the remainder """
 
-        return self.exclude_prop_names(prop_names, self.config.get('excluded_annotations', []),
-                                       self.config.get('excluded_annotations_by_match', []))
+        return self.filter_excluded_names(prop_names, self.annotation_exclusions)
 
 
     def exclude_prop_names(self, prop_names, props_to_exclude, props_to_exclude_by_match):
         """Strip out excluded property names, and sort the remainder."""
 
-        # Strip out properties based on exact match:
-        prop_names = [x for x in prop_names if x not in props_to_exclude]
+        return self.filter_excluded_names(prop_names, self.compile_exclusions(props_to_exclude, props_to_exclude_by_match))
 
-        # Strip out properties based on partial match:
-        included_prop_names = []
-        for prop_name in prop_names:
-            excluded = False
-            for prop in props_to_exclude_by_match:
-                if prop in prop_name:
-                    excluded = True
-                    break
-            if not excluded:
-                included_prop_names.append(prop_name)
 
+    def filter_excluded_names(self, prop_names, exclusions):
+        """Strip out names matched by exclusions (from compile_exclusions), and sort the remainder."""
+
+        included_prop_names = [x for x in prop_names if not self.matches_exclusions(x, exclusions)]
         included_prop_names.sort(key=str.lower)
         return included_prop_names
 
@@ -1345,6 +1385,15 @@ class DocFormatter:
     def skip_schema(self, schema_name):
         """ True if this schema should be skipped in the output """
 
+        skip = self.skipped_schemas.get(schema_name)
+        if skip is None:
+            skip = self.skipped_schemas[schema_name] = self._skip_schema(schema_name)
+        return skip
+
+
+    def _skip_schema(self, schema_name):
+        """ Uncached implementation of skip_schema """
+
         if self.config.get('profile_mode'):
             if schema_name in self.config.get('profile', {}).get('Resources', {}):
                 return False
@@ -1353,12 +1402,33 @@ class DocFormatter:
             if schema_name not in self.config.get('subset_resources').keys():
                 return True
 
-        if schema_name in self.config.get('excluded_schemas', []):
+        return self.matches_exclusions(schema_name, self.schema_exclusions)
+
+
+    @staticmethod
+    def compile_exclusions(exact_names, names_by_match):
+        """ Compile lists of exact-match and partial-match (substring) names into an exclusions object
+        for use with matches_exclusions. Identical lists share a compiled result. """
+        return DocFormatter._compile_exclusions(tuple(exact_names or []), tuple(names_by_match or []))
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _compile_exclusions(exact_names, names_by_match):
+        """ Returns a tuple of (frozenset of exact names, compiled regexp or None). """
+        pattern = None
+        if names_by_match:
+            pattern = re.compile('|'.join([re.escape(x) for x in sorted(set(names_by_match))]))
+        return (frozenset(exact_names), pattern)
+
+
+    @staticmethod
+    def matches_exclusions(name, exclusions):
+        """ True if name is excluded by exclusions, as produced by compile_exclusions. """
+        (exact_names, pattern) = exclusions
+        if name in exact_names:
             return True
-        for pattern in self.config.get('excluded_schemas_by_match', []):
-            if pattern in schema_name:
-                return True
-        return False
+        return pattern is not None and pattern.search(name) is not None
 
 
     def parse_property_info(self, schema_ref, prop_name, prop_infos, prop_path):
@@ -2121,7 +2191,7 @@ class DocFormatter:
             # If this is an action parameter, don't list the pattern here (we'll catch it in action details):
             if not ('Actions' in prop_path and len(prop_path) > prop_path.index('Actions') + 1):
                 patterns = prop_info['patternProperties'].keys()
-                patterns_to_include = self.exclude_prop_names(patterns, self.config['excluded_pattern_props'], [])
+                patterns_to_include = self.filter_excluded_names(patterns, self.pattern_prop_exclusions)
 
                 for pattern in patterns_to_include:
                     prop_name = '(pattern)'
@@ -0,0 +1,117 @@
+# Copyright Notice:
+# Copyright 2022 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/main/LICENSE.md
+
+"""
+File : fragment_cache.py
+
+Brief : Cache of rendered schema fragments (#include_fragment in intro and postscript content).
+
+Rendered fragments are kept in memory for the rest of the run, so every document that includes the same
+fragment shares one rendering. If a cache directory is supplied, they are also saved there for later runs.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import warnings
+
+from doc_gen_util import DocGenUtilities
+from schema_traverser import SchemaTraverser
+
+
+class FragmentCache:
+    """ Rendered fragments, keyed by what they are rendered from: formatter, fragment ref, level, fragment
+    config, and the schemas the fragment refers to.
+
+    Each entry holds the rendered content and the common properties the fragment recorded while it was
+    rendered, so that a cache hit has the same effect on the including document as rendering the fragment.
+    """
+
+    def __init__(self):
+        self.entries = {}       # key: (content, common_properties)
+
+
+    @staticmethod
+    def make_key(formatter_name, ref, config, level, traverser, property_data):
+        """ Make a cache key for the fragment at ref, to be rendered from traverser and property_data """
+        key_data = [formatter_name, ref, level, config, FragmentCache.schema_digest(ref, traverser, property_data)]
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+    @staticmethod
+    def schema_digest(ref, traverser, property_data):
+        """ Digest of the schemas that the data at ref refers to, directly or indirectly, with their processed
+        property data. Only the definitions reachable from ref are followed, so that a fragment doesn't
+        depend on every schema a large schema links to. """
+        schema_refs = set()
+        seen = set()
+        pending = [ref]
+        while pending:
+            this_ref = pending.pop()
+            if this_ref in seen:
+                continue
+            seen.add(this_ref)
+            schema_ref, path = SchemaTraverser.get_schema_ref_and_path(this_ref)
+            schema_refs.add(schema_ref)
+            # Versioned definitions are also looked up through their unversioned schema.
+            unversioned_ref = DocGenUtilities.make_unversioned_ref(this_ref)
+            if unversioned_ref:
+                pending.append(unversioned_ref)
+
+            data = traverser.schemas.get(schema_ref)
+            for element in [x for x in path.split('/') if x]:
+                data = data.get(element) if isinstance(data, dict) else None
+            nodes = [data]
+            while nodes:
+                node = nodes.pop()
+                if isinstance(node, dict):
+                    node_ref = node.get('$ref')
+                    if isinstance(node_ref, str) and '#' in node_ref:
+                        pending.append(schema_ref + node_ref if node_ref.startswith('#') else node_ref)
+                    nodes.extend(node.values())
+                elif isinstance(node, list):
+                    nodes.extend(node)
+
+        data = [[x, traverser.schemas.get(x), property_data.get(x)] for x in sorted(schema_refs)]
+        return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+    def get(self, key, cache_dir=None):
+        """ Get the (content, common_properties) cached for key, or None """
+        if key not in self.entries and cache_dir:
+            cache_file = os.path.join(cache_dir, key + '.json')
+            if os.path.isfile(cache_file):
+                try:
+                    with open(cache_file, encoding='utf-8') as f:
+                        cached = json.load(f)
+                    self.entries[key] = (cached['content'], cached['common_properties'])
+                except (OSError, ValueError, KeyError) as ex:
+                    warnings.warn('Unable to read cached fragment "%(file)s": %(message)s' % {'file': cache_file, 'message': str(ex)})
+
+        if key in self.entries:
+            # Documents update the common properties they pick up, so each gets its own copy.
+            (content, common_properties) = self.entries[key]
+            return (content, copy.deepcopy(common_properties))
+        return None
+
+
+    def put(self, key, content, common_properties, cache_dir=None):
+        """ Cache a rendered fragment, and the common properties it recorded """
+        self.entries[key] = (content, copy.deepcopy(common_properties))
+
+        if cache_dir:
+            cache_file = os.path.join(cache_dir, key + '.json')
+            try:
+                cached = json.dumps({'content': content, 'common_properties': common_properties})
+            except (TypeError, ValueError):
+                # Not everything a fragment records is guaranteed to be JSON; such fragments are cached in memory only.
+                return
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_file + '.tmp', 'w', encoding='utf-8') as f:
+                    f.write(cached)
+                os.replace(cache_file + '.tmp', cache_file)
+            except OSError as ex:
+                warnings.warn('Unable to write cached fragment "%(file)s": %(message)s' % {'file': cache_file, 'message': str(ex)})
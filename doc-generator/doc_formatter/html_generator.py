@@ -12,7 +12,6 @@ Initial author: Second Rise LLC.
 
 import copy
 import html
-import markdown
 import warnings
 from doc_gen_util import DocGenUtilities
 from format_utils import HtmlUtils
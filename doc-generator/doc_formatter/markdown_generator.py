@@ -855,9 +855,11 @@ class MarkdownGenerator(DocFormatter):
 
         import urllib
 
-        toc = ''
-        output_blob = ''
-        anchors_seen = []
+        toc = []
+        output_lines = []
+        anchors_seen = set()
+        # Next suffix to try for each heading anchor; every suffix below it is already in use.
+        anchor_suffixes = {}
         for line in markdown_blob.splitlines():
             heading = None
             if line.startswith('# '):
@@ -872,16 +874,21 @@ class MarkdownGenerator(DocFormatter):
                 anchor = urllib.parse.quote(heading.lower().replace(' ', '-'))
                 if anchor in anchors_seen:
                     initial_anchor = anchor
-                    num = 0
+                    num = anchor_suffixes.get(initial_anchor, 1)
+                    anchor = initial_anchor + '-' + str(num)
                     while anchor in anchors_seen:
                         num = num + 1
                         anchor = initial_anchor + '-' + str(num)
-                anchors_seen.append(anchor)
+                    anchor_suffixes[initial_anchor] = num + 1
+                anchors_seen.add(anchor)
 
-                toc += self.formatter.para(('   ' * indent) + '- [' + heading + '](#' + anchor + ')')
+                toc.append(self.formatter.para(('   ' * indent) + '- [' + heading + '](#' + anchor + ')'))
                 line = prefix + '<a name="' + anchor + '"></a>' + heading
 
-            output_blob = output_blob + '\n' + line
+            output_lines.append(line)
+
+        toc = ''.join(toc)
+        output_blob = ''.join(['\n' + line for line in output_lines])
 
         if '[add_toc]' in output_blob:
             output_blob = output_blob.replace('[add_toc]', toc, 1)
@@ -17,7 +17,6 @@ Initial author: Second Rise LLC.
 import copy
 import json
 import html
-import markdown
 import warnings
 from doc_gen_util import DocGenUtilities
 from . import DocFormatter
@@ -48,6 +47,8 @@ class PropertyIndexGenerator(DocFormatter):
         self.coalesced_properties = {}
         # Shorthand for the overrides.
         self.overrides = config.get('description_overrides', {})
+        # Sets of the schema paths listed in each override entry, by id of the entry (see get_override_description).
+        self.override_schemas = {}
 
         # Force some config here:
         self.config['omit_version_in_headers'] = True # This puts just the schema name in the section head.
@@ -159,20 +160,7 @@ class PropertyIndexGenerator(DocFormatter):
             }
 
         # Check for an override:
-        override_description = False
-        if self.overrides.get(prop_name):
-            for override_entry in self.overrides.get(prop_name):
-                if not override_entry.get('overrideDescription'):
-                    continue
-                if override_entry.get('globalOverride') and override_entry.get('type') == prop_type:
-                    override_description = override_entry.get('overrideDescription')
-                    if override_description:
-                        break
-                elif override_entry.get('type') == prop_type and '/'.join(schema_path) in override_entry.get('schemas', []):
-                    override_description = override_entry.get('overrideDescription')
-                    if override_description:
-                        break
-
+        override_description = self.get_override_description(prop_name, prop_type, schema_path)
 
         if override_description:
             description_entry['description'] = override_description
@@ -188,15 +176,34 @@ class PropertyIndexGenerator(DocFormatter):
             self.properties_by_name[prop_name].append(description_entry)
 
 
+    def get_override_description(self, prop_name, prop_type, schema_path):
+        """ Get the overrideDescription from config for this property name, type, and schema path, or False. """
+
+        for override_entry in self.overrides.get(prop_name, []):
+            if not override_entry.get('overrideDescription'):
+                continue
+            if override_entry.get('type') != prop_type:
+                continue
+            if override_entry.get('globalOverride'):
+                return override_entry['overrideDescription']
+
+            # The schemas lists can be long, so look them up in sets:
+            override_schemas = self.override_schemas.get(id(override_entry))
+            if override_schemas is None:
+                override_schemas = self.override_schemas[id(override_entry)] = set(override_entry.get('schemas', []))
+            if '/'.join(schema_path) in override_schemas:
+                return override_entry['overrideDescription']
+
+        return False
+
+
     def append_unique_values(self, value_list, target_list):
         """ Unwind possibly-nested list, producing a list of unique strings found.
 
         We don't want nulls reflected in the property index!
         """
         super(PropertyIndexGenerator, self).append_unique_values(value_list, target_list)
-        for i in range(0, len(target_list)):
-            if target_list[i] == 'null':
-                del target_list[i]
+        target_list[:] = [x for x in target_list if x != 'null']
 
 
     def format_property_details(self, prop_name, prop_type, prop_description, enum, enum_details,
@@ -269,22 +276,12 @@ class PropertyIndexGenerator(DocFormatter):
 
         # Group the property info by prop_name, type, description:
         coalesced_info = {}
-        prop_names = self.exclude_prop_names(self.properties_by_name.keys(),
-                                             self.config['excluded_properties'],
-                                             self.config['excluded_by_match'])
+        prop_names = self.filter_excluded_names(self.properties_by_name.keys(), self.property_exclusions)
 
         for property_name in prop_names:
-            property_infos = self.properties_by_name[property_name]
-            coalesced_info[property_name] = {}
-            for info in property_infos:
-                prop_type = info['prop_type']
-                description = info['description']
-                schemas = info['schemas']
-                if prop_type not in coalesced_info[property_name]:
-                    coalesced_info[property_name][prop_type] = {}
-                if description not in coalesced_info[property_name][prop_type]:
-                    coalesced_info[property_name][prop_type][description] = []
-                coalesced_info[property_name][prop_type][description] += schemas
+            by_type = coalesced_info[property_name] = {}
+            for info in self.properties_by_name[property_name]:
+                by_type.setdefault(info['prop_type'], {}).setdefault(info['description'], []).extend(info['schemas'])
 
         self.coalesced_properties = coalesced_info
 
@@ -361,26 +358,49 @@ class PropertyIndexGenerator(DocFormatter):
             if over_info.get('type') == prop_type and over_info.get('globalOverride', False):
                 return
 
+        # Index the prop_config entries for this type once, for all of the descriptions.
+        config_index = self.make_config_index(prop_type, prop_config)
+
         # check each entry against prop_config
         descriptions = sorted(info[prop_type].keys(), key=str.lower)
         for description in descriptions:
-            self.update_config_for_prop_name_and_type_and_description(prop_name, prop_type, description, info, prop_config)
+            self.update_config_for_prop_name_and_type_and_description(prop_name, prop_type, description, info, prop_config,
+                                                                     config_index)
 
 
-    def update_config_for_prop_name_and_type_and_description(self, prop_name, prop_type, description, info, prop_config):
-        """ Update a property name/type/description selection of prop_config based on coalesced info. Updates prop_config. """
+    @staticmethod
+    def make_config_index(prop_type, prop_config):
+        """ Index the prop_config entries for prop_type.
+
+        by_schema maps each schema listed to its (last) entry, by_description maps each description to its first
+        entry, and position maps the id of each entry to its position in prop_config. """
+        config_index = {'by_schema': {}, 'by_description': {}, 'position': {}}
+        for i, config in enumerate(prop_config):
+            # Note, we ignore globalOverrides in this method.
+            if config.get('type') == prop_type:
+                config_index['position'][id(config)] = i
+                config_index['by_description'].setdefault(config.get('description'), config)
+                for schema in config.get('schemas', []):
+                    config_index['by_schema'][schema] = config
+        return config_index
+
+
+    def update_config_for_prop_name_and_type_and_description(self, prop_name, prop_type, description, info, prop_config,
+                                                                 config_index=None):
+        """ Update a property name/type/description selection of prop_config based on coalesced info. Updates prop_config.
+
+        config_index, if supplied, is from make_config_index, and is kept up to date with prop_config. """
 
         """ Info is arranged by prop_name: prop_type: description: schemas (list).
         prop_config, conversely, is arranged as a list of dicts with keys schemas, type, description, overrideDescription, knownException.
 
         If we applied an override, the description in "info" will match the overrideDescription in prop_config. """
 
-        config_by_schema = {}
-        for config in prop_config:
-            # Note, we ignore globalOverrides in this method.
-            if config.get('type') == prop_type:
-                for schema in config.get('schemas', []):
-                    config_by_schema[schema] = config
+        if config_index is None:
+            config_index = self.make_config_index(prop_type, prop_config)
+        config_by_schema = config_index['by_schema']
+        config_by_description = config_index['by_description']
+        position = config_index['position']
 
         schemas = info[prop_type][description]
         for schema_path in schemas:
@@ -388,20 +408,31 @@ class PropertyIndexGenerator(DocFormatter):
 
             if config_by_schema.get(schema_name):
                 # We have an entry for this schema name. It's still good if it has an overrideDescription, or if the description matches.
-                if config_by_schema[schema_name].get('overrideDescription'):
+                config = config_by_schema[schema_name]
+                if config.get('overrideDescription'):
                     break
-                elif config_by_schema[schema_name].get('description') == description:
+                elif config.get('description') == description:
                     break
                 else:
-                    config_by_schema[schema_name]['description'] = description
-                    config_by_schema[schema_name]['knownException'] = False
+                    old_description = config.get('description')
+                    config['description'] = description
+                    config['knownException'] = False
+
+                    # Keep the first entry for each description current:
+                    first = config_by_description.get(description)
+                    if first is None or position[id(config)] < position[id(first)]:
+                        config_by_description[description] = config
+                    if config_by_description.get(old_description) is config:
+                        del config_by_description[old_description]
+                        for later_config in prop_config[position[id(config)] + 1:]:
+                            if later_config.get('type') == prop_type and later_config.get('description') == old_description:
+                                config_by_description[old_description] = later_config
+                                break
 
             else:
                 # If we already have this description, add the schema there.
-                for config in prop_config:
-                    if config.get('type') == prop_type and config.get('description') == description:
-                        config['schemas'].append(schema_name)
-                        break
+                if config_by_description.get(description):
+                    config_by_description[description]['schemas'].append(schema_name)
 
                 # We didn't find a matching description, so create a new entry:
                 found_entry = {
@@ -410,8 +441,10 @@ class PropertyIndexGenerator(DocFormatter):
                     'knownException': False,
                     "schemas": [ schema_name ]
                     }
+                position[id(found_entry)] = len(prop_config)
                 prop_config.append(found_entry)
                 config_by_schema[schema_name] = found_entry
+                config_by_description.setdefault(description, found_entry)
 
 
     def escape_text(self, text, chars=None):
@@ -12,7 +12,8 @@ Brief: Utility method(s) needed by multiple doc generator classes.
 Initial author: Second Rise LLC.
 """
 
-import urllib.request
+import functools
+import urllib.parse
 import json
 import os
 import re
@@ -57,6 +58,7 @@ class DocGenUtilities:
             if 'odata.json' in uri:
                 return None
 
+            import urllib.request
             f = urllib.request.urlopen(uri, None, DocGenUtilities.timeout)
             json_string = f.read().decode('utf-8')
             json_data = json.loads(json_string)
@@ -74,6 +76,7 @@ class DocGenUtilities:
             if '://' not in uri:
                 uri = 'http://' + uri
 
+            import urllib.request
             f = urllib.request.urlopen(uri, None, DocGenUtilities.timeout)
             return f.read().decode('utf-8')
 
@@ -116,35 +119,41 @@ class DocGenUtilities:
         filenames = [os.path.join(path, x) for x in filenames]
         return filenames
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def version_key(version):
+        """ Parse a version string such as "1.2.3", "1_2_3" or "1.2" into a tuple of three ints.
+
+        Missing parts are filled in with 0. The tuples compare in version order, so this is
+        suitable as a sort key. Results are cached, since the same few hundred version strings
+        are compared over and over.
+        """
+        if '_' in version:
+            sep = '_'
+        else:
+            sep = '.'
+        version_parts = version.split(sep)
+
+        # versions are expected to have three parts, but fill in 0 if not
+        while len(version_parts) < 3:
+            version_parts.append("0")
+        return (int(version_parts[0]), int(version_parts[1]), int(version_parts[2]))
+
+
     @staticmethod
     def compare_versions(version, context_version):
         """ Returns +1 if version is newer than context_version, -1 if version is older, 0 if equal """
 
         if version == context_version:
             return 0
-        else:
-            if '_' in version:
-                sep = '_'
-            else:
-                sep = '.'
-            version_parts = version.split(sep)
-            if '_' in context_version:
-                sep = '_'
-            else:
-                sep = '.'
-            context_parts = context_version.split(sep)
-
-            # versions are expected to have three parts, but fill in 0 if not
-            while len(version_parts) < 3:
-                version_parts.append("0")
-            while len(context_parts) < 3:
-                context_parts.append("0")
-            for i in range(3):
-                if int(version_parts[i]) > int(context_parts[i]):
-                    return 1
-                if int(version_parts[i]) < int(context_parts[i]):
-                    return -1
-            return 0
+
+        version_key = DocGenUtilities.version_key(version)
+        context_key = DocGenUtilities.version_key(context_version)
+        if version_key > context_key:
+            return 1
+        if version_key < context_key:
+            return -1
+        return 0
 
 
     @staticmethod
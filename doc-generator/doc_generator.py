@@ -14,12 +14,13 @@ Initial author: Second Rise LLC.
 import os
 import re
 import sys
-import argparse
 import json
 import copy
 import functools
 import warnings
 import gettext
+import hashlib
+import time
 import urllib
 from doc_gen_util import DocGenUtilities
 from schema_traverser import SchemaTraverser
@@ -32,16 +33,36 @@ class InfoWarning(UserWarning):
 class DocGenerator:
     """Redfish Documentation Generator class. Provides 'generate_docs' method."""
 
+    # Format version of saved processed data (see save_processed_data). Increment it when the processed data changes
+    # in ways that earlier saved data would not match.
+    PROCESSED_DATA_VERSION = 1
+
+    # Config entries produced by compile_config, and the format version of their cache (see config_cache_key).
+    COMPILED_CONFIG_KEYS = ['payloads', 'md_supplements', 'subset_resources', 'profile', 'profile_protocol', 'profile_resources']
+    COMPILED_CONFIG_VERSION = 1
+
     def __init__(self, import_from, outfile, config):
         self.config = config
         self.import_from = import_from
         self.outfile = outfile
         self.property_data = {} # This is an object property for ease of testing.
         self.schema_ref_to_filename = {}
+        self.translated_data = {} # Localized schema data, by filename. Loaded on demand.
+        self.processed_snapshots = None # Pickled processed schemas, by prune setting. See watch and generate_outputs.
+        self.grouped_schemas = None # The grouped schema files, shared by several documents. See generate_profile_docs.
+        self.retrieved_data = {} # Required profiles and registries, by URI, retrieved once per run.
+        self.retrieved_links = {} # Links in profile and registry repositories, by repository.
         self.config['payloads'] = None
 
+        self.setup_environment()
+        self.compile_config()
+
+
+    def setup_environment(self):
+        """ Install the translations for the configured locale, and our simplified warning format. """
+
         # Localization
-        languages = [config.get('locale', 'en')]
+        languages = [self.config.get('locale', 'en')]
         localedir = os.path.join(os.path.dirname(__file__), 'locale')
         translations = gettext.translation('doc_generator', localedir=localedir, languages=languages)
         translations.install()
@@ -60,31 +81,40 @@ class DocGenerator:
         warnings.formatwarning = simple_warning_format
 
 
+    def compile_config(self):
+        """ Read and process the inputs named in the config: JSON payloads, markdown supplements, and the subset or
+        profile (with its required profiles and registries). The results are added to self.config.
+
+        If config['config_cache_dir'] is specified, the results are saved there, and later runs with the same
+        inputs use them instead.
+        """
+        config = self.config
+
+        cache_file = None
+        if config.get('config_cache_dir'):
+            cache_file = os.path.join(config['config_cache_dir'], self.config_cache_key() + '.json')
+            compiled = self.load_compiled_config(cache_file)
+            if compiled is not None:
+                config.update(compiled)
+                return
+
         if config.get('payload_dir'):
             payload_dir = config.get('payload_dir')
             config['payloads'] = {}
             payload_filenames = [x for x in os.listdir(payload_dir) if x.endswith('.json')]
             for name in payload_filenames:
-                f = open(os.path.join(payload_dir, name), 'r')
-                data = f.read()
+                data = self.read_payload(os.path.join(payload_dir, name))
                 if data:
                     config['payloads'][name] = data
 
         if config.get('supplement_md_dir'):
-            import parse_md_supplement
             supplement_dir = config.get('supplement_md_dir')
             config['md_supplements'] = {}
             supplement_files = [x for x in os.scandir(supplement_dir) if (x.is_file() and x.name.endswith('.md')) ]
             for direntry in supplement_files:
                 schema_name = direntry.name[:-3]
-                f = open(direntry.path, 'r')
-                try:
-                    md_data = f.read()
-                except Exception as ex:
-                    warnings.warn('Problem with supplemental file "%(filename)s": %(ex)s' %
-                                      {'filename': direntry.path, 'ex': str(ex)})
-                if md_data:
-                    parsed_data = parse_md_supplement.parse_markdown_supplement(md_data, direntry.name)
+                parsed_data = self.read_md_supplement(direntry.path)
+                if parsed_data:
                     config['md_supplements'][schema_name] = parsed_data
 
         if config.get('subset_mode'):
@@ -108,48 +138,276 @@ class DocGenerator:
             self.config['subset_resources'] = subset_resources
 
         if config.get('profile_mode'):
-            config['profile'] = DocGenUtilities.load_as_json(config.get('profile_doc'))
-            profile_merged = {}
-
-            if 'RequiredProfiles' in config['profile']:
-                for req_profile_name in config['profile']['RequiredProfiles'].keys():
-                    profile_merged = self.merge_required_profile(
-                        profile_merged, req_profile_name,
-                        config['profile']['RequiredProfiles'][req_profile_name])
-
-            if 'Registries' in config['profile'] and config['profile_mode']:
-                config['profile']['registries_annotated'] = {}
-                for registry_name in config['profile']['Registries'].keys():
-                    registry_summary = self.process_registry(registry_name,
-                                                             config['profile']['Registries'][registry_name])
-                    config['profile']['registries_annotated'][registry_name] = registry_summary
-
-            profile_resources = self.merge_dicts(profile_merged.get('Resources', {}),
-                                                     self.config.get('profile', {}).get('Resources', {}))
-
-            profile_protocol = self.merge_dicts(profile_merged.get('Protocol', {}),
-                                                    self.config.get('profile', {}).get('Protocol', {}))
-            self.config['profile_protocol'] = profile_protocol
-
-            if not profile_resources:
-                warnings.warn('No profile resource data found; unable to produce profile mode documentation.')
-                sys.exit()
+            self.compile_profile(config)
+
+        if cache_file:
+            compiled = {x: config[x] for x in self.COMPILED_CONFIG_KEYS if x in config}
+            self.save_compiled_config(cache_file, compiled)
+
+
+    @staticmethod
+    def read_payload(path):
+        """ Read a JSON payload file. Returns its contents, or None if it can't be read. """
+        try:
+            with open(path, 'r') as f:
+                return f.read()
+        except OSError as ex:
+            warnings.warn('Unable to read payload file "%(filename)s": %(ex)s' % {'filename': path, 'ex': str(ex)})
+        return None
+
+
+    @staticmethod
+    def read_md_supplement(path):
+        """ Read and parse a markdown supplement file. Returns the parsed data, or None if it is empty or can't be read. """
+        import parse_md_supplement
+        md_data = None
+        try:
+            with open(path, 'r') as f:
+                md_data = f.read()
+        except Exception as ex:
+            warnings.warn('Problem with supplemental file "%(filename)s": %(ex)s' % {'filename': path, 'ex': str(ex)})
+        if md_data:
+            return parse_md_supplement.parse_markdown_supplement(md_data, os.path.basename(path))
+        return None
+
+
+    def compile_profile(self, config):
+        """ Read the profile named in config['profile_doc'], merge in its required profiles, and annotate its
+        registries. The results are added to config. """
+        config['profile'] = DocGenUtilities.load_as_json(config.get('profile_doc'))
+        profile_merged = {}
+
+        if 'RequiredProfiles' in config['profile']:
+            for req_profile_name in config['profile']['RequiredProfiles'].keys():
+                profile_merged = self.merge_required_profile(
+                    profile_merged, req_profile_name,
+                    config['profile']['RequiredProfiles'][req_profile_name])
+
+        if 'Registries' in config['profile'] and config['profile_mode']:
+            config['profile']['registries_annotated'] = {}
+            for registry_name in config['profile']['Registries'].keys():
+                registry_summary = self.process_registry(registry_name,
+                                                         config['profile']['Registries'][registry_name])
+                config['profile']['registries_annotated'][registry_name] = registry_summary
+
+        profile_resources = self.merge_dicts(profile_merged.get('Resources', {}),
+                                             config.get('profile', {}).get('Resources', {}))
+
+        profile_protocol = self.merge_dicts(profile_merged.get('Protocol', {}),
+                                            config.get('profile', {}).get('Protocol', {}))
+        config['profile_protocol'] = profile_protocol
+
+        if not profile_resources:
+            warnings.warn('No profile resource data found; unable to produce profile mode documentation.')
+            sys.exit()
+
+        # Index profile_resources by Repository & schema name
+        profile_resources_indexed = {}
+        for schema_name in profile_resources.keys():
+            profile_data = profile_resources[schema_name]
+            repository = profile_data.get('Repository', 'redfish.dmtf.org/schemas/v1')
+            normalized_uri = repository + '/' + schema_name + '.json'
+            profile_data['Schema_Name'] = schema_name
+            profile_resources_indexed[normalized_uri] = profile_data
+
+        config['profile_resources'] = profile_resources_indexed
+
+
+    def config_cache_key(self):
+        """ Make a key for the compiled config, from the settings and (by name, size and modification time) the local
+        files that compile_config reads.
+
+        Profiles and registries retrieved over HTTP are not part of the key. Remove the cache to retrieve them again.
+        """
+        settings = {x: self.config.get(x) for x in ['payload_dir', 'supplement_md_dir', 'subset_mode', 'subset_doc',
+                                                    'profile_mode', 'profile_doc', 'profile_uri_to_local',
+                                                    'registry_uri_to_local']}
+        paths = [self.config.get('subset_doc'), self.config.get('profile_doc')]
+        dirs = [self.config.get('payload_dir'), self.config.get('supplement_md_dir')]
+        for uri_to_local in ['profile_uri_to_local', 'registry_uri_to_local']:
+            for local_path in (self.config.get(uri_to_local) or {}).values():
+                local_path = os.path.abspath(local_path)
+                dirs.append(local_path if os.path.isdir(local_path) else os.path.dirname(local_path))
+        for dirname in dirs:
+            if dirname and os.path.isdir(dirname):
+                paths.extend(sorted(x.path for x in os.scandir(dirname) if x.is_file()))
+
+        file_stats = []
+        for path in paths:
+            if path and os.path.isfile(path):
+                stat = os.stat(path)
+                file_stats.append([os.path.abspath(path), stat.st_mtime_ns, stat.st_size])
+
+        key_data = [self.COMPILED_CONFIG_VERSION, settings, file_stats]
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+    @staticmethod
+    def load_compiled_config(cache_file):
+        """ Load a compiled config saved by save_compiled_config. Returns None if there is none. """
+        if not os.path.isfile(cache_file):
+            return None
+        try:
+            with open(cache_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as ex:
+            warnings.warn('Unable to read cached config "%(file)s": %(message)s' % {'file': cache_file, 'message': str(ex)})
+        return None
 
-            # Index profile_resources by Repository & schema name
-            profile_resources_indexed = {}
-            for schema_name in profile_resources.keys():
-                profile_data = profile_resources[schema_name]
-                repository = profile_data.get('Repository', 'redfish.dmtf.org/schemas/v1')
-                normalized_uri = repository + '/' + schema_name + '.json'
-                profile_data['Schema_Name'] = schema_name
-                profile_resources_indexed[normalized_uri] = profile_data
 
-            self.config['profile_resources'] = profile_resources_indexed
+    @staticmethod
+    def save_compiled_config(cache_file, compiled):
+        """ Save a compiled config (from compile_config) to cache_file. """
+        try:
+            cached = json.dumps(compiled)
+        except (TypeError, ValueError):
+            # Not everything in a profile or registry is guaranteed to be JSON; such configs are not cached.
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(cached)
+            os.replace(cache_file + '.tmp', cache_file)
+        except OSError as ex:
+            warnings.warn('Unable to write cached config "%(file)s": %(message)s' % {'file': cache_file, 'message': str(ex)})
 
 
     def generate_doc(self):
-        output = self.generate_docs()
-        self.write_output(output, self.outfile)
+        if self.config.get('profiles'):
+            # A document per profile; self.outfile is a list of files, one per profile.
+            docs = self.generate_profile_docs(self.config['profiles'])
+            for doc, outfile in zip(docs, self.outfile):
+                self.write_output(doc, outfile)
+        elif self.config.get('outputs'):
+            # Several outputs; self.outfile is a list of files, one per output.
+            outputs = self.generate_outputs(self.config['outputs'])
+            for output, outfile in zip(outputs, self.outfile):
+                self.write_output(output, outfile)
+        else:
+            output = self.generate_docs()
+            self.write_output(output, self.outfile)
+
+
+    def watch(self, interval=0.5):
+        """Generate the output, then watch the input files and generate it again whenever they change.
+
+        The compiled config and the processed schemas are kept in memory between runs. Changed markdown supplements
+        and payloads are read again individually, and the schemas are processed again only if a schema file changes.
+        Returns if the config files (config['config_files']) change, so that the caller can reload the config.
+        """
+        self.processed_snapshots = {}
+        if not (self.config.get('outputs') or self.config.get('profiles')):
+            # Generate the output as one of several, so that each run starts from a fresh copy of the config.
+            self.config['outputs'] = [{}]
+            self.outfile = [self.outfile]
+        outfile_names = [x.name for x in self.outfile]
+
+        files = self.watched_files()
+        file_stats = self.get_file_stats(files)
+        self.generate_doc()
+        print('Watching for changes. Press Ctrl-C to stop.')
+
+        while True:
+            time.sleep(interval)
+            current_files = self.watched_files()
+            current_stats = self.get_file_stats(current_files)
+            changed = {path: current_files.get(path) or files.get(path)
+                       for path in file_stats.keys() | current_stats.keys()
+                       if file_stats.get(path) != current_stats.get(path)}
+            (files, file_stats) = (current_files, current_stats)
+            if not changed:
+                continue
+
+            for path in sorted(changed):
+                print(path, "changed.")
+            if 'config' in changed.values():
+                return
+
+            start_time = time.time()
+            self.apply_changes(changed)
+            self.outfile = [open(x, 'w', encoding="utf8") for x in outfile_names]
+            self.generate_doc()
+            print('Regenerated in %(seconds).2f seconds.' % {'seconds': time.time() - start_time})
+
+
+    def watched_files(self):
+        """ The input files for watch mode, as a dict of path: kind, where kind is one of 'schema', 'supplement',
+        'payload', 'profile' (subset, profiles and registries) and 'config' (config['config_files']). """
+        config = self.config
+        files = {}
+
+        def add_files(path, kind, extension):
+            if path and os.path.isdir(path):
+                for dir_entry in os.scandir(path):
+                    if dir_entry.is_file() and dir_entry.name.endswith(extension):
+                        files[os.path.abspath(dir_entry.path)] = kind
+            elif path and os.path.isfile(path):
+                files[os.path.abspath(path)] = kind
+
+        schema_dirs = list(self.import_from) + list(config.get('uri_to_local', {}).values())
+        if config.get('locale'):
+            schema_dirs += [os.path.join(x, config['locale']) for x in schema_dirs if os.path.isdir(x)]
+        for path in schema_dirs:
+            add_files(path, 'schema', '.json')
+
+        add_files(config.get('supplement_md_dir'), 'supplement', '.md')
+        add_files(config.get('payload_dir'), 'payload', '.json')
+
+        profile_paths = [config.get('subset_doc'), config.get('profile_doc')] + [x['profile_doc'] for x in config.get('profiles', [])]
+        for uri_to_local in ['profile_uri_to_local', 'registry_uri_to_local']:
+            profile_paths += (config.get(uri_to_local) or {}).values()
+        for path in profile_paths:
+            add_files(path, 'profile', '.json')
+
+        for path in config.get('config_files', []):
+            add_files(path, 'config', '')
+        return files
+
+
+    @staticmethod
+    def get_file_stats(files):
+        """ Return a dict of path: (modification time, size) for those of files that exist """
+        file_stats = {}
+        for path in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            file_stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return file_stats
+
+
+    def apply_changes(self, changed):
+        """ Update the compiled config and processed schemas for changed input files (a dict of path: kind,
+        from watched_files). Deleted files are included. """
+        kinds = set(changed.values())
+
+        if 'profile' in kinds:
+            # The profile determines which schemas are processed, too.
+            self.retrieved_data = {}
+            self.retrieved_links = {}
+            self.compile_config()
+            self.processed_snapshots = {}
+        else:
+            for path, kind in changed.items():
+                name = os.path.basename(path)
+                if kind == 'supplement':
+                    parsed_data = self.read_md_supplement(path) if os.path.isfile(path) else None
+                    if parsed_data:
+                        self.config['md_supplements'][name[:-3]] = parsed_data
+                    else:
+                        self.config['md_supplements'].pop(name[:-3], None)
+                elif kind == 'payload':
+                    data = self.read_payload(path) if os.path.isfile(path) else None
+                    if data:
+                        self.config['payloads'][name] = data
+                    else:
+                        self.config['payloads'].pop(name, None)
+
+        if 'schema' in kinds:
+            self.processed_snapshots = {}
+            self.grouped_schemas = None
+            self.translated_data = {}
 
 
     def process_registry(self, reg_name, registry_profile):
@@ -192,10 +450,7 @@ class DocGenerator:
             return registry_reqs
 
         # Generate data based on profile
-        if is_local_file:
-            registry_data = DocGenUtilities.load_as_json(reg_uri)
-        else:
-            registry_data = DocGenUtilities.http_load_as_json(reg_uri)
+        registry_data = self.retrieve_json(reg_uri, is_local_file)
 
         if registry_data:
             registry_reqs['current_release'] = registry_data['RegistryVersion']
@@ -230,10 +485,7 @@ class DocGenerator:
 
         versioned_uri = None
 
-        if is_local_file:
-            repo_links = DocGenUtilities.local_get_links(repo)
-        else:
-            repo_links = DocGenUtilities.html_get_links(repo)
+        repo_links = self.retrieve_links(repo, is_local_file)
 
         if repo_links:
             minversion_parts = re.findall(r'(\d+)', min_version)
@@ -315,10 +567,7 @@ class DocGenerator:
             return merged_data
 
 
-        if is_local_file:
-            req_profile_data = DocGenUtilities.load_as_json(req_profile_uri)
-        else:
-            req_profile_data = DocGenUtilities.http_load_as_json(req_profile_uri)
+        req_profile_data = self.retrieve_json(req_profile_uri, is_local_file)
 
         if req_profile_data:
             if 'RequiredProfiles' in req_profile_data:
@@ -334,6 +583,27 @@ class DocGenerator:
         return merged_data
 
 
+    def retrieve_json(self, uri, is_local_file=False):
+        """ Load a required profile or registry from a local file or URI. Each is retrieved once per run, since
+        several profiles may require the same ones. Returns a copy, which the caller may modify. """
+        if uri not in self.retrieved_data:
+            if is_local_file:
+                self.retrieved_data[uri] = DocGenUtilities.load_as_json(uri)
+            else:
+                self.retrieved_data[uri] = DocGenUtilities.http_load_as_json(uri)
+        return copy.deepcopy(self.retrieved_data[uri])
+
+
+    def retrieve_links(self, repo, is_local_file=False):
+        """ Get the links in a profile or registry repository, retrieved once per run. """
+        if repo not in self.retrieved_links:
+            if is_local_file:
+                self.retrieved_links[repo] = DocGenUtilities.local_get_links(repo)
+            else:
+                self.retrieved_links[repo] = DocGenUtilities.html_get_links(repo)
+        return self.retrieved_links[repo]
+
+
     def merge_dicts(self, dict1, dict2):
         """ Merge two dictionaries recursively, with dict1 "winning." Returns the merged result. """
         return self._merge_dicts(dict1.copy(), dict2.copy())
@@ -392,15 +662,218 @@ class DocGenerator:
 
         This is the main loop of the product.
         """
-        files_to_process = self.get_files(self.import_from)
-        grouped_files, schema_data = self.group_files(files_to_process)
+        traverser = self.get_processed_schemas(prune=self.config.get('output_content') != 'property_index')
+        return self.generate_output(traverser, self.config, level)
+
+
+    def generate_outputs(self, outputs, level=0):
+        """Generate several documents in one run, sharing setup such as config, supplements, profiles and registries.
+
+        outputs is a list of dicts of config settings for each document, such as output_format, output_content,
+        and write_config_to. Returns a list of the generated documents, in the same order.
+        """
+        configs = []
+        for output in outputs:
+            config = copy.deepcopy(self.config)
+            config.pop('outputs', None)
+            config.update(output)
+            configs.append(config)
+
+        # Pruning only changes the processed schemas in profile or subset mode.
+        may_prune = bool(self.config.get('profile_mode') or self.config.get('subset_mode'))
+        prune_settings = [may_prune and config.get('output_content') != 'property_index' for config in configs]
+
+        # Generators update their config and annotate the processed schema data as they go, so the schemas are
+        # processed once for each prune setting and each output gets its own copy, restored from a snapshot
+        # (see get_processed_schemas).
+        processed_snapshots, grouped_schemas = self.processed_snapshots, self.grouped_schemas
+        if self.processed_snapshots is None:
+            self.processed_snapshots = {}
+        if len(set(prune_settings)) > 1 and not self.grouped_schemas and not self.config.get('processed_data_in'):
+            # Read and group the schema files once for both prune settings.
+            self.grouped_schemas = self.group_files(self.get_files(self.import_from))
+
+        docs = []
+        try:
+            for i, (config, prune) in enumerate(zip(configs, prune_settings)):
+                self.generator = None # Release the previous output's data before restoring the next copy.
+                traverser = self.get_processed_schemas(prune=prune, save=(i == 0))
+                docs.append(self.generate_output(traverser, config, level))
+        finally:
+            # Outside watch mode, the snapshots are only kept for this run.
+            if processed_snapshots is None:
+                self.processed_snapshots = None
+            self.grouped_schemas = grouped_schemas
+        return docs
+
+
+    def generate_profile_docs(self, profiles, level=0):
+        """Generate a document for each of several profiles, sharing the schema files, supplements, payloads,
+        and retrieved required profiles and registries.
+
+        profiles is a list of dicts of config settings for each document, such as profile_doc, profile_mode and
+        outfile_name. The documents are generated in parallel, in up to config['batch_workers'] processes (default:
+        one per CPU). Returns a list of the generated documents, in the same order.
+        """
+        configs = []
+        for profile in profiles:
+            config = copy.deepcopy(self.config)
+            config.pop('profiles', None)
+            config.update(profile)
+            self.compile_profile(config)
+            configs.append(config)
+
+        if not self.grouped_schemas:
+            self.grouped_schemas = self.group_files(self.get_files(self.import_from))
+
+        workers = min(self.config.get('batch_workers') or os.cpu_count() or 1, len(configs))
+        if workers <= 1:
+            base_config = self.config
+            docs = [self.generate_profile_doc(config, level) for config in configs]
+            self.config = base_config
+            return docs
+
+        # Each worker gets one share of the profiles, so that this DocGenerator is sent to it only once.
+        from concurrent.futures import ProcessPoolExecutor
+        shares = [configs[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(workers) as executor:
+            share_docs = list(executor.map(generate_batch_docs, [self] * workers, shares, [level] * workers))
+        docs = [None] * len(configs)
+        for i, share in enumerate(share_docs):
+            docs[i::workers] = share
+        return docs
+
+
+    def generate_profile_doc(self, config, level=0):
+        """ Generate the document for one profile of a batch, with config compiled by generate_profile_docs """
+        self.config = config
+        self.generator = None # Release the previous document's data before processing again.
+        traverser = self.process_schemas(prune=config.get('output_content') != 'property_index')
+        return self.generate_output(traverser, config, level)
+
+
+    def __getstate__(self):
+        """ For batch workers (see generate_profile_docs): the output files and generator stay behind. """
+        state = self.__dict__.copy()
+        state['outfile'] = None
+        state['generator'] = None
+        return state
+
+
+    def get_processed_schemas(self, prune=True, save=True):
+        """Get the processed schemas into self.property_data, and return a SchemaTraverser over the schema data.
+
+        The schemas are loaded from config['processed_data_in'] if specified, otherwise the schema files are processed.
+        If save is true and config['processed_data_out'] is specified, freshly processed schemas are saved there.
+        When snapshots are kept (in watch mode, and for several outputs), the schemas are restored from a snapshot
+        taken the first time, until they change.
+        """
+        if self.processed_snapshots is not None:
+            import pickle
+            if prune in self.processed_snapshots:
+                (self.property_data, schema_data) = pickle.loads(self.processed_snapshots[prune])
+                return SchemaTraverser(schema_data, self.config['uri_to_local'])
+
+        if self.config.get('processed_data_in'):
+            traverser = self.load_processed_data(self.config['processed_data_in'], prune)
+        else:
+            traverser = self.process_schemas(prune)
+            if save and self.config.get('processed_data_out'):
+                self.save_processed_data(traverser, self.config['processed_data_out'], prune)
+
+        if self.processed_snapshots is not None:
+            # Generators annotate the processed data as they go, so snapshot it before it is used.
+            self.processed_snapshots[prune] = pickle.dumps((self.property_data, dict(traverser.schemas)),
+                                                           protocol=pickle.HIGHEST_PROTOCOL)
+        return traverser
+
+
+    def processing_settings(self, prune):
+        """ Settings that affect the processed schemas, to be recorded with saved processed data """
+        return {
+            'locale': self.config.get('locale', 'en'),
+            'profile_doc': self.config.get('profile_doc'),
+            'subset_doc': self.config.get('subset_doc'),
+            'pruned': bool(prune and (self.config.get('profile_mode') or self.config.get('subset_mode'))),
+            }
+
+
+    def save_processed_data(self, traverser, filename, prune=True):
+        """Save the processed schemas to filename, so that output can be generated from them later without
+        processing the schema files again (see load_processed_data).
+
+        The file is gzip-compressed JSON, with the format version and the processing settings ahead of the data itself.
+        """
+        processed_data = {
+            'version': self.PROCESSED_DATA_VERSION,
+            'settings': self.processing_settings(prune),
+            'property_data': self.property_data,
+            'schema_data': dict(traverser.schemas),
+            }
+        try:
+            # Fast compression: the data is large, and is written on every run that saves it.
+            import gzip
+            with gzip.open(filename, 'wb', compresslevel=1) as f:
+                f.write(json.dumps(processed_data, separators=(',', ':')).encode('utf-8'))
+        except (OSError) as ex:
+            warnings.warn('Unable to write processed data to %(filename)s: %(message)s' % {'filename': filename, 'message': str(ex)})
+
+
+    def load_processed_data(self, filename, prune=True):
+        """Load processed schemas saved by save_processed_data into self.property_data, and return a SchemaTraverser
+        over the schema data. """
+        try:
+            import gzip
+            with gzip.open(filename, 'rb') as f:
+                processed_data = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError) as ex:
+            warnings.warn('Unable to read processed data from %(filename)s: %(message)s' % {'filename': filename, 'message': str(ex)})
+            sys.exit()
+
+        if processed_data.get('version') != self.PROCESSED_DATA_VERSION:
+            warnings.warn('%(filename)s contains processed data in format version %(version)s; version %(expected)s is required.' %
+                              {'filename': filename, 'version': processed_data.get('version'), 'expected': self.PROCESSED_DATA_VERSION})
+            sys.exit()
+
+        settings = processed_data.get('settings', {})
+        current_settings = self.processing_settings(prune)
+        for key in ['locale', 'profile_doc', 'subset_doc']:
+            if settings.get(key) != current_settings[key]:
+                warnings.warn('Processed data in %(filename)s was generated with %(key)s "%(saved)s", not "%(value)s". Output may be incorrect.' %
+                                  {'filename': filename, 'key': key, 'saved': settings.get(key), 'value': current_settings[key]})
+        if settings.get('pruned') and not prune:
+            warnings.warn('Processed data in %(filename)s was pruned to a profile or subset. Output may be incomplete.' % {'filename': filename})
+
+        self.property_data = processed_data['property_data']
+        return SchemaTraverser(processed_data['schema_data'], self.config['uri_to_local'])
+
+
+    def process_schemas(self, prune=True):
+        """Process the schema files into self.property_data, and return a SchemaTraverser over the schema data.
+
+        If prune is true, schemas that won't be documented in profile or subset mode are dropped before processing.
+        """
+        if self.grouped_schemas:
+            grouped_files, schema_data = self.grouped_schemas
+        else:
+            files_to_process = self.get_files(self.import_from)
+            grouped_files, schema_data = self.group_files(files_to_process)
+
+        # In profile or subset mode, most schemas won't be documented. Drop them before the expensive processing.
+        if (self.config.get('profile_mode') or self.config.get('subset_mode')) and prune:
+            grouped_files, schema_data = self.prune_to_documented_schemas(grouped_files, schema_data)
+
+        if self.grouped_schemas:
+            # The grouped schemas are shared by the documents in a batch, and processing modifies them.
+            import pickle
+            grouped_files, schema_data = pickle.loads(pickle.dumps((grouped_files, schema_data), protocol=pickle.HIGHEST_PROTOCOL))
 
         self.property_data = {}
         collection_data = {}
 
         # First expand the grouped files -- these are the schemas that get first-class documentation sections
         for normalized_uri in grouped_files.keys():
-            data = self.process_files(normalized_uri, grouped_files[normalized_uri])
+            data = self.process_files(normalized_uri, grouped_files[normalized_uri], schema_data)
             if not data:
                 # If we're in profile mode or subset mode this is probably normal; otherwise warn.
                 if not (self.config.get('profile_mode') or self.config.get('subset_mode')):
@@ -422,11 +895,9 @@ class DocGenerator:
             latest_data['_is_collection_of'] = latest_info.get('_is_collection_of')
             latest_data['_schema_name'] = latest_info.get('schema_name')
 
-            if self.config.get('locale'):
-                translated_file = os.path.join(latest_info['root'], self.config.get('locale'), latest_info['filename'])
-                if os.path.isfile(translated_file):
-                    translated_data = DocGenUtilities.load_as_json(translated_file)
-                    latest_data = self.apply_translated_data(latest_data, translated_data)
+            translated_data = self.get_translated_data(latest_file)
+            if translated_data:
+                latest_data = self.apply_translated_data(latest_data, translated_data)
 
             # If we have data in the unversioned file, we need to overlay that.
             # We did this the same way for property_data. (Simplify?)
@@ -437,23 +908,25 @@ class DocGenerator:
         # Also process and version definitions in any "other" files. These are files without top-level $ref objects.
         schema_data = self.process_unversioned_files(schema_data, self.config['uri_to_local'])
 
-        traverser = SchemaTraverser(schema_data, self.config['uri_to_local'])
+        return SchemaTraverser(schema_data, self.config['uri_to_local'])
+
 
-        # Generate output
-        if self.config.get('output_content') == 'property_index':
-            from doc_formatter import PropertyIndexGenerator
-            self.generator = PropertyIndexGenerator(self.property_data, traverser, self.config, level)
+    def generate_output(self, traverser, config, level=0):
+        """ Generate a document from the processed schemas, in the format specified by config """
+        if config.get('output_content') == 'property_index':
+            from doc_formatter.property_index_generator import PropertyIndexGenerator
+            self.generator = PropertyIndexGenerator(self.property_data, traverser, config, level)
             return self.generator.generate_output()
 
-        if self.config['output_format'] in ['markdown', 'slate']:
-            from doc_formatter import MarkdownGenerator
-            self.generator = MarkdownGenerator(self.property_data, traverser, self.config, level)
-        elif self.config['output_format'] == 'html':
-            from doc_formatter import HtmlGenerator
-            self.generator = HtmlGenerator(self.property_data, traverser, self.config, level)
-        elif self.config['output_format'] == 'csv':
-            from doc_formatter import CsvGenerator
-            self.generator = CsvGenerator(self.property_data, traverser, self.config, level)
+        if config['output_format'] in ['markdown', 'slate']:
+            from doc_formatter.markdown_generator import MarkdownGenerator
+            self.generator = MarkdownGenerator(self.property_data, traverser, config, level)
+        elif config['output_format'] == 'html':
+            from doc_formatter.html_generator import HtmlGenerator
+            self.generator = HtmlGenerator(self.property_data, traverser, config, level)
+        elif config['output_format'] == 'csv':
+            from doc_formatter.csv_generator import CsvGenerator
+            self.generator = CsvGenerator(self.property_data, traverser, config, level)
 
         return self.generator.generate_output()
 
@@ -579,7 +1052,7 @@ class DocGenerator:
                         continue
 
                 # Sort the ref_files by version.
-                version_keys = sorted(ref_files_by_version.keys(), key=functools.cmp_to_key(DocGenUtilities.compare_versions))
+                version_keys = sorted(ref_files_by_version.keys(), key=DocGenUtilities.version_key)
                 for vk in version_keys:
                     for file_data in ref_files_by_version[vk]:
                         ref_files.append(file_data)
@@ -644,10 +1117,95 @@ class DocGenerator:
         return grouped_files, all_schemas
 
 
-    def process_files(self, schema_ref, refs):
-        """Loop through a set of refs and process the specified files into property data.
+    def prune_to_documented_schemas(self, grouped_files, schema_data):
+        """Reduce grouped_files and schema_data to what a profile or subset can actually use.
+
+        Keeps the schemas selected by the profile or subset, plus the transitive closure of the
+        schemas they reference via $ref. Returns the pruned (grouped_files, schema_data)."""
+
+        profile_mode = self.config.get('profile_mode')
+        profile = self.config.get('profile_resources', {})
+        subset_mode = self.config.get('subset_mode')
+        subset = self.config.get('subset_resources', {})
+
+        # Keep collections if the collections table was requested; it lists them regardless of the subset.
+        wants_collections = subset_mode and any('[insert_collections]' in (self.config.get(x) or '')
+                                                for x in ['intro_content', 'postscript_content'])
+
+        # Map each schema file to all of the files in its group, so that we keep versions together.
+        group_uris = {}
+        pending = []
+        for normalized_uri, refs in grouped_files.items():
+            uris = [normalized_uri] + [self.construct_uri_for_filename(os.path.join(x['root'], x['filename'])) for x in refs]
+            for uri in uris:
+                group_uris[uri] = uris
+
+            latest_filename = os.path.join(refs[-1]['root'], refs[-1]['filename'])
+            if profile_mode:
+                wanted = self.construct_generalized_uri_for_filename(latest_filename) in profile
+            else:
+                wanted = (refs[-1]['schema_name'].partition('.')[0] in subset or
+                          (wants_collections and normalized_uri.endswith('Collection.json')))
+            if wanted:
+                pending.extend(uris)
+
+        # Common objects and fragments are documented by reference:
+        pending.extend(self.config.get('common_object_schemas', []))
+        refs = [x for x in self.config.get('reference_disposition', {}).keys() if '#' in x]
+        for content in [self.config.get('intro_content'), self.config.get('postscript_content')]:
+            if content:
+                refs.extend([x[17:].strip() for x in content.splitlines() if x.startswith('#include_fragment')])
+        pending.extend([SchemaTraverser.get_schema_ref_and_path(x)[0] for x in refs])
+
+        needed = set()
+        while pending:
+            uri = pending.pop()
+            if uri in needed or uri not in schema_data:
+                continue
+            needed.add(uri)
+            pending.extend(group_uris.get(uri, []))
+            unversioned_uri = DocGenUtilities.make_unversioned_ref(uri)
+            if unversioned_uri:
+                pending.append(unversioned_uri)
+
+            base_uri = uri.rpartition('/')[0]
+            for ref in self.find_schema_refs(schema_data[uri]):
+                ref_uri = SchemaTraverser.get_schema_ref_and_path(ref)[0]
+                if ref_uri and '/' not in ref_uri:
+                    # Relative reference to a schema in the same location
+                    ref_uri = base_uri + '/' + ref_uri
+                if ref_uri:
+                    pending.append(ref_uri)
+
+        grouped_files = {k: v for k, v in grouped_files.items() if k in needed}
+        schema_data = {k: v for k, v in schema_data.items() if k in needed}
+        return grouped_files, schema_data
+
+
+    @staticmethod
+    def find_schema_refs(data):
+        """Get the set of $ref values found anywhere within data."""
+
+        found = set()
+        pending = [data]
+        while pending:
+            elt = pending.pop()
+            if isinstance(elt, dict):
+                ref = elt.get('$ref')
+                if isinstance(ref, str):
+                    found.add(ref)
+                pending.extend(elt.values())
+            elif isinstance(elt, list):
+                pending.extend(elt)
+        return found
+
+
+    def process_files(self, schema_ref, refs, schema_data=None):
+        """Process a set of refs (ordered oldest to newest) into property data.
 
         Returns a property_data object consisting of the properties from the last ref file.
+        Earlier versions contribute only their release history and deprecation, which are
+        gathered in a single pass (from schema_data, as produced by group_files, if supplied).
         """
         property_data = {}
         unversioned_ref = None
@@ -655,14 +1213,83 @@ class DocGenerator:
         if schema_ref not in refs:
             unversioned_ref = schema_ref
 
-        for info in refs:
-            property_data = self.process_data_file(schema_ref, info, property_data)
+        if len(refs):
+            property_data = self.summarize_version_history(refs[:-1], schema_data)
+            property_data = self.process_data_file(schema_ref, refs[-1], property_data)
 
         if unversioned_ref:
             property_data = self.apply_unversioned_data_file(unversioned_ref, property_data)
         return property_data
 
 
+    def summarize_version_history(self, refs, schema_data=None):
+        """Collect release history and deprecation from a list of versioned refs, oldest first.
+
+        Returns a partial property_data object, to be completed by process_data_file for the
+        latest version. Data already loaded in schema_data is used in preference to reading files.
+        """
+        property_data = {}
+        if schema_data is None:
+            schema_data = {}
+
+        for ref in refs:
+            filename = os.path.join(ref['root'], ref['filename'])
+            data = schema_data.get(self.construct_uri_for_filename(filename))
+            if not data:
+                data = DocGenUtilities.load_as_json(filename)
+
+            version = self.get_version_string(ref['filename'])
+            release_text = data.get('release')
+
+            if 'deprecated' in data:
+                property_data['deprecated'] = data['deprecated']
+                property_data['versionDeprecated'] = data.get('versionDeprecated')
+
+            try:
+                data = self.find_ref_object(data, ref['ref'])
+
+                if 'deprecated' in data:
+                    property_data['deprecated'] = data['deprecated']
+                    property_data['versionDeprecated'] = data.get('versionDeprecated')
+
+            except KeyError:
+                warnings.warn('Unable to find properties in path %(ref)s from %(filename)s' % { 'ref': ref['ref'], 'filename': filename})
+                property_data = {}
+                continue
+
+            if release_text:
+                if not property_data.get('release_history'):
+                    property_data['release_history'] = []
+                property_data['release_history'].append({'version': version, 'release': release_text,
+                                                         'deprecated': ('deprecated' in property_data)})
+
+        return property_data
+
+
+    @staticmethod
+    def find_ref_object(data, ref_path):
+        """Follow the path part of a ref (ref['ref'] from group_files) through a schema's data to the object it
+        names, resolving an anyOf to its embedded object if present.
+
+        Raises KeyError if the schema has no definitions, the path isn't found, or the object has no properties.
+        """
+        data['definitions']
+        for ref_part in ref_path.split('/'):
+            if not ref_part:
+                continue
+            data = data[ref_part]
+
+        # resolve anyOf to embedded object, if present:
+        if 'anyOf' in data:
+            for elt in data['anyOf']:
+                if ('type' in elt) and (elt['type'] == 'object'):
+                    data = elt
+                    break
+
+        data['properties']
+        return data
+
+
     def process_data_file(self, schema_ref, ref, property_data):
         """Process a single file by ref name, adding some annotations to property_data."""
 
@@ -670,10 +1297,7 @@ class DocGenerator:
         normalized_uri = self.construct_uri_for_filename(filename)
 
         # Get the un-versioned filename for match against profile keys
-        if '.v' in filename:
-            generalized_uri = self.construct_uri_for_filename(filename.split('.v')[0]) + '.json'
-        else:
-            generalized_uri = self.construct_uri_for_filename(filename)
+        generalized_uri = self.construct_generalized_uri_for_filename(filename)
 
         profile_mode = self.config.get('profile_mode')
         profile = self.config.get('profile_resources', {})
@@ -682,13 +1306,6 @@ class DocGenerator:
 
         data = DocGenUtilities.load_as_json(filename)
 
-        # Check for a localized file and pull in translated text:
-        if self.config.get('locale'):
-            translated_file = os.path.join(ref['root'], self.config.get('locale'), ref['filename'])
-            if os.path.isfile(translated_file):
-                translated_data = DocGenUtilities.load_as_json(translated_file)
-                data = self.apply_translated_data(data, translated_data)
-
         schema_name = SchemaTraverser.find_schema_name(filename, data, True)
 
         version = self.get_version_string(ref['filename'])
@@ -729,26 +1346,20 @@ class DocGenerator:
         if 'definitions' not in property_data:
             property_data['definitions'] = {}
 
+        # Check for a localized file and pull in translated text. This is deferred until we know
+        # the schema will be documented.
+        translated_data = self.get_translated_data(filename)
+        if translated_data:
+            data = self.apply_translated_data(data, translated_data)
+
         if (version == '1.0.0') and (schema_ref in property_data):
             warnings.warn('Check %(schema_ref)s for version problems. Are there two files with either version 1.0.0 or no version?'
                               % {'schema_ref': schema_ref})
 
         try:
             property_data['definitions'] = data['definitions']
-            for ref_part in ref['ref'].split('/'):
-                if not ref_part:
-                    continue
-                data = data[ref_part]
-
-            # resolve anyOf to embedded object, if present:
-            if 'anyOf' in data:
-                for elt in data['anyOf']:
-                    if ('type' in elt) and (elt['type'] == 'object'):
-                        data = elt
-                        break
-
-            properties = data['properties']
-            property_data['properties'] = properties
+            data = self.find_ref_object(data, ref['ref'])
+            property_data['properties'] = data['properties']
 
             if 'deprecated' in data:
                 property_data['name_and_version'] += ' ' + _('(deprecated)')
@@ -792,15 +1403,6 @@ class DocGenerator:
         if 'definitions' not in data:
             return property_data
 
-
-        # Look for a localized schema file and apply it first, if found.
-        if self.config.get('locale'):
-            (path_head, path_tail) = os.path.split(filename)
-            translated_file = os.path.join(path_head, self.config.get('locale'), path_tail)
-            if os.path.isfile(translated_file):
-                translated_data = DocGenUtilities.load_as_json(translated_file)
-                data = self.apply_translated_data(data, translated_data)
-
         ref = data.get('$ref', '')
         element_to_skip = False
 
@@ -815,10 +1417,19 @@ class DocGenerator:
                 # Skip schemas that aren't mentioned in the profile:
                 return property_data
 
-        definitions = data.get('definitions')
         if 'definitions' not in property_data:
             property_data['definitions'] = {}
 
+        # Look for a localized schema file and apply it, if found. Only the definitions we are
+        # about to add need translating.
+        translated_data = self.get_translated_data(filename)
+        if translated_data:
+            to_translate = [x for x in data['definitions'].keys()
+                                if x != element_to_skip and x not in property_data['definitions']]
+            data = self.apply_translated_data(data, translated_data, to_translate)
+
+        definitions = data.get('definitions')
+
         for prop_name, prop_info in definitions.items():
             if prop_name == element_to_skip or prop_name in property_data['definitions'].keys():
                 continue
@@ -827,10 +1438,33 @@ class DocGenerator:
         return property_data
 
 
-    def apply_translated_data(self, data, translated_data):
+    def get_translated_data(self, filename):
+        """ Get the localized counterpart of a schema file, from a subdirectory named for the configured locale.
+
+        Returns None if no locale is configured or there is no such file. Translated files are loaded
+        on first use and cached, as the same files are overlaid more than once.
+        """
+        locale = self.config.get('locale')
+        if not locale:
+            return None
+
+        (path_head, path_tail) = os.path.split(filename)
+        translated_file = os.path.join(path_head, locale, path_tail)
+        if translated_file not in self.translated_data:
+            translated_data = None
+            if os.path.isfile(translated_file):
+                translated_data = DocGenUtilities.load_as_json(translated_file)
+            self.translated_data[translated_file] = translated_data
+
+        return self.translated_data[translated_file]
+
+
+    def apply_translated_data(self, data, translated_data, prop_names=None):
         """ Gather translated strings from translated_data and apply them to data.
         This assumes that translated_data is essentially a copy of data with translations
         and annotations applied -- this is done on a file-by-file basis.
+
+        If prop_names is specified, only those definitions are translated.
         """
 
         # If there is no definitions block, there's nothing to do:
@@ -838,6 +1472,8 @@ class DocGenerator:
             return data
 
         definitions = translated_data['definitions']
+        if prop_names is not None:
+            definitions = {x: definitions[x] for x in prop_names if x in definitions}
         for prop_name, prop_info in definitions.items():
             if prop_name in data['definitions']:
                 prop_data = data['definitions'].get(prop_name)
@@ -927,8 +1563,7 @@ class DocGenerator:
                         latest_ref = this_ref
                         latest_version = cleaned_version
                     else:
-                        compare = DocGenUtilities.compare_versions(latest_version, cleaned_version)
-                        if compare < 0:
+                        if DocGenUtilities.version_key(latest_version) < DocGenUtilities.version_key(cleaned_version):
                             latest_version = cleaned_version
                     if match_ref != unversioned_ref: # These are not all versions of the same thing
                         break
@@ -952,74 +1587,69 @@ class DocGenerator:
 
         prop_info =  {}
 
-        # Check latest version in refs_by_version against prop_info _latest_version:
-        latest_version = '0.0.0'
-
-        # Walk refs_by_version, extending prop_info
+        # Only the latest version contributes to prop_info, so that is the only one we traverse.
         ref_keys = [x for x in refs_by_version.keys()]
-        ref_keys.sort(key=functools.cmp_to_key(DocGenUtilities.compare_versions))
-
         if not len(ref_keys):
             return prop_info # No changes to make
-        else:
-            for this_version in ref_keys:
-                this_ref = refs_by_version[this_version]
 
-                ref_info = traverser.find_ref_data(this_ref)
-                if not ref_info:
-                    warnings.warn("Can't find schema file for %(ref)s" %{'ref': this_ref})
-                    continue
-                if 'properties' in ref_info:
-                    ref_properties = ref_info['properties']
-
-                    # Follow refs in properties, if they are local to the same schema.
-                    [this_schema, rest] = this_ref.split('#')
-                    for prop_name, props in ref_properties.items():
-                        prop_ref = None
-                        if '$ref' in props and (props['$ref'].startswith('#') or props['$ref'].startswith(this_schema)):
-                            if props['$ref'].startswith('#'):
-                                prop_ref = this_schema + props['$ref']
+        this_version = max(ref_keys, key=DocGenUtilities.version_key)
+        this_ref = refs_by_version[this_version]
+
+        ref_info = traverser.find_ref_data(this_ref)
+        if not ref_info:
+            warnings.warn("Can't find schema file for %(ref)s" %{'ref': this_ref})
+            return prop_info
+
+        ref_properties = None
+        if 'properties' in ref_info:
+            ref_properties = ref_info['properties']
+
+            # Follow refs in properties, if they are local to the same schema.
+            [this_schema, rest] = this_ref.split('#')
+            for prop_name, props in ref_properties.items():
+                prop_ref = None
+                if '$ref' in props and (props['$ref'].startswith('#') or props['$ref'].startswith(this_schema)):
+                    if props['$ref'].startswith('#'):
+                        prop_ref = this_schema + props['$ref']
+                    else:
+                        prop_ref = props['$ref']
+                elif 'anyOf' in props:
+                    # may be "$ref or null"
+                    for elt in props['anyOf']:
+                        if elt.get('type') == 'null':
+                            continue
+                        if elt.get('$ref'):
+                            # Don't follow $ref if multiple are offered. Too complicated?
+                            if prop_ref:
+                                prop_ref = None
+                                break
                             else:
-                                prop_ref = props['$ref']
-                        elif 'anyOf' in props:
-                            # may be "$ref or null"
-                            for elt in props['anyOf']:
-                                if elt.get('type') == 'null':
-                                    continue
-                                if elt.get('$ref'):
-                                    # Don't follow $ref if multiple are offered. Too complicated?
-                                    if prop_ref:
-                                        prop_ref = None
-                                        break
-                                    else:
-                                        if elt['$ref'].startswith(this_schema):
-                                            prop_ref = elt['$ref']
-                                        if elt['$ref'].startswith('#'):
-                                            prop_ref = this_schema + elt['$ref']
-
-                        if prop_ref:
-                            child_ref = traverser.find_ref_data(prop_ref)
-                            if child_ref and 'properties' in child_ref:
-                                if ref_properties[prop_name].get('anyOf'):
-                                    del(ref_properties[prop_name]['anyOf']) # We're replacing this.
-                                child_ref_properties = child_ref['properties']
-                                ref_properties[prop_name]['properties'] = child_ref_properties
-                                ref_properties[prop_name]['type'] = 'object'
-
-                    # Update any relative refs in ref_properties with this_ref base:
-                    [base_ref, rest] = this_ref.split('#')
-                    [common_base_ref, rest] = common_ref.split('#')
-                    if common_base_ref != base_ref:
-                        ref_properties = self.absolutize_refs(base_ref, ref_properties)
-
-            if not ref_info:
-                return prop_info
-
-            # Update saved property to latest version:
-            prop_info = copy.deepcopy(ref_info)
+                                if elt['$ref'].startswith(this_schema):
+                                    prop_ref = elt['$ref']
+                                if elt['$ref'].startswith('#'):
+                                    prop_ref = this_schema + elt['$ref']
+
+                if prop_ref:
+                    child_ref = traverser.find_ref_data(prop_ref)
+                    if child_ref and 'properties' in child_ref:
+                        if ref_properties[prop_name].get('anyOf'):
+                            del(ref_properties[prop_name]['anyOf']) # We're replacing this.
+                        child_ref_properties = child_ref['properties']
+                        ref_properties[prop_name]['properties'] = child_ref_properties
+                        ref_properties[prop_name]['type'] = 'object'
+
+            # Update any relative refs in ref_properties with this_ref base:
+            [base_ref, rest] = this_ref.split('#')
+            [common_base_ref, rest] = common_ref.split('#')
+            if common_base_ref != base_ref:
+                ref_properties = self.absolutize_refs(base_ref, ref_properties)
+
+        # Update saved property to latest version. The properties are replaced, so there's no need to copy them:
+        prop_info = {k: copy.deepcopy(v) for k, v in ref_info.items() if k != 'properties'}
+        if ref_properties is not None:
             prop_info['properties'] = ref_properties
-            prop_info['_latest_version'] = this_version
-            prop_info['_ref_uri'] = common_ref
+        prop_info['_latest_version'] = this_version
+        prop_info['_ref_uri'] = common_ref
 
         return prop_info
 
@@ -1079,6 +1709,14 @@ class DocGenerator:
 
         return fname
 
+    def construct_generalized_uri_for_filename(self, fname):
+        """Construct the URI for the un-versioned counterpart of this (possibly versioned) file"""
+
+        if '.v' in fname:
+            return self.construct_uri_for_filename(fname.split('.v')[0]) + '.json'
+        return self.construct_uri_for_filename(fname)
+
+
     @staticmethod
     def normalize_ref(ref):
         """Get the normalized version of ref we use to index a schema.
@@ -1106,6 +1744,7 @@ class DocGenerator:
 
     @staticmethod
     def parse_command_line():
+        import argparse
 
         help_description = 'Generate documentation for Redfish JSON schema files.\n\n'
         help_epilog = ('Example:\n   doc_generator.py --format=html\n   doc_generator.py'
@@ -1160,6 +1799,15 @@ class DocGenerator:
                             help=("Characters to escape (\\) in generated Markdown. "
                                   "For example, --escape=@#. Use --escape=@ if strings with embedded @ "
                                   "are being converted to mailto links."))
+        parser.add_argument('--processed_data_out', dest='processed_data_out', metavar='PROCESSED_DATA_FILE',
+                            help=('Save the processed schema data to the specified file, so that later runs can '
+                                  'generate output from it with --processed_data_in.'))
+        parser.add_argument('--processed_data_in', dest='processed_data_in', metavar='PROCESSED_DATA_FILE',
+                            help=('Generate output from processed schema data saved with --processed_data_out, '
+                                  'instead of processing the schema files.'))
+        parser.add_argument('--watch', action='store_true', dest='watch', default=None,
+                            help=('Generate the output, then keep running and generate it again whenever the schemas, '
+                                  'supplements, payloads, profile or config files change.'))
 
         command_line_args = vars(parser.parse_args())
         return command_line_args.copy()
@@ -1280,7 +1928,8 @@ class DocGenerator:
                 'format', 'outfile', 'payload_dir', 'normative', 'combine_descriptions',
                 'profile_doc', 'subset_doc',
                 'property_index', 'property_index_config_out', 'escape_chars',
-                'locale', 'warn_missing_payloads'
+                'locale', 'warn_missing_payloads',
+                'processed_data_out', 'processed_data_in', 'watch'
                 ]
 
             for x in config_args:
@@ -1305,6 +1954,7 @@ class DocGenerator:
                 'supplement_md_dir', 'excluded_schema_uris',
                 'table_formats',
                 'remove_blanks',
+                'fragment_cache_dir', 'config_cache_dir', 'watch_interval', 'batch_workers',
                 'description_overrides' # this is for property_index mode only
                 ]
             for x in config_only:
@@ -1334,18 +1984,20 @@ class DocGenerator:
             if not combined_args.get(param):
                 combined_args[param] = default
 
-        config['output_format'] = combined_args['format']
-
-        # Allow "with_table_numbering" to be True only for markdown formats.
-        if config_data.get('with_table_numbering') and config['output_format'] in ['slate', 'markdown']:
-            config['with_table_numbering'] = True
-
-        if combined_args.get('property_index'):
-            config['output_content'] = 'property_index'
-            config['write_config_to'] = combined_args['property_index_config_out']
-
-        else:
-            config['output_content'] = 'full_doc'
+        config.update(DocGenerator.make_output_config(combined_args['format'], combined_args['outfile'],
+                                                      combined_args.get('property_index'),
+                                                      combined_args.get('property_index_config_out'),
+                                                      config_data.get('with_table_numbering')))
+
+        # "outputs" requests several documents from a single run. Output options on the command line
+        # select a single output instead.
+        if config_data.get('outputs') and not any([command_line_args.get(x) for x in ['format', 'outfile', 'property_index']]):
+            config['outputs'] = []
+            for output in config_data['outputs']:
+                config['outputs'].append(DocGenerator.make_output_config(output.get('format', 'slate'), output.get('outfile', 'output.md'),
+                                                                         output.get('property_index'),
+                                                                         output.get('property_index_config_out'),
+                                                                         config_data.get('with_table_numbering')))
 
         if 'import_from' in combined_args and len(combined_args['import_from']):
             import_from = combined_args['import_from']
@@ -1354,23 +2006,6 @@ class DocGenerator:
 
         config['import_from'] = import_from
 
-        # Determine outfile and verify that it is writeable:
-        outfile_name = combined_args['outfile']
-        if outfile_name == 'output.md':
-            if config['output_format'] == 'html':
-                outfile_name = 'index.html'
-            if config['output_format'] == 'csv':
-                outfile_name = 'output.csv'
-            if config['output_content'] == 'property_index':
-                outfile_name = 'property_index'
-                if config['output_format'] == 'html':
-                    outfile_name += '.html'
-                if config['output_format'] == 'csv':
-                    outfile_name += '.csv'
-                if config['output_format'] in ['markdown', 'slate']:
-                    outfile_name += '.md'
-        config['outfile_name'] = outfile_name
-
         # Verify directories, if specified, are actually directories:
         for config_dir in ['payload_dir', 'supplement_md_dir']:
             if combined_args.get(config_dir):
@@ -1437,7 +2072,28 @@ class DocGenerator:
         else:
             config['subset_mode'] = False
 
-        if combined_args.get('profile_terse') and not combined_args.get('profile_doc'):
+        # "profiles" requests a document for each of several profiles from a single run. A profile on the command
+        # line selects a single document instead.
+        if config_data.get('profiles') and not command_line_args.get('profile_doc'):
+            config['profiles'] = []
+            for profile in config_data['profiles']:
+                profile_doc = os.path.normpath(os.path.join(config_data.get('config_dir', ''), profile.get('profile', '')))
+                if not os.path.isfile(profile_doc):
+                    profile_doc = os.path.normpath(profile.get('profile', ''))
+                if not os.path.isfile(profile_doc):
+                    warnings.warn('Unable to open profile "%(filename)s" to read.' % {'filename': profile.get('profile')})
+                    sys.exit()
+                outfile_name = profile.get('outfile')
+                if not outfile_name:
+                    extensions = {'html': '.html', 'csv': '.csv'}
+                    outfile_name = os.path.splitext(os.path.basename(profile_doc))[0] + extensions.get(combined_args['format'], '.md')
+                config['profiles'].append({
+                    'profile_doc': profile_doc,
+                    'profile_mode': 'terse' if profile.get('terse', combined_args.get('profile_terse')) else 'verbose',
+                    'outfile_name': outfile_name,
+                    })
+
+        if combined_args.get('profile_terse') and not (combined_args.get('profile_doc') or config.get('profiles')):
             warnings.warn('Terse output (%(arg_t)s or %(arg_terse)s) requires a profile (--%(arg_profile)s).' %
                               {'arg_t': '-t', 'arg_terse': '--terse', 'arg_profile': 'profile'},
                               InfoWarning)
@@ -1521,9 +2177,55 @@ class DocGenerator:
 
         config['warn_missing_payloads'] = combined_args.get('warn_missing_payloads', False)
 
+        for x in ['processed_data_out', 'processed_data_in', 'watch']:
+            if combined_args.get(x):
+                config[x] = combined_args[x]
+
         return config
 
 
+    @staticmethod
+    def make_output_config(output_format, outfile_name, property_index=False, property_index_config_out=None,
+                           with_table_numbering=False):
+        """ Generate the config settings for one output document. The default outfile_name, output.md, is
+        replaced with a name suited to the output format. """
+        output_config = {
+            'output_format': output_format,
+            'output_content': 'full_doc',
+            # Allow "with_table_numbering" to be True only for markdown formats. Always set, so that an output of
+            # several doesn't inherit the setting of the top-level format.
+            'with_table_numbering': bool(with_table_numbering and output_format in ['slate', 'markdown']),
+            }
+
+        if property_index:
+            output_config['output_content'] = 'property_index'
+            output_config['write_config_to'] = property_index_config_out
+
+        if outfile_name == 'output.md':
+            if output_format == 'html':
+                outfile_name = 'index.html'
+            if output_format == 'csv':
+                outfile_name = 'output.csv'
+            if property_index:
+                outfile_name = 'property_index'
+                if output_format == 'html':
+                    outfile_name += '.html'
+                if output_format == 'csv':
+                    outfile_name += '.csv'
+                if output_format in ['markdown', 'slate']:
+                    outfile_name += '.md'
+        output_config['outfile_name'] = outfile_name
+
+        return output_config
+
+
+# Batch workers (see DocGenerator.generate_profile_docs) keep a copy of the DocGenerator for the batch.
+def generate_batch_docs(doc_generator, configs, level):
+    """ Generate a share of the documents of a batch, in a worker process """
+    doc_generator.setup_environment()
+    return [doc_generator.generate_profile_doc(config, level) for config in configs]
+
+
 def parse_schema_supplement(supp_data):
     """ Vet and extend supp_data. Any "mockup" entries in supp_data should be file paths or URIs to be expanded. """
     for schema_name, data in supp_data.items():
@@ -1534,6 +2236,7 @@ def parse_schema_supplement(supp_data):
             if ml_lower.startswith('http://') or ml_lower.startswith('https://'):
                 # retrieve it via http[s]
                 try:
+                    import urllib.request
                     response = urllib.request.urlopen(mockup_location)
                     if 200 <= response.status < 300:
                         mockup = response.read().decode('utf-8') # JSON is UTF-8 by spec.
@@ -1560,12 +2263,10 @@ def parse_schema_supplement(supp_data):
     return supp_data
 
 
-def main():
-    """Parse and validate arguments, then process data and produce markdown output."""
+def read_config(command_line_args):
+    """ Read the config file named in command_line_args, with its content supplement and boilerplate files, and
+    combine them with the command-line arguments. The paths of the files read are listed in config['config_files']. """
 
-    cwd = os.getcwd()
-
-    command_line_args = DocGenerator.parse_command_line()
     config_fn = command_line_args.get('config_file')
     if config_fn:
         config_data = DocGenerator.parse_config_file(config_fn)
@@ -1573,6 +2274,8 @@ def main():
         warnings.warn('A configuration file is required (option --config)');
         sys.exit()
 
+    config_files = [config_fn]
+
     # path of some files will be relative to path of config file:
     config_dir = os.path.dirname(config_fn)
     config_data['config_dir'] = config_dir
@@ -1581,6 +2284,7 @@ def main():
     if config_data.get('content_supplement'):
         config_supp_fn = config_data['content_supplement']
         config_supp_fn = os.path.normpath(os.path.join(config_dir, config_supp_fn))
+        config_files.append(config_supp_fn)
         try:
             with open(config_supp_fn, 'r', encoding="utf8") as config_supp_file:
                 supp_config_data = json.load(config_supp_file)
@@ -1599,6 +2303,7 @@ def main():
     for fn, content_key in boilerplate_fns.items():
         if config_data.get(fn):
             boilerplate_fn = os.path.normpath(os.path.join(config_dir, config_data[fn]))
+            config_files.append(boilerplate_fn)
             try:
                 with open(boilerplate_fn, 'r', encoding="utf8") as boilerplate_file:
                     boilerplate_lines = []
@@ -1612,14 +2317,58 @@ def main():
 
     config = DocGenerator.combine_configs(command_line_args=command_line_args, config_data=config_data,
                                               supp_config_data=supp_config_data)
-    try:
-        outfile = open(config['outfile_name'], 'w', encoding="utf8")
-    except (OSError) as ex:
-        warnings.warn('Unable to open %(filename)s to write: %(message)s' % {'filename': config['outfile_name'], 'message': str(ex)})
-        sys.exit();
-
-    doc_generator = DocGenerator(config['import_from'], outfile, config)
-    doc_generator.generate_doc()
+    config['config_files'] = config_files
+    return config
+
+
+def reload_config(command_line_args, config):
+    """ Read the config again after a config file changed in watch mode. If the new config can't be read (read_config
+    reports the problem and exits), keep watching the files in config['config_files'] until they change again. """
+
+    config_files = config['config_files']
+    interval = config.get('watch_interval', 0.5)
+    while True:
+        print('Reloading the configuration.')
+        file_stats = DocGenerator.get_file_stats(config_files)
+        try:
+            return read_config(command_line_args)
+        except SystemExit:
+            warnings.warn('Unable to reload the configuration. Waiting for the config files to change.')
+        while DocGenerator.get_file_stats(config_files) == file_stats:
+            time.sleep(interval)
+
+
+def main():
+    """Parse and validate arguments, then process data and produce markdown output."""
+
+    command_line_args = DocGenerator.parse_command_line()
+    config = read_config(command_line_args)
+
+    while True:
+        outfile_names = [x['outfile_name'] for x in config.get('profiles') or config.get('outputs') or [config]]
+        outfiles = []
+        for outfile_name in outfile_names:
+            try:
+                outfiles.append(open(outfile_name, 'w', encoding="utf8"))
+            except (OSError) as ex:
+                warnings.warn('Unable to open %(filename)s to write: %(message)s' % {'filename': outfile_name, 'message': str(ex)})
+                sys.exit();
+
+        if config.get('profiles') or config.get('outputs'):
+            outfile = outfiles
+        else:
+            outfile = outfiles[0]
+
+        doc_generator = DocGenerator(config['import_from'], outfile, config)
+        if not config.get('watch'):
+            doc_generator.generate_doc()
+            return
+
+        try:
+            doc_generator.watch(config.get('watch_interval', 0.5))
+            config = reload_config(command_line_args, config)
+        except KeyboardInterrupt:
+            return
 
 
 if __name__ == "__main__":
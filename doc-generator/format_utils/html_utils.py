@@ -9,7 +9,7 @@ Brief : Contains output utilities for Doc Formatters that output HTML.
 
 Initial author: Second Rise LLC.
 """
-import markdown
+import functools
 from . import FormatUtils
 
 class HtmlUtils(FormatUtils):
@@ -116,14 +116,35 @@ class HtmlUtils(FormatUtils):
         return table_tag + '\n' + head + body + '</table>'
 
 
+    # Shared Markdown converter; see _get_markdown
+    _markdown = None
+
     @staticmethod
     def markdown_to_html(markdown_blob, **args):
-        """ Convert markdown to HTML """
-        html_blob = markdown.markdown(markdown_blob,
-                                      extensions=['markdown.extensions.codehilite',
-                                                  'markdown.extensions.fenced_code',
-                                                  'markdown.extensions.tables',
-                                                  'markdown.extensions.toc'])
+        """ Convert markdown to HTML
+
+        Conversions are cached, since the same short descriptions (Status, Oem, Links and so on)
+        are converted many times over in a document. """
+        return HtmlUtils._markdown_to_html(markdown_blob, bool(args.get('no_para')))
+
+
+    @staticmethod
+    def _get_markdown():
+        """ Get the Markdown converter shared by all conversions, creating it on first use """
+        if HtmlUtils._markdown is None:
+            import markdown
+            HtmlUtils._markdown = markdown.Markdown(extensions=['markdown.extensions.codehilite',
+                                                                'markdown.extensions.fenced_code',
+                                                                'markdown.extensions.tables',
+                                                                'markdown.extensions.toc'])
+        return HtmlUtils._markdown
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _markdown_to_html(markdown_blob, no_para):
+        """ Convert markdown to HTML, optionally dropping the enclosing paragraph of a non-table blob """
+        html_blob = HtmlUtils._get_markdown().reset().convert(markdown_blob)
         # Look for empty table rows; used to get tables without headers recognized:
         if '<table>' in html_blob:
             lines = []
@@ -156,7 +177,7 @@ class HtmlUtils(FormatUtils):
             if html_updated:
                 html_blob = '\n'.join(lines)
 
-        elif args.get('no_para'):
+        elif no_para:
             if html_blob[0:3] == '<p>':
                 html_blob = html_blob[3:-4]
 
@@ -1,3 +1,4 @@
+import urllib.request # The tests patch urllib.request, which the doc generator imports only when it retrieves something.
 from .discrepancy_list import DiscrepancyList
 
 def pytest_assertrepr_compare(op, left, right):
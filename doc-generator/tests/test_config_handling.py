@@ -13,10 +13,11 @@ combined into a single config dictionary, and for parameters that are specified
 the command line takes precedence, followed by the config file and finally the supplemental file.
 """
 
+import json
 import os
 from unittest.mock import patch
 import pytest
-from doc_generator import DocGenerator
+from doc_generator import DocGenerator, reload_config
 
 
 base_cli_args = {
@@ -177,3 +178,60 @@ def test_cli_overrides_config(mock_exit):
     assert config.get('outfile_name') == 'cli_outfile_name.md'
     assert config.get('output_format') == 'markdown'
     assert config.get('escape_chars') == ['@', '#']
+
+
+@patch('sys.exit') # Doc generator warns and exits when some specified paths are not valid on the filesystem.
+@pytest.mark.filterwarnings("ignore:\"/config/path/to/payloads\" is not a directory. Exiting.")
+@pytest.mark.filterwarnings("ignore:\"/cli/path/to/payloads\" is not a directory. Exiting.")
+def test_config_outputs(mock_exit):
+    """ Verify that "outputs" in the config file produces settings for each output, and that
+    output options on the command line select a single output instead.
+    """
+    cfg = base_cfg_in.copy()
+    cfg['outputs'] = [
+        {'format': 'html', 'outfile': 'index.html'},
+        {'format': 'csv'},
+        {'format': 'markdown', 'property_index': True, 'property_index_config_out': 'pi_config.json'},
+        ]
+
+    config = DocGenerator.combine_configs(config_data=cfg)
+    assert config.get('outputs') == [
+        {'output_format': 'html', 'output_content': 'full_doc', 'with_table_numbering': False, 'outfile_name': 'index.html'},
+        {'output_format': 'csv', 'output_content': 'full_doc', 'with_table_numbering': False, 'outfile_name': 'output.csv'},
+        {'output_format': 'markdown', 'output_content': 'property_index', 'with_table_numbering': False,
+         'write_config_to': 'pi_config.json', 'outfile_name': 'property_index.md'},
+        ]
+
+    # Table numbering applies only to the markdown outputs, whatever the top-level format.
+    numbered_cfg = base_cfg_in.copy()
+    numbered_cfg['format'] = 'slate'
+    numbered_cfg['with_table_numbering'] = True
+    numbered_cfg['outputs'] = [{'format': 'markdown'}, {'format': 'html'}]
+    config = DocGenerator.combine_configs(config_data=numbered_cfg)
+    assert config.get('with_table_numbering') == True
+    assert [x['with_table_numbering'] for x in config['outputs']] == [True, False]
+
+    config = DocGenerator.combine_configs(command_line_args=base_cli_args.copy(), config_data=cfg)
+    assert 'outputs' not in config
+    assert config.get('output_format') == 'markdown'
+
+
+@pytest.mark.filterwarnings('ignore:Schema URI Mapping')
+@pytest.mark.filterwarnings('ignore:.*appears to be invalid JSON')
+def test_reload_config_waits_for_valid_config(tmp_path):
+    """ In watch mode, a config file saved with a JSON error doesn't stop the watcher; the config is read again
+    once the file changes. """
+    config_file = tmp_path / 'config.json'
+    config_file.write_text('{"html_title": "Title from config",')
+    cli_args = {'config_file': str(config_file)}
+    previous_config = {'config_files': [str(config_file)], 'watch_interval': 0}
+
+    def fix_config_file(interval):
+        config_file.write_text(json.dumps({'html_title': 'Fixed title from config'}))
+
+    with patch('doc_generator.time.sleep', side_effect=fix_config_file) as mock_sleep:
+        with pytest.warns(UserWarning, match='Unable to reload the configuration'):
+            config = reload_config(cli_args, previous_config)
+    assert mock_sleep.call_count == 1
+    assert config.get('html_title') == 'Fixed title from config'
+    assert config.get('config_files') == [str(config_file)]
@@ -37,3 +37,18 @@ def test_html_get_links(mockRequest):
     links = DocGenUtilities.html_get_links("https://testing.mock/foo.html");
     links.sort()
     assert links == expected_links
+
+
+def test_version_key():
+    assert DocGenUtilities.version_key('1.2.3') == (1, 2, 3)
+    assert DocGenUtilities.version_key('1_10_0') == (1, 10, 0)
+    assert DocGenUtilities.version_key('2.1') == (2, 1, 0)
+    versions = ['1.10.0', '1.2.0', '1_0_2', '1.1', '1.0.10']
+    assert sorted(versions, key=DocGenUtilities.version_key) == ['1_0_2', '1.0.10', '1.1', '1.2.0', '1.10.0']
+
+
+def test_compare_versions():
+    assert DocGenUtilities.compare_versions('1.10.0', '1.9.0') == 1
+    assert DocGenUtilities.compare_versions('1_2_0', '1.2') == 0
+    assert DocGenUtilities.compare_versions('1.2.0', '1.2.1') == -1
+    assert DocGenUtilities.compare_versions('foo', 'foo') == 0
@@ -13,6 +13,9 @@ import copy
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
+from doc_formatter import DocFormatter
+from doc_formatter.fragment_cache import FragmentCache
+from schema_traverser import SchemaTraverser
 
 testcase_path = os.path.join('tests', 'samples', 'fragments')
 fragment_path = os.path.join(testcase_path, 'CommonPropertySchema.json#/definitions/CommonProperties/properties');
@@ -88,3 +91,95 @@ def test_markdown_output(mockRequest):
     output = docGen.generate_docs()
 
     assert expected_output in output
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_fragment_cache_dir(mockRequest, tmp_path):
+    """ Rendered fragments saved to fragment_cache_dir are reused by later runs, with the same output. """
+
+    input_dir = os.path.join(testcase_path, 'json-schema')
+    expected_output = open(os.path.join(testcase_path, 'expected_output.md')).read()
+
+    outputs = []
+    put_counts = []
+    for i in range(2):
+        config = copy.deepcopy(base_config)
+        config['output_format'] = 'markdown'
+        config['fragment_cache_dir'] = str(tmp_path)
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+        # Each run starts with nothing in memory, as a separate process would.
+        docGen = DocGenerator([ input_dir ], '/dev/null', config)
+        fragment_cache = FragmentCache()
+        with patch.object(DocFormatter, 'fragment_cache', fragment_cache), \
+             patch.object(fragment_cache, 'put', wraps=fragment_cache.put) as put:
+            outputs.append(docGen.generate_docs())
+        put_counts.append(put.call_count)
+        if i == 0:
+            cached_files = sorted(os.listdir(tmp_path))
+            assert len(cached_files) == 1
+
+    assert sorted(os.listdir(tmp_path)) == cached_files
+    assert expected_output in outputs[0]
+    assert outputs[1] == outputs[0]
+    assert put_counts == [1, 0]
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_fragment_cache_shared(mockRequest):
+    """ A fragment is rendered once for several documents, each with its own copy of the schema data. """
+
+    input_dir = os.path.join(testcase_path, 'json-schema')
+    expected_output = open(os.path.join(testcase_path, 'expected_output.md')).read()
+
+    config = copy.deepcopy(base_config)
+    config['output_format'] = 'markdown'
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    outputs = [DocGenerator.make_output_config('markdown', 'output.md'),
+               DocGenerator.make_output_config('markdown', 'other_output.md')]
+
+    fragment_cache = FragmentCache()
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+    with patch.object(DocFormatter, 'fragment_cache', fragment_cache), \
+         patch.object(fragment_cache, 'put', wraps=fragment_cache.put) as put:
+        docs = docGen.generate_outputs(outputs)
+    assert expected_output in docs[0]
+    assert docs[1] == docs[0]
+    assert put.call_count == 1
+    assert len(fragment_cache.entries) == 1
+
+
+def test_fragment_schema_digest():
+    """ The digest in a fragment's cache key covers the schemas reachable from the fragment, and only those. """
+
+    schemas = {
+        'example.com/A.json': {'definitions': {
+            'Fragment': {'properties': {'Link': {'$ref': 'http://example.com/B.json#/definitions/Linked'},
+                                        'Local': {'$ref': '#/definitions/Local'}}},
+            'Local': {'type': 'string'},
+            'Unused': {'$ref': 'http://example.com/C.json#/definitions/Unused'},
+            }},
+        'example.com/B.json': {'definitions': {'Linked': {'type': 'integer'}}},
+        'example.com/C.json': {'definitions': {'Unused': {'type': 'integer'}}},
+        }
+    ref = 'example.com/A.json#/definitions/Fragment'
+
+    def digest(schemas, property_data={}):
+        return FragmentCache.schema_digest(ref, SchemaTraverser(copy.deepcopy(schemas), {}), property_data)
+
+    base_digest = digest(schemas)
+    changed = copy.deepcopy(schemas)
+    changed['example.com/C.json']['definitions']['Unused']['type'] = 'string'
+    assert digest(changed) == base_digest
+
+    changed = copy.deepcopy(schemas)
+    changed['example.com/B.json']['definitions']['Linked']['type'] = 'string'
+    assert digest(changed) != base_digest
+
+    changed = copy.deepcopy(schemas)
+    changed['example.com/A.json']['definitions']['Local']['type'] = 'integer'
+    assert digest(changed) != base_digest
+
+    assert digest(schemas, {'example.com/B.json': {'latest_version': '1.1.0'}}) != base_digest
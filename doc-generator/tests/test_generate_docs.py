@@ -201,3 +201,86 @@ def test_csv_output(mockRequest):
     output = output.replace('\r\n', '\n').strip()
 
     assert output == expected_output, "Failed on: " + name
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_generate_outputs(mockRequest):
+    """ Several outputs from one DocGenerator match the outputs generated one at a time. """
+
+    dirpath = os.path.abspath(os.path.join(testcase_path, 'general'))
+    input_dir = os.path.join(dirpath, 'input')
+
+    config = copy.deepcopy(base_config)
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    outputs = [DocGenerator.make_output_config('markdown', 'output.md'),
+               DocGenerator.make_output_config('html', 'output.md'),
+               DocGenerator.make_output_config('csv', 'output.md'),
+               DocGenerator.make_output_config('markdown', 'output.md', property_index=True)]
+
+    expected_outputs = []
+    for output in outputs:
+        single_config = copy.deepcopy(config)
+        single_config.update(output)
+        expected_outputs.append(DocGenerator([ input_dir ], '/dev/null', single_config).generate_docs())
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    assert docGen.generate_outputs(outputs) == expected_outputs
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_generate_outputs_with_table_numbering(mockRequest):
+    """ Table numbering applies to the markdown output of several, but not to the HTML output, which matches
+    an HTML output generated on its own. """
+
+    dirpath = os.path.abspath(os.path.join(testcase_path, 'general'))
+    input_dir = os.path.join(dirpath, 'input')
+
+    config = copy.deepcopy(base_config)
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    markdown_output = DocGenerator.make_output_config('markdown', 'output.md', with_table_numbering=True)
+    html_output = DocGenerator.make_output_config('html', 'output.md', with_table_numbering=True)
+
+    expected_outputs = []
+    for output in [markdown_output, html_output]:
+        single_config = copy.deepcopy(config)
+        single_config.update(output)
+        expected_outputs.append(DocGenerator([ input_dir ], '/dev/null', single_config).generate_docs())
+    assert 'Table_TBL_nn' in expected_outputs[0]
+
+    html_config = copy.deepcopy(config)
+    html_config['output_format'] = 'html'
+    assert expected_outputs[1] == DocGenerator([ input_dir ], '/dev/null', html_config).generate_docs()
+
+    # The top-level config has table numbering, as it does for the default slate format.
+    config.update(DocGenerator.make_output_config('slate', 'output.md', with_table_numbering=True))
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+    assert docGen.generate_outputs([markdown_output, html_output]) == expected_outputs
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_processed_data_round_trip(mockRequest, tmp_path):
+    """ Output generated from saved processed data matches output generated from the schemas. """
+
+    dirpath = os.path.abspath(os.path.join(testcase_path, 'general'))
+    input_dir = os.path.join(dirpath, 'input')
+    processed_data_file = str(tmp_path / 'processed.json.gz')
+
+    config = copy.deepcopy(base_config)
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['output_format'] = 'html'
+
+    save_config = copy.deepcopy(config)
+    save_config['processed_data_out'] = processed_data_file
+    expected_output = DocGenerator([ input_dir ], '/dev/null', save_config).generate_docs()
+    assert os.path.isfile(processed_data_file)
+
+    load_config = copy.deepcopy(config)
+    load_config['processed_data_in'] = processed_data_file
+    # The schema files are not read again:
+    docGen = DocGenerator([ os.path.join(dirpath, 'nonexistent') ], '/dev/null', load_config)
+    assert docGen.generate_docs() == expected_output
@@ -0,0 +1,33 @@
+# Copyright Notice:
+# Copyright 2022 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/main/LICENSE.md
+
+"""
+File: test_html_utils.py
+
+Brief: test(s) for markdown-to-HTML conversion in HtmlUtils.
+"""
+
+from format_utils import HtmlUtils
+
+
+def test_markdown_to_html_no_para():
+    formatter = HtmlUtils()
+    assert formatter.markdown_to_html('The *status* of the resource.') == '<p>The <em>status</em> of the resource.</p>'
+    assert formatter.markdown_to_html('The *status* of the resource.', no_para=True) == 'The <em>status</em> of the resource.'
+
+
+def test_markdown_to_html_conversions_are_independent():
+    """ The shared converter must not carry state, such as heading ids, from one conversion to the next. """
+    formatter = HtmlUtils()
+    assert formatter.markdown_to_html('# Properties') == '<h1 id="properties">Properties</h1>'
+    assert formatter.markdown_to_html('# Properties\n\ntext') == '<h1 id="properties">Properties</h1>\n<p>text</p>'
+    assert formatter.markdown_to_html('# Properties') == '<h1 id="properties">Properties</h1>'
+
+
+def test_markdown_to_html_headless_table():
+    """ Tables with an empty header row are rendered without a thead. """
+    formatter = HtmlUtils()
+    html_blob = formatter.markdown_to_html('| | |\n|---|---|\n| a | b |')
+    assert '<thead>' not in html_blob
+    assert '<td>a</td>' in html_blob
@@ -14,6 +14,7 @@ import copy
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
+from doc_gen_util import DocGenUtilities
 
 testcase_path = os.path.join('tests', 'samples', 'localized_schemas', 'general', 'input')
 
@@ -232,3 +233,26 @@ def test_localized_schemas_TEST_htmlmode(mockRequest):
 
     for x in expected_strings:
         assert x in output
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_localized_schemas_loaded_once(mockRequest):
+    """ Verify that each localized schema file is read at most once, however many times it is applied.
+    """
+
+    config = copy.deepcopy(base_config)
+    config['locale'] = 'TEST'
+    input_dir = os.path.abspath(testcase_path)
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = {input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+
+    with patch('doc_gen_util.DocGenUtilities.load_as_json', wraps=DocGenUtilities.load_as_json) as mock_load:
+        output = docGen.generate_docs()
+        translated_loads = [x[0][0] for x in mock_load.call_args_list if os.sep + 'TEST' + os.sep in x[0][0]]
+
+    assert len(translated_loads)
+    assert len(translated_loads) == len(set(translated_loads))
+    assert 'THE COMPUTERSYSTEM SCHEMA REPRESENTS A COMPUTER OR SYSTEM INSTANCE' in output
@@ -171,3 +171,26 @@ fin
     for anchor in expected_anchors:
         assert output.count('"' + anchor + '"') == 1
         assert output.count('(#' + anchor + ')') == 1
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_markdown_toc_many_duplicate_headings(mockRequest):
+    ''' Repeated headings are numbered in order, skipping suffixes already taken by other headings. '''
+
+    input_blob = '\n'.join(['# Properties', '## properties-2'] + ['## Properties'] * 4 + ['# Properties-3', '## Properties'])
+
+    expected_anchors = [
+        'properties',
+        'properties-2',
+        'properties-1',
+        'properties-3',
+        'properties-4',
+        'properties-5',
+        'properties-3-1',
+        'properties-6',
+        ]
+
+    doc_formatter = MarkdownGenerator({}, None, {}, 0)
+    output = doc_formatter.generate_toc_and_add_anchors(input_blob)
+
+    assert [line.split('"')[1] for line in output.splitlines() if '<a name=' in line] == expected_anchors
@@ -13,6 +13,7 @@ import copy
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
+from doc_gen_util import DocGenUtilities
 
 testcase_path = os.path.join('tests', 'samples', 'profile_mode')
 
@@ -116,3 +117,137 @@ def test_registry_uri_mapping (mockRequest):
     registry_summary = docGen.process_registry(registry_name, config['profile']['Registries'][registry_name])
 
     assert registry_summary.get('Name') == 'Fake Message Registry'
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_profile_prunes_unreferenced_schemas (mockRequest):
+    """ Test that schemas neither in the profile nor referenced from it are not processed. """
+
+    config = copy.deepcopy(base_config)
+
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'basic', 'NetworkPort'))
+    profile_dir = os.path.abspath(os.path.join(testcase_path, 'basic', 'profiles'))
+    profile_json = os.path.abspath(os.path.join(profile_dir, 'BasicInstanceProfile.v1_0_0.json'))
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['profile_doc'] = profile_json
+    config['profile_uri_to_local'] = { 'redfish.dmtf.org/profiles': profile_dir }
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+    with patch.object(DocGenerator, 'process_files', wraps=docGen.process_files) as process_files:
+        output = docGen.generate_docs()
+        processed = [x[0][0] for x in process_files.call_args_list]
+
+    assert 'redfish.dmtf.org/schemas/v1/NetworkPort.json' in processed
+    assert 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunctionCollection.json' not in processed
+
+    # Referenced schemas are still available for lookups:
+    schemas = docGen.generator.traverser.schemas
+    assert 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunction.json' in schemas
+    assert 'redfish.dmtf.org/schemas/v1/Resource.v1_6_0.json' in schemas
+    assert 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunctionCollection.json' not in schemas
+    assert '| **AssignablePhysicalPorts** ' in output
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_config_cache_dir (mockRequest, tmp_path):
+    """ With config_cache_dir, a later run with the same inputs uses the compiled profile and registries from
+    the cache instead of reading them again. """
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'registry_mapping', 'NetworkPort'))
+    profile_dir = os.path.abspath(os.path.join(testcase_path, 'registry_mapping', 'profiles'))
+    registry_dir = os.path.abspath(os.path.join(testcase_path, 'registry_mapping', 'registries'))
+    profile_json = os.path.abspath(os.path.join(profile_dir, 'ProfileWithFakeRegistry.v1_0_0.json'))
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['profile_doc'] = profile_json
+    config['profile_uri_to_local'] = { 'redfish.dmtf.org/profiles': profile_dir }
+    config['registry_uri_to_local'] = { 'contoso.com/registries': registry_dir }
+    config['config_cache_dir'] = str(tmp_path)
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    assert len(os.listdir(tmp_path)) == 1
+
+    with patch.object(DocGenerator, 'process_registry') as process_registry:
+        cachedDocGen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+        assert not process_registry.called
+
+    for key in DocGenerator.COMPILED_CONFIG_KEYS:
+        assert cachedDocGen.config.get(key) == docGen.config.get(key)
+    assert cachedDocGen.config['profile']['registries_annotated']['ContosoPizzaMessages'].get('Name') == 'Fake Message Registry'
+
+    # A different profile is a different set of inputs:
+    config['profile_doc'] = os.path.abspath(os.path.join(profile_dir, 'BasicInstanceProfile.v1_0_0.json'))
+    DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+@pytest.mark.parametrize('batch_workers', [1, 2])
+def test_profile_batch (mockRequest, batch_workers):
+    """ A batch of profiles produces the same documents as separate runs, and retrieves the required
+    profile (BasicClassProfile, required by the other two) once. """
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'basic', 'NetworkPort'))
+    profile_dir = os.path.abspath(os.path.join(testcase_path, 'registry_mapping', 'profiles'))
+    registry_dir = os.path.abspath(os.path.join(testcase_path, 'registry_mapping', 'registries'))
+    profile_names = ['BasicInstanceProfile.v1_0_0.json', 'ProfileWithFakeRegistry.v1_0_0.json', 'BasicClassProfile.v1_0_0.json']
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['profile_uri_to_local'] = { 'redfish.dmtf.org/profiles': profile_dir }
+    config['registry_uri_to_local'] = { 'contoso.com/registries': registry_dir }
+
+    expected_outputs = []
+    for profile_name in profile_names:
+        profile_config = copy.deepcopy(config)
+        profile_config['profile_doc'] = os.path.join(profile_dir, profile_name)
+        expected_outputs.append(DocGenerator([ input_dir ], '/dev/null', profile_config).generate_docs())
+    assert 'NetworkDeviceFunction' in expected_outputs[0]
+
+    batch_config = copy.deepcopy(config)
+    batch_config['profile_mode'] = False
+    batch_config['batch_workers'] = batch_workers
+    profiles = [{'profile_doc': os.path.join(profile_dir, x), 'profile_mode': 'terse'} for x in profile_names]
+    docGen = DocGenerator([ input_dir ], '/dev/null', batch_config)
+    with patch.object(DocGenUtilities, 'load_as_json', wraps=DocGenUtilities.load_as_json) as load_as_json:
+        assert docGen.generate_profile_docs(profiles) == expected_outputs
+    class_profile_loads = [x for x in load_as_json.call_args_list if x[0][0].endswith('BasicClassProfile.v1_0_0.json')]
+    assert len(class_profile_loads) == 2 # Once as a required profile, once as a document in the batch
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_profile_outputs (mockRequest):
+    """ Several outputs in profile mode match the outputs generated one at a time, while the schema files are
+    read once and processed once for each prune setting. """
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'basic', 'NetworkPort'))
+    profile_dir = os.path.abspath(os.path.join(testcase_path, 'basic', 'profiles'))
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['profile_doc'] = os.path.join(profile_dir, 'BasicInstanceProfile.v1_0_0.json')
+    config['profile_uri_to_local'] = { 'redfish.dmtf.org/profiles': profile_dir }
+
+    outputs = [DocGenerator.make_output_config('markdown', 'output.md'),
+               DocGenerator.make_output_config('markdown', 'output.md', property_index=True),
+               DocGenerator.make_output_config('html', 'output.html')]
+
+    expected_outputs = []
+    for output in outputs:
+        single_config = copy.deepcopy(config)
+        single_config.update(output)
+        expected_outputs.append(DocGenerator([ input_dir ], '/dev/null', single_config).generate_docs())
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    with patch.object(docGen, 'get_files', wraps=docGen.get_files) as get_files, \
+         patch.object(docGen, 'process_schemas', wraps=docGen.process_schemas) as process_schemas:
+        assert docGen.generate_outputs(outputs) == expected_outputs
+    assert get_files.call_count == 1
+    assert process_schemas.call_count == 2
+    assert docGen.processed_snapshots is None and docGen.grouped_schemas is None
@@ -0,0 +1,83 @@
+# Copyright Notice:
+# Copyright 2022 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/main/LICENSE.md
+
+"""
+File: test_property_filtering.py
+
+Brief: test(s) for the compiled exclusion, subset, and profile filters in DocFormatter.
+"""
+
+import copy
+import pytest
+from doc_formatter import DocFormatter
+
+base_config = {
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_annotations': ['@Redfish.Copyright'],
+    'excluded_annotations_by_match': ['@odata.count'],
+    'excluded_schemas': ['Settings'],
+    'excluded_schemas_by_match': ['Collection'],
+    'excluded_pattern_props': [],
+    'profile': {},
+    'output_format': 'slate',
+}
+
+
+def test_exclude_prop_names():
+    config = copy.deepcopy(base_config)
+    formatter = DocFormatter({}, None, config)
+
+    prop_names = ['Name', '@odata.id', 'Members@odata.count', 'Id', 'Links@odata.navigationLink', 'actions']
+    assert formatter.organize_prop_names(prop_names) == ['actions', 'Id', 'Name']
+    assert formatter.exclude_annotations(['@Redfish.Copyright', 'Members@odata.count', 'Name']) == ['Name']
+
+    # Explicit lists are still honored, and match the compiled config behavior:
+    assert formatter.exclude_prop_names(prop_names, config['excluded_properties'], config['excluded_by_match']) == \
+        formatter.organize_prop_names(prop_names)
+    assert formatter.exclude_prop_names(prop_names, [], []) == sorted(prop_names, key=str.lower)
+
+
+def test_exclusion_patterns_are_literal():
+    """ Partial-match exclusions are substrings, not regular expressions. """
+    exclusions = DocFormatter.compile_exclusions([], ['a.b', '(x'])
+    assert DocFormatter.matches_exclusions('Xa.bY', exclusions)
+    assert DocFormatter.matches_exclusions('(x)', exclusions)
+    assert not DocFormatter.matches_exclusions('aXb', exclusions)
+    assert DocFormatter.compile_exclusions([], ['a.b', '(x']) is exclusions
+
+
+def test_skip_schema():
+    config = copy.deepcopy(base_config)
+    formatter = DocFormatter({}, None, config)
+
+    assert formatter.skip_schema('Settings')
+    assert formatter.skip_schema('ChassisCollection')
+    assert not formatter.skip_schema('Chassis')
+    assert formatter.skipped_schemas == {'Settings': True, 'ChassisCollection': True, 'Chassis': False}
+
+
+def test_filter_props_by_subset():
+    config = copy.deepcopy(base_config)
+    formatter = DocFormatter({}, None, config)
+    prop_names = ['Id', 'Name', 'Status', 'Oem']
+
+    subset = {'Baseline': True, 'Properties': {'Oem': {'Include': False}, 'Status': {}}}
+    assert formatter.filter_props_by_subset(prop_names, subset) == ['Id', 'Name', 'Status']
+
+    subset = {'Properties': {'Status': {}, 'Oem': {'Include': False}, 'Name': {'Include': True}}}
+    assert formatter.filter_props_by_subset(prop_names, subset) == ['Status', 'Name']
+
+
+def test_filter_props_by_profile_terse_actions():
+    config = copy.deepcopy(base_config)
+    config['profile_mode'] = 'terse'
+    formatter = DocFormatter({}, None, config)
+
+    prop_names = ['#ComputerSystem.Reset', '#ComputerSystem.SetDefaultBootOrder', 'Oem']
+    profile = {'Reset': {}, 'Oem': {}, 'AddResourceBlock': {}}
+    assert formatter.filter_props_by_profile(prop_names, profile, [], True) == ['#ComputerSystem.Reset', 'Oem']
+
+    profile = {'PropertyRequirements': {'Name': {}, 'Status': {}}}
+    assert formatter.filter_props_by_profile(['Id', 'Name', 'Status', 'Oem'], profile, ['Id']) == ['Id', 'Name', 'Status']
@@ -160,3 +160,40 @@ def test_property_index_config_overrides(mockRequest):
     assert len(lines) and len([x for x in lines if override_desc in x]) == len(lines)
 
     updated_config = docGen.generator.generate_updated_config()
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_property_index_update_existing_config(mockRequest):
+    """ Updating an existing description_overrides entry list: changed descriptions are updated in place,
+    matching ones are left alone, and new descriptions get new entries. """
+
+    config = copy.deepcopy(base_config)
+
+    dirpath = os.path.abspath(os.path.join(testcase_path, 'thermal_plus'))
+    input_dir = os.path.join(dirpath, 'input')
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+    docGen.generate_docs()
+
+    prop_config = [
+        {'type': 'string', 'description': 'Old description.', 'knownException': True, 'schemas': ['SchemaA']},
+        {'type': 'string', 'description': 'Same description.', 'knownException': False, 'schemas': ['SchemaB']},
+        ]
+    info = {
+        'string': {
+            'New description.': [['SchemaA']],
+            'Same description.': [['SchemaB']],
+            'Added description.': [['SchemaC', 'Things']],
+            }
+        }
+
+    docGen.generator.update_config_for_prop_name_and_type('SomeProperty', 'string', info, prop_config)
+
+    assert prop_config == [
+        {'type': 'string', 'description': 'New description.', 'knownException': False, 'schemas': ['SchemaA']},
+        {'type': 'string', 'description': 'Same description.', 'knownException': False, 'schemas': ['SchemaB']},
+        {'type': 'string', 'description': 'Added description.', 'knownException': False, 'schemas': ['SchemaC/Things']},
+        ]
@@ -201,3 +201,30 @@ def test_release_history_output_html(mockRequest):
     output = output.replace('\n', '')
 
     assert expected_output in output
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+@pytest.mark.filterwarnings("ignore:Unable to find data")
+@pytest.mark.filterwarnings("ignore:Unable to read")
+@pytest.mark.filterwarnings("ignore:Unable to retrieve")
+def test_release_history_uses_grouped_schema_data(mockRequest):
+    """ Verify that release history for earlier versions is collected from the data already
+    loaded by group_files, without re-reading each versioned file.
+    """
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'release_history', 'input'))
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+    files_to_process = docGen.get_files(docGen.import_from)
+    grouped_files, schema_data = docGen.group_files(files_to_process)
+    refs = grouped_files['redfish.dmtf.org/schemas/v1/Storage.json']
+
+    with patch('doc_gen_util.DocGenUtilities.load_as_json') as mock_load:
+        history = docGen.summarize_version_history(refs[:-1], schema_data)
+        assert not mock_load.called
+
+    assert history.get('release_history') == expected_release_history[:-1]
@@ -0,0 +1,63 @@
+# Copyright Notice:
+# Copyright 2022 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/main/LICENSE.md
+
+"""
+File: test_startup.py
+
+Brief: Startup budget. Heavy modules (markdown, the HTTP client, and doc_formatter with its generators) should be
+imported only by the code paths that need them. Checked in a fresh interpreter, with "python -X importtime" for the
+time budget. (-X importtime is new in Python 3.7; earlier versions ignore it, and only the module checks apply.)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+doc_generator_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# About three times the import times measured on a development machine (doc_generator about 45 ms, doc_generator
+# and doc_formatter together about 75 ms), so that the tests aren't sensitive to machine load. The module checks
+# catch the known heavy imports; the budgets catch import time that creeps in elsewhere.
+doc_generator_budget_us = 150000
+markdown_generator_budget_us = 225000
+
+
+def run_imports(code):
+    """ Run code in a fresh interpreter with -X importtime. Returns the names of the modules loaded afterwards, and
+    a dict of module name: cumulative import time (us) from -X importtime (empty before Python 3.7). """
+    code += '; import sys, json; print(json.dumps(sorted(sys.modules)))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=doc_generator_dir,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    return set(json.loads(result.stdout.splitlines()[-1])), times
+
+
+def test_import_doc_generator():
+    modules, times = run_imports('import doc_generator')
+    for module_name in ['markdown', 'urllib.request', 'http.client', 'argparse', 'doc_formatter']:
+        assert module_name not in modules, module_name + ' was imported'
+    if times:
+        assert times['doc_generator'] < doc_generator_budget_us
+
+
+def test_import_markdown_generator():
+    modules, times = run_imports('import doc_generator; from doc_formatter import MarkdownGenerator')
+    assert 'doc_formatter.markdown_generator' in modules
+    for module_name in ['markdown', 'urllib.request', 'http.client']:
+        assert module_name not in modules, module_name + ' was imported'
+    if times:
+        assert times['doc_generator'] + times['doc_formatter'] < markdown_generator_budget_us
+
+
+def test_import_html_generator():
+    """ The HTML path still gets markdown when it converts something. """
+    modules, times = run_imports('from doc_formatter import HtmlGenerator; '
+                                 'from format_utils import HtmlUtils; HtmlUtils.markdown_to_html("*x*")')
+    assert 'doc_formatter.html_generator' in modules
+    assert 'markdown' in modules
@@ -321,3 +321,40 @@ def simple_strip_tags(s):
             out = out + c
 
     return out
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_watch_mode_supplement_change (mockRequest, tmp_path):
+    """ In watch mode, a changed md supplement is read again, and the schemas are not processed again. """
+
+    config = copy.deepcopy(base_config)
+    config['output_format'] = 'markdown'
+
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'ipaddresses'))
+    supplement_file = tmp_path / 'Endpoint.md'
+    with open(os.path.join(testcase_path, 'md_supplements', 'Endpoint.md')) as f:
+        supplement_file.write_text(f.read())
+
+    config['supplement_md_dir'] = str(tmp_path)
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    docGen.processed_snapshots = {} # as set up by watch
+    watched_files = docGen.watched_files()
+    assert watched_files[str(supplement_file)] == 'supplement'
+    assert 'schema' in watched_files.values()
+
+    output = docGen.generate_outputs([{}])[0]
+    assert "INTRO FOR Endpoint schema." in output
+
+    supplement_file.write_text(supplement_file.read_text().replace('INTRO FOR', 'REVISED INTRO FOR'))
+    docGen.apply_changes({str(supplement_file): 'supplement'})
+    with patch.object(DocGenerator, 'process_schemas', side_effect=AssertionError('schemas processed again')):
+        output = docGen.generate_outputs([{}])[0]
+    assert "REVISED INTRO FOR Endpoint schema." in output
+    assert output == DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+    # A schema change discards the processed schemas.
+    docGen.apply_changes({os.path.join(input_dir, 'Endpoint.v1_1_0.json'): 'schema'})
+    assert docGen.processed_snapshots == {}
@@ -0,0 +1,178 @@
+#! /usr/bin/python3
+# Copyright Notice:
+# Copyright 2018 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/main/LICENSE.md
+
+"""
+JSON Schema to OpenAPI YAML Benchmark
+
+File : benchmark.py
+
+Brief : This file measures the conversion steps of json-to-yaml.py over a folder of Redfish JSON Schema
+        files, comparing them against the implementations they replaced
+"""
+
+import argparse
+import copy
+import functools
+import importlib.util
+import json
+import os
+import sys
+import time
+import yaml
+
+# Load the converter module; its filename is not a valid module name
+spec = importlib.util.spec_from_file_location( "json_to_yaml", os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "json-to-yaml.py" ) )
+json_to_yaml = importlib.util.module_from_spec( spec )
+spec.loader.exec_module( json_to_yaml )
+
+def recursive_update_object( converter, json_data, auto_expand = False ):
+    """
+    The original recursive, in-place implementation of JSONToYAML.update_object
+
+    Args:
+        converter: The JSONToYAML object
+        json_data: The JSON object to process
+        auto_expand: Controls if this pass treats the definition as auto-expanded
+    """
+
+    # Remove "anyOf" terms
+    if "anyOf" in json_data and len( json_data["anyOf"] ) > 0:
+        if json_data["anyOf"][-1] == { "type": "null" }:
+            json_data["oneOf"] = [ { "$ref": json_data["anyOf"][0]["$ref"] }, { "enum": [ None ] } ]
+            json_data.pop( "anyOf" )
+        else:
+            for definition in json_data["anyOf"][-1]:
+                json_data[definition] = json_data["anyOf"][-1][definition]
+            json_data.pop( "anyOf" )
+
+    # Perform one for one replacements (meaning "term" becomes "x-term")
+    for replacement in json_to_yaml.ONE_FOR_ONE_REPLACEMENTS:
+        if replacement in json_data:
+            json_data["x-" + replacement] = json_data.pop( replacement )
+
+    # Perform simple removals
+    for removal in json_to_yaml.REMOVED_TERMS:
+        json_data.pop( removal, None )
+
+    if "readonly" in json_data:
+        json_data["readOnly"] = json_data.pop( "readonly" )
+
+    if "deprecated" in json_data:
+        json_data["x-deprecatedReason"] = json_data.pop( "deprecated" )
+        json_data["deprecated"] = True
+
+    if "patternProperties" in json_data:
+        json_data["x-patternProperties"] = json_data.pop( "patternProperties" )
+        for pattern in json_data["x-patternProperties"]:
+            if "type" in json_data["x-patternProperties"][pattern]:
+                json_data["x-patternProperties"][pattern].pop( "type" )
+
+    if "type" in json_data:
+        if isinstance( json_data["type"], list ):
+            json_data["type"] = json_data["type"][0]
+            json_data["nullable"] = True
+    if "type" in json_data:
+        if json_data["type"] == "integer":
+            json_data["format"] = "int64"
+
+    if "$ref" in json_data:
+        json_data["$ref"] = converter.update_reference( json_data["$ref"], json_data.get( "x-autoExpand", False ) or auto_expand )
+
+    # Perform the same process on all other objects in the structure
+    for key in json_data:
+        if isinstance( json_data[key], dict ):
+            if key == "items":
+                recursive_update_object( converter, json_data[key], auto_expand = json_data.get( "x-autoExpand", False ) )
+            else:
+                recursive_update_object( converter, json_data[key] )
+        elif isinstance( json_data[key], list ):
+            for i, item in enumerate( json_data[key] ):
+                if isinstance( json_data[key][i], dict ):
+                    recursive_update_object( converter, json_data[key][i] )
+
+def time_call( function, items, iterations ):
+    """
+    Times a function over a list of items
+
+    Args:
+        function: The function to call for each item
+        items: The list of items
+        iterations: The number of times to repeat the pass over the items
+
+    Returns:
+        The best time for a single pass, and the results of the last pass
+    """
+    best = None
+    for i in range( iterations ):
+        start = time.perf_counter()
+        results = [ function( item ) for item in items ]
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, results
+
+if __name__ == '__main__':
+
+    # Get the input arguments
+    argget = argparse.ArgumentParser( description = "A tool used to measure the conversion steps of json-to-yaml.py" )
+    argget.add_argument( "--input", "-I", type = str, required = True, help = "The folder containing the JSON files to convert" )
+    argget.add_argument( "--iterations", "-N", type = int, default = 3, help = "The number of times to repeat each measurement (default is 3)" )
+    args = argget.parse_args()
+
+    json_docs = []
+    schema_names = []
+    for filename in sorted( os.listdir( args.input ) ):
+        if filename.endswith( ".json" ):
+            with open( args.input + os.path.sep + filename ) as json_file:
+                json_docs.append( json.load( json_file ) )
+                schema_names.append( filename.rsplit( ".", 1 )[0].replace( ".", "_" ) )
+    print( "Loaded {} JSON files".format( len( json_docs ) ) )
+
+    # Object conversion
+    # Set up a converter without running a full conversion; references are cached so that file and network access
+    # for them is not measured
+    converter = json_to_yaml.JSONToYAML.__new__( json_to_yaml.JSONToYAML )
+    converter.input_dir = args.input
+    converter.odata_schema = json_to_yaml.CONFIG_DEF_ODATA_SCHEMA_LOC
+    update_reference = functools.lru_cache( maxsize = None )( converter.update_reference )
+    converter.update_reference = lambda ref, auto_expand = False : update_reference( ref, auto_expand )
+    def convert( index, update ):
+        converter.current_schema = schema_names[index]
+        return update( copy.deepcopy( json_docs[index] ) )
+    def recursive_convert( index ):
+        # The recursive version converts the object in place
+        data = copy.deepcopy( json_docs[index] )
+        converter.current_schema = schema_names[index]
+        recursive_update_object( converter, data )
+        return data
+    copy_time, copies = time_call( lambda index: copy.deepcopy( json_docs[index] ), range( len( json_docs ) ), args.iterations )
+    recursive_time, recursive_docs = time_call( recursive_convert, range( len( json_docs ) ), args.iterations )
+    stack_time, stack_docs = time_call( lambda index: convert( index, converter.update_object ), range( len( json_docs ) ), args.iterations )
+    print( "update_object (recursive): {:.3f}s".format( recursive_time - copy_time ) )
+    print( "update_object (stack):     {:.3f}s ({:.1f}x)".format( stack_time - copy_time, ( recursive_time - copy_time ) / ( stack_time - copy_time ) ) )
+    print( "Files converted differently: {}".format( len( [ i for i in range( len( json_docs ) ) if recursive_docs[i] != stack_docs[i] ] ) ) )
+    json_docs = stack_docs
+
+    # Emitters
+    if json_to_yaml.CNoAliasDumper is None:
+        print( "ERROR: PyYAML was not built with libyaml support" )
+        sys.exit( 1 )
+    py_time, py_strings = time_call( lambda data: yaml.dump( data, Dumper = json_to_yaml.NoAliasDumper, default_flow_style = False ), json_docs, args.iterations )
+    c_time, c_strings = time_call( lambda data: yaml.dump( data, Dumper = json_to_yaml.CNoAliasDumper, default_flow_style = False ), json_docs, args.iterations )
+    auto_time, auto_strings = time_call( json_to_yaml.dump_yaml, json_docs, args.iterations )
+    print( "Dump (pure Python): {:.3f}s".format( py_time ) )
+    print( "Dump (libyaml):     {:.3f}s ({:.1f}x)".format( c_time, py_time / c_time ) )
+    print( "Dump (dump_yaml):   {:.3f}s ({:.1f}x)".format( auto_time, py_time / auto_time ) )
+    print( "Files formatted differently by libyaml: {}".format( len( [ i for i in range( len( json_docs ) ) if py_strings[i] != c_strings[i] ] ) ) )
+    print( "Files formatted differently by dump_yaml: {}".format( len( [ i for i in range( len( json_docs ) ) if py_strings[i] != auto_strings[i] ] ) ) )
+
+    # Loaders
+    py_time, py_docs = time_call( lambda data: yaml.load( data, Loader = yaml.Loader ), py_strings, args.iterations )
+    c_time, c_docs = time_call( lambda data: yaml.load( data, Loader = json_to_yaml.YAMLLoader ), py_strings, args.iterations )
+    print( "Load (pure Python): {:.3f}s".format( py_time ) )
+    print( "Load (libyaml):     {:.3f}s ({:.1f}x)".format( c_time, py_time / c_time ) )
+    print( "Files loaded differently by libyaml: {}".format( len( [ i for i in range( len( json_docs ) ) if py_docs[i] != c_docs[i] ] ) ) )
+
+    sys.exit( 0 )
@@ -13,7 +13,10 @@ Brief : This file contains the definitions and functionalities for converting
 """
 
 import argparse
+import concurrent.futures
 import errno
+import functools
+import hashlib
 import json
 import os
 import re
@@ -29,6 +32,13 @@ ONE_FOR_ONE_REPLACEMENTS = [ "longDescription", "enumDescriptions", "enumLongDes
 # List of terms that are removed from the file
 REMOVED_TERMS = [ "insertable", "updatable", "deletable", "uris", "urisDeprecated", "parameters", "requiredParameter", "actionResponse" ]
 
+# Mapping of terms to the names they are given in the converted file
+RENAMED_TERMS = { term: "x-" + term for term in ONE_FOR_ONE_REPLACEMENTS }
+# The "o" is capitalized in OpenAPI
+RENAMED_TERMS["readonly"] = "readOnly"
+RENAMED_TERMS["deprecated"] = "x-deprecatedReason"
+RENAMED_TERMS["patternProperties"] = "x-patternProperties"
+
 # Responses allowed
 HEAD_RESPONSES = [ 204 ]
 GET_RESPONSES = [ 200 ]
@@ -38,6 +48,13 @@ CREATE_RESPONSES = [ 201, 202, 204 ]
 ACTION_RESPONSES = [ 200, 201, 202, 204 ]
 DELETE_RESPONSES = [ 200, 202, 204 ]
 
+# Responses that contain a representation of the resource; all others are the same for every URI
+RESOURCE_RESPONSES = [ 200, 201, 301, 302 ]
+
+# Names of the shared response objects for responses that are the same for every URI; all others are errors
+COMMON_RESPONSES = { 202: "Accepted", 204: "NoContent", 304: "NotModified" }
+COMMON_ERROR_RESPONSE = "Error"
+
 # Default configurations
 CONFIG_DEF_MESSAGE_REF = "http://redfish.dmtf.org/schemas/v1/Message.v1_1_0.yaml#/components/schemas/Message_v1_1_0_Message"
 CONFIG_DEF_TASK_REF = "http://redfish.dmtf.org/schemas/v1/Task.v1_4_3.yaml#/components/schemas/Task_v1_4_3_Task"
@@ -45,6 +62,221 @@ CONFIG_DEF_ODATA_SCHEMA_LOC = "http://redfish.dmtf.org/schemas/v1/odata-v4.yaml"
 CONFIG_DEF_OUT_FILE = "openapi.yaml"
 CONFIG_DEF_EXTENSIONS = {}
 
+# Version of the fragment store contents; increment when the conversion of JSON files changes
+FRAGMENT_STORE_VERSION = 2
+
+# Use the libyaml based emitter and loader if available; they are much faster than the pure Python versions
+try:
+    from yaml import CDumper, CLoader as YAMLLoader
+except ImportError:
+    CDumper = None
+    from yaml import Loader as YAMLLoader
+
+# Strings that the libyaml and pure Python emitters both write without escaping: printable ASCII characters only
+EMITTER_SAFE_STRING = re.compile( "[\x20-\x7e]*" )
+
+class NoAliasDumper( yaml.Dumper ):
+    """
+    YAML dumper that writes repeated objects in full instead of using anchors and aliases
+    """
+
+    def ignore_aliases( self, data ):
+        return True
+
+if CDumper is not None:
+    class CNoAliasDumper( CDumper ):
+        """
+        libyaml based version of NoAliasDumper
+        """
+
+        ignore_aliases = NoAliasDumper.ignore_aliases
+else:
+    CNoAliasDumper = None
+
+class YAMLMappingWriter:
+    """
+    Class for writing a YAML document containing a mapping one entry at a time
+
+    The output matches yaml.dump of the full mapping as long as the entries are written in sorted order of their keys
+
+    Args:
+        stream: The stream to write the document to
+        dumper: The YAML dumper class to use
+    """
+
+    def __init__( self, stream, dumper ):
+        self.dumper = dumper( stream, default_flow_style = False )
+        self.dumper.emit( yaml.StreamStartEvent() )
+        self.dumper.emit( yaml.DocumentStartEvent() )
+        self.dumper.emit( yaml.MappingStartEvent( None, yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, True, flow_style = False ) )
+
+    def write_entry( self, key, value ):
+        """
+        Writes an entry to the current mapping
+
+        Args:
+            key: The key of the entry
+            value: The value of the entry
+        """
+        self.write_object( key )
+        self.write_object( value )
+
+    def start_mapping( self, key ):
+        """
+        Starts a nested mapping as the value of an entry; following entries are written to it until end_mapping
+
+        Args:
+            key: The key of the entry
+        """
+        self.write_object( key )
+        self.dumper.emit( yaml.MappingStartEvent( None, yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, True, flow_style = False ) )
+
+    def end_mapping( self ):
+        """
+        Ends the current nested mapping
+        """
+        self.dumper.emit( yaml.MappingEndEvent() )
+
+    def close( self ):
+        """
+        Ends the document
+        """
+        self.dumper.emit( yaml.MappingEndEvent() )
+        self.dumper.emit( yaml.DocumentEndEvent() )
+        self.dumper.emit( yaml.StreamEndEvent() )
+
+    def write_object( self, data ):
+        """
+        Writes an object as the events for its YAML representation
+
+        Args:
+            data: The object to write
+        """
+        node = self.dumper.represent_data( data )
+        self.dumper.represented_objects = {}
+        self.dumper.object_keeper = []
+        self.dumper.alias_key = None
+
+        # Same as the events yaml.dump generates for the node, without anchors and aliases
+        stack = [ node ]
+        while stack:
+            node = stack.pop()
+            if isinstance( node, yaml.Event ):
+                # End of a collection
+                self.dumper.emit( node )
+            elif isinstance( node, yaml.ScalarNode ):
+                detected_tag = self.dumper.resolve( yaml.ScalarNode, node.value, ( True, False ) )
+                default_tag = self.dumper.resolve( yaml.ScalarNode, node.value, ( False, True ) )
+                implicit = ( node.tag == detected_tag ), ( node.tag == default_tag )
+                self.dumper.emit( yaml.ScalarEvent( None, node.tag, implicit, node.value, style = node.style ) )
+            elif isinstance( node, yaml.SequenceNode ):
+                implicit = ( node.tag == self.dumper.resolve( yaml.SequenceNode, node.value, True ) )
+                self.dumper.emit( yaml.SequenceStartEvent( None, node.tag, implicit, flow_style = node.flow_style ) )
+                stack.append( yaml.SequenceEndEvent() )
+                stack.extend( reversed( node.value ) )
+            elif isinstance( node, yaml.MappingNode ):
+                implicit = ( node.tag == self.dumper.resolve( yaml.MappingNode, node.value, True ) )
+                self.dumper.emit( yaml.MappingStartEvent( None, node.tag, implicit, flow_style = node.flow_style ) )
+                stack.append( yaml.MappingEndEvent() )
+                for key_node, value_node in reversed( node.value ):
+                    stack.append( value_node )
+                    stack.append( key_node )
+
+class FragmentStore:
+    """
+    Class for storing converted JSON Schema files between runs
+
+    Each fragment holds the converted YAML, URI information, and action information for a JSON file, along with the
+    hashes of the other input files and remote files read during its conversion.  Fragments are keyed by a hash of the
+    JSON file's name and contents and the settings that affect the conversion.
+
+    Args:
+        directory: The folder containing the stored fragments
+        input_dir: The folder containing the input JSON files
+        settings: The settings that affect the conversion of JSON files
+    """
+
+    def __init__( self, directory, input_dir, settings ):
+        self.directory = directory
+        self.input_dir = input_dir
+        self.settings = json.dumps( [ FRAGMENT_STORE_VERSION, settings ] ).encode()
+        self.file_hashes = {}
+
+        if not os.path.exists( directory ):
+            os.makedirs( directory )
+
+    def get_key( self, filename, contents ):
+        """
+        Gets the key for a JSON file
+
+        Args:
+            filename: The name of the JSON file
+            contents: The contents of the JSON file
+
+        Returns:
+            The key for the JSON file
+        """
+        key = hashlib.sha256( self.settings )
+        key.update( filename.encode() + b"\0" )
+        key.update( contents )
+        return key.hexdigest()
+
+    def get_file_hash( self, filename ):
+        """
+        Gets the hash of a file in the input directory, or of a remote file
+
+        Args:
+            filename: The name of the file, or the URI of a remote file
+
+        Returns:
+            The hash of the file contents, or None if the file does not exist or could not be downloaded
+        """
+        if filename not in self.file_hashes:
+            if "://" in filename:
+                contents = fetch_remote_file( filename )
+                self.file_hashes[filename] = None if contents is None else hashlib.sha256( contents ).hexdigest()
+                return self.file_hashes[filename]
+            try:
+                with open( self.input_dir + os.path.sep + filename, "rb" ) as file:
+                    self.file_hashes[filename] = hashlib.sha256( file.read() ).hexdigest()
+            except FileNotFoundError:
+                self.file_hashes[filename] = None
+        return self.file_hashes[filename]
+
+    def get( self, key ):
+        """
+        Gets a stored fragment
+
+        Args:
+            key: The key for the JSON file
+
+        Returns:
+            The fragment, or None if it's not stored or the files it depends on have changed
+        """
+        try:
+            with open( self.directory + os.path.sep + key + ".json" ) as fragment_file:
+                fragment = json.load( fragment_file )
+        except:
+            return None
+
+        for filename, file_hash in fragment["dependencies"].items():
+            if self.get_file_hash( filename ) != file_hash:
+                return None
+        return fragment
+
+    def put( self, key, fragment ):
+        """
+        Stores a fragment
+
+        Args:
+            key: The key for the JSON file
+            fragment: The fragment to store
+        """
+        fragment_filename = self.directory + os.path.sep + key + ".json"
+        with open( fragment_filename + ".tmp", "w" ) as fragment_file:
+            json.dump( fragment, fragment_file )
+        os.replace( fragment_filename + ".tmp", fragment_filename )
+
 class JSONToYAML:
     """
     Class for managing translation data and processing
@@ -61,10 +293,14 @@ class JSONToYAML:
         info_block: The info block to put in the OpenAPI Service Document
         extensions: The URI extensions to apply to given resource types
         do_not_write: A list of files to not write
+        workers: The number of worker processes to use when converting JSON files
+        fragment_store: The folder to store converted JSON files in, so that unchanged files are not converted again
+        shared_components: Flag to indicate if responses and parameters are referenced from the components of the service document
     """
 
-    def __init__( self, input, output, overwrite, base_file, service_file, odata_schema, message_ref, task_ref, info_block, extensions, do_not_write ):
+    def __init__( self, input, output, overwrite, base_file, service_file, odata_schema, message_ref, task_ref, info_block, extensions, do_not_write, workers = 1, fragment_store = None, shared_components = False ):
         self.odata_schema = odata_schema
+        self.shared_components = shared_components
         self.message_ref = message_ref
         self.task_ref = task_ref
         self.info_block = info_block
@@ -72,6 +308,10 @@ class JSONToYAML:
         self.action_cache = {}
         self.input_dir = input
         self.current_schema = None
+        self.dependencies = {}
+        self.fragment_store = None
+        if fragment_store is not None:
+            self.fragment_store = FragmentStore( fragment_store, input, { "ODataSchema": odata_schema } )
 
         # Initialize the caches if extending an existing definition
         if base_file is not None:
@@ -82,49 +322,26 @@ class JSONToYAML:
             os.makedirs( output )
 
         # Step through each file in the input directory
-        for filename in os.listdir( input ):
-            if filename.endswith( ".json" ):
-                print( "Generating YAML for: {}".format( filename ) )
-                self.current_schema = filename.rsplit( ".", 1 )[0].replace( ".", "_" )
-                json_data = None
-                try:
-                    with open( input + os.path.sep + filename ) as json_file:
-                        json_data = json.load( json_file )
-                except json.JSONDecodeError:
-                    print( "ERROR: {} contains a malformed JSON object".format( filename ) )
-                except:
-                    print( "ERROR: Could not open {}".format( filename ) )
-
-                # Translate the JSON document
-                if json_data is not None:
-                    # Cache URI and method information (if available)
-                    self.check_for_uri_info( json_data, filename )
-                    self.check_for_actions( json_data, filename )
-
-                    # Remove top level $schema and $ref
-                    json_data.pop( "$schema", None )
-                    json_data.pop( "$ref", None )
-                    json_data.pop( "$id", None )
-
-                    # Replace top level copyright and definitions
-                    if "copyright" in json_data:
-                        json_data["x-copyright"] = json_data.pop( "copyright" )
-                    if "definitions" in json_data:
-                        json_data["components"] = { "schemas": json_data.pop( "definitions" ) }
-                        for definition in list( json_data["components"]["schemas"].keys() ):
-                            json_data["components"]["schemas"][self.current_schema + "_" + definition] = json_data["components"]["schemas"].pop( definition )
-
-                    # Process the object (and sub-objects) as needed for further conversion
-                    self.update_object( json_data )
-
-                    out_filename = output + os.path.sep + filename.rsplit( ".", 1 )[0] + ".yaml"
-                    out_filename_short = filename.rsplit( ".", 1 )[0] + ".yaml"
-                    if len( [ i for i in do_not_write if out_filename_short.startswith( i ) ] ) == 0:
-                        if overwrite or is_unversioned( filename ) or ( not os.path.isfile( out_filename ) ):
-                            yaml.Dumper.ignore_aliases = lambda *args : True
-                            out_string = yaml.dump( json_data, default_flow_style = False )
-                            with open( out_filename, "w" ) as file:
-                                file.write( out_string )
+        # Each file is converted independently; the URI and action information found in each is merged afterwards
+        uri_cache = self.uri_cache
+        action_cache = self.action_cache
+        self.uri_cache = {}
+        self.action_cache = {}
+        filenames = [ filename for filename in os.listdir( input ) if filename.endswith( ".json" ) ]
+        if workers > 1 and len( filenames ) > 1:
+            convert = functools.partial( self.convert_file, output = output, overwrite = overwrite, do_not_write = do_not_write )
+            with concurrent.futures.ProcessPoolExecutor( max_workers = workers ) as executor:
+                results = list( executor.map( convert, filenames, chunksize = max( 1, len( filenames ) // ( workers * 4 ) ) ) )
+        else:
+            results = [ self.convert_file( filename, output, overwrite, do_not_write ) for filename in filenames ]
+        for file_uri_cache, file_action_cache in results:
+            uri_cache.update( file_uri_cache )
+            for yaml_file in file_action_cache:
+                if yaml_file not in action_cache:
+                    action_cache[yaml_file] = {}
+                action_cache[yaml_file].update( file_action_cache[yaml_file] )
+        self.uri_cache = uri_cache
+        self.action_cache = action_cache
 
         # Update the URI information with the action information collected
         self.update_uri_info_with_actions()
@@ -140,40 +357,177 @@ class JSONToYAML:
         service_doc["components"]["schemas"] = {}
         service_doc["components"]["schemas"]["RedfishError"] = self.generate_redfish_error()
 
-        # Build the paths for the service document
-        service_doc["paths"] = {}
-        for uri in self.uri_cache:
-            service_doc["paths"][uri] = {}
-
-            # Build the parameters for the URI
-            parameters = self.generate_parameters( uri )
-            if parameters is not None:
-                service_doc["paths"][uri]["parameters"] = parameters
-
-            # Generate the operation constructs allowed by the URI
-            if not self.uri_cache[uri]["action"]:
-                # URI is for a resource; add GET, and potentially POST, PATCH, PUT, and DELETE based on the capabilities
-                #service_doc["paths"][uri]["head"] = self.generate_operation( uri, HEAD_RESPONSES )
-                service_doc["paths"][uri]["get"] = self.generate_operation( uri, GET_RESPONSES )
-                if self.uri_cache[uri]["insertable"]:
-                    service_doc["paths"][uri]["post"] = self.generate_operation( uri, CREATE_RESPONSES, True )
-                if self.uri_cache[uri]["updatable"]:
-                    service_doc["paths"][uri]["patch"] = self.generate_operation( uri, PATCH_RESPONSES, True )
-                    service_doc["paths"][uri]["put"] = self.generate_operation( uri, PUT_RESPONSES, True )
-                if self.uri_cache[uri]["deletable"]:
-                    service_doc["paths"][uri]["delete"] = self.generate_operation( uri, DELETE_RESPONSES )
-            else:
-                # URI is for an action; add POST
-                service_doc["paths"][uri]["post"] = self.generate_operation( uri, ACTION_RESPONSES, True )
+        # Add in the responses and parameters that are the same for every URI if they are shared
+        if self.shared_components:
+            service_doc["components"]["responses"] = self.generate_shared_responses()
+            parameters = self.generate_shared_parameters()
+            if parameters:
+                service_doc["components"]["parameters"] = parameters
 
         # Add in the well-known OData URIs that are not defined by schema files
-        service_doc["paths"]["/redfish/v1/$metadata"] = self.generate_metadata_operations()
-        service_doc["paths"]["/redfish/v1/odata"] = self.generate_odata_operations()
+        other_paths = {}
+        other_paths["/redfish/v1/$metadata"] = self.generate_metadata_operations
+        other_paths["/redfish/v1/odata"] = self.generate_odata_operations
 
         # Write the constructed openapi.yaml file
-        out_string = yaml.dump( service_doc, default_flow_style = False )
+        # The paths are built and written one URI at a time, in the sorted order yaml.dump would use, so the whole set
+        # of paths is never held in memory
+        # Everything written in the paths comes from the URI information, so checking it is enough to select the dumper
+        dumper = select_dumper( [ service_doc, self.uri_cache, self.task_ref ] )
         with open( service_file, "w" ) as file:
-            file.write( out_string )
+            writer = YAMLMappingWriter( file, dumper )
+            for key in sorted( service_doc ):
+                writer.write_entry( key, service_doc[key] )
+            writer.start_mapping( "paths" )
+            for uri in sorted( set( self.uri_cache ) | set( other_paths ) ):
+                if uri in other_paths:
+                    writer.write_entry( uri, other_paths[uri]() )
+                else:
+                    writer.write_entry( uri, self.generate_path( uri ) )
+            writer.end_mapping()
+            writer.close()
+
+    def convert_file( self, filename, output, overwrite, do_not_write ):
+        """
+        Converts a JSON Schema file to an OpenAPI YAML file
+
+        Args:
+            filename: The name of the JSON file in the input directory
+            output: The folder to store the resulting YAML file
+            overwrite: Whether or not to overwrite versioned files
+            do_not_write: A list of files to not write
+
+        Returns:
+            The URI information and action information found in the file
+        """
+        print( "Generating YAML for: {}".format( filename ) )
+        out_filename = output + os.path.sep + filename.rsplit( ".", 1 )[0] + ".yaml"
+        out_filename_short = filename.rsplit( ".", 1 )[0] + ".yaml"
+        write_file = False
+        if len( [ i for i in do_not_write if out_filename_short.startswith( i ) ] ) == 0:
+            if overwrite or is_unversioned( filename ) or ( not os.path.isfile( out_filename ) ):
+                write_file = True
+
+        contents = None
+        try:
+            with open( self.input_dir + os.path.sep + filename, "rb" ) as json_file:
+                contents = json_file.read()
+        except:
+            print( "ERROR: Could not open {}".format( filename ) )
+            return {}, {}
+
+        # Use the stored conversion of the file if it's unchanged
+        fragment = None
+        if self.fragment_store is not None:
+            key = self.fragment_store.get_key( filename, contents )
+            fragment = self.fragment_store.get( key )
+            if fragment is not None and write_file and fragment["yaml"] is None:
+                fragment = None
+
+        if fragment is None:
+            fragment = self.generate_fragment( filename, contents, write_file )
+            if fragment is None:
+                return {}, {}
+            if self.fragment_store is not None:
+                self.fragment_store.put( key, fragment )
+
+        if write_file:
+            with open( out_filename, "w" ) as file:
+                file.write( fragment["yaml"] )
+
+        return fragment["uri_cache"], fragment["action_cache"]
+
+    def generate_fragment( self, filename, contents, dump = True ):
+        """
+        Performs the conversion of a JSON Schema file
+
+        Args:
+            filename: The name of the JSON file in the input directory
+            contents: The contents of the JSON file
+            dump: Whether or not to produce the YAML string for the converted file
+
+        Returns:
+            A fragment containing the YAML string, the URI information and action information found in the file, and
+            the hashes of other input files read during the conversion; None if the file could not be parsed
+        """
+        self.uri_cache = {}
+        self.action_cache = {}
+        self.dependencies = {}
+
+        self.current_schema = filename.rsplit( ".", 1 )[0].replace( ".", "_" )
+        try:
+            json_data = json.loads( contents )
+        except json.JSONDecodeError:
+            print( "ERROR: {} contains a malformed JSON object".format( filename ) )
+            return None
+        except:
+            print( "ERROR: Could not open {}".format( filename ) )
+            return None
+
+        # Cache URI and method information (if available)
+        self.check_for_uri_info( json_data, filename )
+        self.check_for_actions( json_data, filename )
+
+        # Remove top level $schema and $ref
+        json_data.pop( "$schema", None )
+        json_data.pop( "$ref", None )
+        json_data.pop( "$id", None )
+
+        # Replace top level copyright and definitions
+        if "copyright" in json_data:
+            json_data["x-copyright"] = json_data.pop( "copyright" )
+        if "definitions" in json_data:
+            json_data["components"] = { "schemas": json_data.pop( "definitions" ) }
+            for definition in list( json_data["components"]["schemas"].keys() ):
+                json_data["components"]["schemas"][self.current_schema + "_" + definition] = json_data["components"]["schemas"].pop( definition )
+
+        # Process the object (and sub-objects) as needed for further conversion
+        json_data = self.update_object( json_data )
+
+        fragment = {}
+        fragment["yaml"] = None
+        if dump:
+            fragment["yaml"] = dump_yaml( json_data )
+        fragment["uri_cache"] = self.uri_cache
+        fragment["action_cache"] = self.action_cache
+        fragment["dependencies"] = self.dependencies
+        return fragment
+
+    def load_input_file( self, filename ):
+        """
+        Loads a JSON file from the input directory, noting it as a dependency of the file being converted
+
+        Args:
+            filename: The name of the JSON file
+
+        Returns:
+            The JSON object, or None if the file does not exist
+        """
+        json_file_path = self.input_dir + os.path.sep + filename
+        if not os.path.isfile( json_file_path ):
+            self.dependencies[filename] = None
+            return None
+        with open( json_file_path, "rb" ) as json_file:
+            contents = json_file.read()
+        self.dependencies[filename] = hashlib.sha256( contents ).hexdigest()
+        return json.loads( contents )
+
+    def load_remote_file( self, uri ):
+        """
+        Downloads a JSON file, noting it as a dependency of the file being converted
+
+        Args:
+            uri: The URI of the JSON file
+
+        Returns:
+            The JSON object, or None if the file could not be downloaded
+        """
+        contents = fetch_remote_file( uri )
+        if contents is None:
+            self.dependencies[uri] = None
+            return None
+        self.dependencies[uri] = hashlib.sha256( contents ).hexdigest()
+        return json.loads( contents.decode() )
 
     def load_base_file( self, filename, extensions ):
         """
@@ -185,7 +539,7 @@ class JSONToYAML:
         """
         try:
             with open( filename ) as yaml_file:
-                yaml_data = yaml.load( yaml_file, Loader=yaml.Loader )
+                yaml_data = yaml.load( yaml_file, Loader = YAMLLoader )
         except:
             print( "ERROR: Could not open {}".format( filename ) )
             return
@@ -296,23 +650,12 @@ class JSONToYAML:
                             mem_filename = mem_filename_full.rsplit( "/", 1 )[1]
                             mem_definition = definition["anyOf"][-1]["properties"]["Members"]["items"]["$ref"].rsplit( "/", 1 )[-1]
                             try:
-                                with open( self.input_dir + os.path.sep + mem_filename ) as json_file:
-                                    mem_json_data = json.load( json_file )
-                                    request_body = build_external_reference( mem_json_data["definitions"][mem_definition]["anyOf"][-1]["$ref"] )
+                                mem_json_data = self.load_input_file( mem_filename )
+                                request_body = build_external_reference( mem_json_data["definitions"][mem_definition]["anyOf"][-1]["$ref"] )
                             except:
-                                retry_count = 0
-                                retry_count_max = 20
-                                while retry_count < retry_count_max:
-                                    try:
-                                        req = urllib.request.Request( mem_filename_full )
-                                        response = urllib.request.urlopen( req )
-                                        mem_json_data = json.loads( response.read().decode() )
-                                        request_body = build_external_reference( mem_json_data["definitions"][mem_definition]["anyOf"][-1]["$ref"] )
-                                        break
-                                    except OSError as e:
-                                        if e.errno != errno.ECONNRESET:
-                                            break
-                                        retry_count += 1
+                                mem_json_data = self.load_remote_file( mem_filename_full )
+                                if mem_json_data is not None:
+                                    request_body = build_external_reference( mem_json_data["definitions"][mem_definition]["anyOf"][-1]["$ref"] )
                         else:
                             reference = build_external_reference( definition["anyOf"][-1]["$ref"] )
                             request_body = reference
@@ -429,139 +772,189 @@ class JSONToYAML:
 
     def update_object( self, json_data, auto_expand = False ):
         """
-        Performs a recursive update of all objects in the JSON object
+        Converts a JSON object, and all objects nested within it, to the OpenAPI form
 
         Args:
             json_data: The JSON object to process
             auto_expand: Controls if this pass treats the definition as auto-expanded
+
+        Returns:
+            A new object with the converted contents
         """
 
-        # Remove "anyOf" terms
-        if "anyOf" in json_data and len( json_data["anyOf"] ) > 0:
-            # Two patterns we follow for "anyOf" usage:
-            # 1) Arrays to show an item can be a particular definition or null
-            # In this case, we need to use the OpenAPI "oneOf" term to point to the reference and null
-            if json_data["anyOf"][-1] == { "type": "null" }:
-                json_data["oneOf"] = [ { "$ref": json_data["anyOf"][0]["$ref"] }, { "enum": [ None ] } ]
-                json_data.pop( "anyOf" )
-            # 2) Abstract base definitions that point to every versioned definition
-            # Keeping this causes significant client code bloat, so just use the latest version
-            else:
-                for definition in json_data["anyOf"][-1]:
-                    json_data[definition] = json_data["anyOf"][-1][definition]
-                json_data.pop( "anyOf" )
-
-        # Perform one for one replacements (meaning "term" becomes "x-term")
-        for replacement in ONE_FOR_ONE_REPLACEMENTS:
-            if replacement in json_data:
-                json_data["x-" + replacement] = json_data.pop( replacement )
-
-        # Perform simple removals
-        for removal in REMOVED_TERMS:
-            json_data.pop( removal, None )
-
-        # Update readonly
-        # The "o" is capitalized in OpenAPI
-        if "readonly" in json_data:
-            json_data["readOnly"] = json_data.pop( "readonly" )
-
-        # Update the deprecated info
-        # "deprecated" is a built in term, but we don't want to lose track of the reason info
-        if "deprecated" in json_data:
-            json_data["x-deprecatedReason"] = json_data.pop( "deprecated" )
-            json_data["deprecated"] = True
-
-        # Update the patternProperties info
-        # "patternProperties" is not in OpenAPI, and some of its inner structures needs special conversion
-        if "patternProperties" in json_data:
-            json_data["x-patternProperties"] = json_data.pop( "patternProperties" )
-            # Remove the type property from patternProperties
-            for pattern in json_data["x-patternProperties"]:
-                if "type" in json_data["x-patternProperties"][pattern]:
-                    json_data["x-patternProperties"][pattern].pop( "type" )
-
-        # Update type to be singular
-        # OpenAPI doesn't allow type to be an array; in the Redfish usage, this is for when something is nullable
-        if "type" in json_data:
-            if isinstance( json_data["type"], list ):
-                json_data["type"] = json_data["type"][0]
-                json_data["nullable"] = True
-        # If the type is an integer, specify it to be 64-bit
-        if "type" in json_data:
-            if json_data["type"] == "integer":
-                json_data["format"] = "int64"
-
-        # Update $ref to use the form "/components/schemas/" instead of "/definitions/"
-        if "$ref" in json_data:
-            if json_data["$ref"][0] == "#":
-                # Local reference
-                json_data["$ref"] = json_data["$ref"].replace( "#/definitions/", "#/components/schemas/" + self.current_schema + "_", 1 )
-            elif json_data.get( "x-autoExpand", False ) or auto_expand:
-                # Expanded resource; build a full reference
-                json_data["$ref"] = build_external_reference( json_data["$ref"] )
-            else:
-                # External reference; find the definition and check if it's a link to a resource or some other definition
-                id_ref = False
-
-                # Check if the type name is the same as the schema name
-                ref_match = re.match( "^.+\\/(.+).json#\\/definitions\\/(.+)$", json_data["$ref"] )
-                if ref_match:
-                    if ref_match.group( 1 ) == ref_match.group( 2 ) and ref_match.group( 1 ) != "Redundancy":
-                        # They are the same; this MIGHT be a resource link
-                        ref_search = re.search( "\/([\w\d_\.\-]+\.json)", json_data["$ref"] )
-                        if ref_search:
-                            # Check if the file being referenced is also being converted
-                            json_file_path = self.input_dir + os.path.sep + ref_search.group( 1 )
-                            json_ref_data = {}
-                            if os.path.isfile( json_file_path ):
-                                with open( json_file_path ) as json_file:
-                                    json_ref_data = json.load( json_file )
-                            else:
-                                # Not local; need to download a copy
-                                json_file_path = json_data["$ref"].split( "#" )[0]
-                                retry_count = 0
-                                retry_count_max = 20
-                                while retry_count < retry_count_max:
-                                    try:
-                                        req = urllib.request.Request( json_file_path )
-                                        response = urllib.request.urlopen( req )
-                                        json_ref_data = json.loads( response.read().decode() )
-                                        break
-                                    except OSError as e:
-                                        if e.errno != errno.ECONNRESET:
-                                            break
-                                        retry_count += 1
-
-                            # Get the reference definition
-                            ref_definition = json_ref_data.get( "definitions", {} ).get( json_data["$ref"].rsplit( "/" )[-1], None )
-                            if ref_definition is None:
-                                print( "ERROR: Could not get {}".format( json_data["$ref"] ) )
-                            else:
-                                # Check if the definition contains an anyOf where the $ref of the first item points to idRef
-                                try:
-                                    if "/definitions/idRef" in ref_definition["anyOf"][0]["$ref"]:
-                                        id_ref = True
-                                except:
-                                    pass
-
-                # If idRef was found, this is a link; otherwise this is another data type (like an enum or an object)
-                if id_ref:
-                    json_data["$ref"] = self.odata_schema + "#/components/schemas/odata-v4_idRef"
-                else:
-                    json_data["$ref"] = build_external_reference( json_data["$ref"] )
-
-        # Perform the same process on all other objects in the structure
-        for key in json_data:
-            if isinstance( json_data[key], dict ):
-                if key == "items":
-                    # When processing array definitions, need to carry forward auto-expand to build the right reference
-                    self.update_object( json_data[key], auto_expand = json_data.get( "x-autoExpand", False ) )
+        # Objects are converted one at a time from a stack rather than recursively, so deeply nested definitions
+        # cannot hit the recursion limit; each entry holds the source object, the object being built from it, and
+        # whether it's treated as auto-expanded
+        converted = {}
+        stack = [ ( json_data, converted, auto_expand ) ]
+        while stack:
+            source, target, auto_expand = stack.pop()
+
+            # Remove "anyOf" terms
+            if "anyOf" in source and len( source["anyOf"] ) > 0:
+                source = dict( source )
+                # Two patterns we follow for "anyOf" usage:
+                # 1) Arrays to show an item can be a particular definition or null
+                # In this case, we need to use the OpenAPI "oneOf" term to point to the reference and null
+                if source["anyOf"][-1] == { "type": "null" }:
+                    source["oneOf"] = [ { "$ref": source["anyOf"][0]["$ref"] }, { "enum": [ None ] } ]
+                # 2) Abstract base definitions that point to every versioned definition
+                # Keeping this causes significant client code bloat, so just use the latest version
                 else:
-                    self.update_object( json_data[key] )
-            elif isinstance( json_data[key], list ):
-                for i, item in enumerate( json_data[key] ):
-                    if isinstance( json_data[key][i], dict ):
-                        self.update_object( json_data[key][i] )
+                    source.update( source["anyOf"][-1] )
+                source.pop( "anyOf" )
+
+            # Copy the terms, performing one for one replacements (meaning "term" becomes "x-term") and simple removals
+            # Replaced terms are applied last so they take precedence over any existing terms of the same name
+            replacements = []
+            for key, value in source.items():
+                if key in RENAMED_TERMS:
+                    replacements.append( ( RENAMED_TERMS[key], value ) )
+                elif key not in REMOVED_TERMS:
+                    target[key] = value
+            for key, value in replacements:
+                target[key] = value
+
+            # Update the deprecated info
+            # "deprecated" is a built in term, but we don't want to lose track of the reason info
+            if "deprecated" in source:
+                target["deprecated"] = True
+
+            # Update the patternProperties info
+            # "patternProperties" is not in OpenAPI, and some of its inner structures needs special conversion
+            if "patternProperties" in source:
+                # Remove the type property from patternProperties
+                pattern_properties = {}
+                for pattern, pattern_definition in source["patternProperties"].items():
+                    if "type" in pattern_definition:
+                        pattern_definition = { key: value for key, value in pattern_definition.items() if key != "type" }
+                    pattern_properties[pattern] = pattern_definition
+                target["x-patternProperties"] = pattern_properties
+
+            # Update type to be singular
+            # OpenAPI doesn't allow type to be an array; in the Redfish usage, this is for when something is nullable
+            if "type" in target:
+                if isinstance( target["type"], list ):
+                    target["type"] = target["type"][0]
+                    target["nullable"] = True
+            # If the type is an integer, specify it to be 64-bit
+            if "type" in target:
+                if target["type"] == "integer":
+                    target["format"] = "int64"
+
+            # Update $ref to use the form "/components/schemas/" instead of "/definitions/"
+            if "$ref" in target:
+                target["$ref"] = self.update_reference( target["$ref"], target.get( "x-autoExpand", False ) or auto_expand )
+
+            # Perform the same process on all other objects in the structure
+            for key, value in target.items():
+                if isinstance( value, dict ):
+                    target[key] = {}
+                    if key == "items":
+                        # When processing array definitions, need to carry forward auto-expand to build the right reference
+                        stack.append( ( value, target[key], target.get( "x-autoExpand", False ) ) )
+                    else:
+                        stack.append( ( value, target[key], False ) )
+                elif isinstance( value, list ):
+                    target[key] = []
+                    for item in value:
+                        if isinstance( item, dict ):
+                            target[key].append( {} )
+                            stack.append( ( item, target[key][-1], False ) )
+                        else:
+                            target[key].append( item )
+
+        return converted
+
+    def update_reference( self, ref, auto_expand = False ):
+        """
+        Converts a JSON Schema reference to its OpenAPI form
+
+        Args:
+            ref: The reference to convert
+            auto_expand: Controls if the reference is treated as an auto-expanded resource
+
+        Returns:
+            The converted reference
+        """
+        if ref[0] == "#":
+            # Local reference
+            return ref.replace( "#/definitions/", "#/components/schemas/" + self.current_schema + "_", 1 )
+        elif auto_expand:
+            # Expanded resource; build a full reference
+            return build_external_reference( ref )
+        else:
+            # External reference; find the definition and check if it's a link to a resource or some other definition
+            id_ref = False
+
+            # Check if the type name is the same as the schema name
+            ref_match = re.match( "^.+\\/(.+).json#\\/definitions\\/(.+)$", ref )
+            if ref_match:
+                if ref_match.group( 1 ) == ref_match.group( 2 ) and ref_match.group( 1 ) != "Redundancy":
+                    # They are the same; this MIGHT be a resource link
+                    ref_search = re.search( "\/([\w\d_\.\-]+\.json)", ref )
+                    if ref_search:
+                        # Check if the file being referenced is also being converted
+                        json_ref_data = self.load_input_file( ref_search.group( 1 ) )
+                        if json_ref_data is None:
+                            # Not local; need to download a copy
+                            json_ref_data = self.load_remote_file( ref.split( "#" )[0] )
+                            if json_ref_data is None:
+                                json_ref_data = {}
+
+                        # Get the reference definition
+                        ref_definition = json_ref_data.get( "definitions", {} ).get( ref.rsplit( "/" )[-1], None )
+                        if ref_definition is None:
+                            print( "ERROR: Could not get {}".format( ref ) )
+                        else:
+                            # Check if the definition contains an anyOf where the $ref of the first item points to idRef
+                            try:
+                                if "/definitions/idRef" in ref_definition["anyOf"][0]["$ref"]:
+                                    id_ref = True
+                            except:
+                                pass
+
+            # If idRef was found, this is a link; otherwise this is another data type (like an enum or an object)
+            if id_ref:
+                return self.odata_schema + "#/components/schemas/odata-v4_idRef"
+            else:
+                return build_external_reference( ref )
+
+
+    def generate_path( self, uri ):
+        """
+        Creates the path item object for a given URI
+
+        Args:
+            uri: The URI string of the resource or action
+
+        Returns:
+            A path item object
+        """
+        path = {}
+
+        # Build the parameters for the URI
+        parameters = self.generate_parameters( uri )
+        if parameters is not None:
+            path["parameters"] = parameters
+
+        # Generate the operation constructs allowed by the URI
+        if not self.uri_cache[uri]["action"]:
+            # URI is for a resource; add GET, and potentially POST, PATCH, PUT, and DELETE based on the capabilities
+            #path["head"] = self.generate_operation( uri, HEAD_RESPONSES )
+            path["get"] = self.generate_operation( uri, GET_RESPONSES )
+            if self.uri_cache[uri]["insertable"]:
+                path["post"] = self.generate_operation( uri, CREATE_RESPONSES, True )
+            if self.uri_cache[uri]["updatable"]:
+                path["patch"] = self.generate_operation( uri, PATCH_RESPONSES, True )
+                path["put"] = self.generate_operation( uri, PUT_RESPONSES, True )
+            if self.uri_cache[uri]["deletable"]:
+                path["delete"] = self.generate_operation( uri, DELETE_RESPONSES )
+        else:
+            # URI is for an action; add POST
+            path["post"] = self.generate_operation( uri, ACTION_RESPONSES, True )
+
+        return path
 
     def generate_redfish_error( self ):
         """
@@ -667,16 +1060,21 @@ class JSONToYAML:
         Creates a response object for a HTTP status
 
         Args:
-            uri: The URI string of the resource
+            uri: The URI string of the resource; not used if the response does not contain a representation of the resource
             http_status: The HTTP status of the response
 
         Returns:
             A response object
         """
+        # Responses without a representation of the resource are the same for every URI
+        if http_status not in RESOURCE_RESPONSES:
+            if self.shared_components:
+                return { "$ref": "#/components/responses/" + COMMON_RESPONSES.get( http_status, COMMON_ERROR_RESPONSE ) }
+            return self.generate_common_response( http_status )
+
         response = {}
         content_resource = { "application/json": { "schema": { "$ref": self.uri_cache[uri]["reference"] } } }
         content_created = { "application/json": { "schema": { "$ref": self.uri_cache[uri]["requestBody"] } } }
-        content_task = { "application/json": { "schema": { "$ref": self.task_ref } } }
         content_error = { "application/json": { "schema": { "$ref": "#/components/schemas/RedfishError" } } }
         content_action_response = { "application/json": { "schema": { "$ref": self.uri_cache[uri]["actionResponse"] } } }
 
@@ -703,14 +1101,6 @@ class JSONToYAML:
                     response["content"] = content_action_response
                 else:
                     response["content"] = content_error
-        elif http_status == 202:
-            # 202 Accepted: Task is returned
-            response["description"] = "Accepted; a task has been generated"
-            if content_task is not None:
-                response["content"] = content_task
-        elif http_status == 204:
-            # 204 No Content: Nothing is returned
-            response["description"] = "Success, but no response data"
         elif http_status == 301:
             # 301 Moved Permanently: Resource is returned
             response["description"] = "Resource moved"
@@ -719,6 +1109,32 @@ class JSONToYAML:
             # 302 Found: Resource is returned
             response["description"] = "Resource found"
             response["content"] = content_resource
+
+        return response
+
+    def generate_common_response( self, http_status ):
+        """
+        Creates a response object for a HTTP status that does not return a representation of the resource
+
+        Args:
+            http_status: The HTTP status of the response
+
+        Returns:
+            A response object
+        """
+        response = {}
+        content_task = { "application/json": { "schema": { "$ref": self.task_ref } } }
+        content_error = { "application/json": { "schema": { "$ref": "#/components/schemas/RedfishError" } } }
+
+        # Build the response descriptor based on the HTTP status code
+        if http_status == 202:
+            # 202 Accepted: Task is returned
+            response["description"] = "Accepted; a task has been generated"
+            if content_task is not None:
+                response["content"] = content_task
+        elif http_status == 204:
+            # 204 No Content: Nothing is returned
+            response["description"] = "Success, but no response data"
         elif http_status == 304:
             # 304 Not Modified: Nothing is returned
             response["description"] = "Resource not modified"
@@ -729,6 +1145,19 @@ class JSONToYAML:
 
         return response
 
+    def generate_shared_responses( self ):
+        """
+        Creates the response objects shared by all URIs for the components of the service document
+
+        Returns:
+            A map of the response objects, keyed by their names
+        """
+        responses = {}
+        for http_status, name in COMMON_RESPONSES.items():
+            responses[name] = self.generate_common_response( http_status )
+        responses[COMMON_ERROR_RESPONSE] = self.generate_common_response( 500 )
+        return responses
+
     def generate_parameters( self, uri ):
         """
         Creates a parameters array for a given resource from the URI
@@ -748,18 +1177,49 @@ class JSONToYAML:
 
             # Build the parameter info for each segment of the URI
             for param in uri_parameters:
-                parameter = {}
-                param_name = re.sub( "[{}]", "", param )
-                parameter["name"] = param_name
-                parameter["in"] = "path"
-                parameter["required"] = True
-                parameter["schema"] = { "type": "string" }
-                try:
-                    parameter["description"] = "The value of the Id property of the " + re.search( "(.+)Id\d?", param_name ).group( 1 ) + " resource"
-                except:
-                    print( "ERROR: Token {} in {} does not end in 'Id'".format( param, uri ) )
-                parameters.append( parameter )
+                if self.shared_components:
+                    parameters.append( { "$ref": "#/components/parameters/" + re.sub( "[{}]", "", param ) } )
+                else:
+                    parameters.append( self.generate_parameter( uri, param ) )
+
+        return parameters
+
+    def generate_parameter( self, uri, param ):
+        """
+        Creates a parameter object for a segment of a URI
+
+        Args:
+            uri: The URI string of the resource
+            param: The segment of the URI containing the parameter
+
+        Returns:
+            A parameter object
+        """
+        parameter = {}
+        param_name = re.sub( "[{}]", "", param )
+        parameter["name"] = param_name
+        parameter["in"] = "path"
+        parameter["required"] = True
+        parameter["schema"] = { "type": "string" }
+        try:
+            parameter["description"] = "The value of the Id property of the " + re.search( "(.+)Id\d?", param_name ).group( 1 ) + " resource"
+        except:
+            print( "ERROR: Token {} in {} does not end in 'Id'".format( param, uri ) )
+        return parameter
 
+    def generate_shared_parameters( self ):
+        """
+        Creates the parameter objects for all URIs for the components of the service document
+
+        Returns:
+            A map of the parameter objects, keyed by their names
+        """
+        parameters = {}
+        for uri in sorted( self.uri_cache ):
+            for param in re.findall( "{[A-Za-z0-9]+}", uri ):
+                param_name = re.sub( "[{}]", "", param )
+                if param_name not in parameters:
+                    parameters[param_name] = self.generate_parameter( uri, param )
         return parameters
 
     def is_collection( self, definition ):
@@ -798,16 +1258,7 @@ class JSONToYAML:
                         },
                         "description": "OData $metadata."
                     },
-                    "default": {
-                        "content": {
-                            "application/json": {
-                                "schema": {
-                                    "$ref": "#/components/schemas/RedfishError"
-                                }
-                            }
-                        },
-                        "description": "Error condition"
-                    }
+                    "default": self.generate_response( None, 500 )
                 }
             }
         }
@@ -873,16 +1324,7 @@ class JSONToYAML:
                         },
                         "description": "OData service document"
                     },
-                    "default": {
-                        "content": {
-                            "application/json": {
-                                "schema": {
-                                    "$ref": "#/components/schemas/RedfishError"
-                                }
-                            }
-                        },
-                        "description": "Error condition"
-                    }
+                    "default": self.generate_response( None, 500 )
                 }
             }
         }
@@ -904,6 +1346,29 @@ def is_unversioned( name ):
         return True
     return False
 
+def fetch_remote_file( uri ):
+    """
+    Downloads a file, retrying if the connection is reset
+
+    Args:
+        uri: The URI of the file
+
+    Returns:
+        The contents of the file, or None if it could not be downloaded
+    """
+    retry_count = 0
+    retry_count_max = 20
+    while retry_count < retry_count_max:
+        try:
+            req = urllib.request.Request( uri )
+            response = urllib.request.urlopen( req )
+            return response.read()
+        except OSError as e:
+            if e.errno != errno.ECONNRESET:
+                break
+            retry_count += 1
+    return None
+
 def build_external_reference( ref ):
     """
     Builds a reference link based on a JSON Schema reference
@@ -917,6 +1382,66 @@ def build_external_reference( ref ):
     filename = ref.split( "#", 1 )[0].rsplit( ".", 1 )[0].rsplit( "/", 1 )[1].replace( ".", "_" )
     return ref.replace( ".json#/definitions/", ".yaml#/components/schemas/" + filename + "_", 1 )
 
+def dump_yaml( data ):
+    """
+    Converts an object to a YAML string
+
+    The libyaml emitter is used when it is available and formats the object the same as the pure Python emitter
+
+    Args:
+        data: The object to convert
+
+    Returns:
+        The YAML string
+    """
+    return yaml.dump( data, Dumper = select_dumper( [ data ] ), default_flow_style = False )
+
+def select_dumper( objects ):
+    """
+    Selects the YAML dumper class for writing a set of objects
+
+    Args:
+        objects: The objects to be written
+
+    Returns:
+        The libyaml based dumper if it is available and formats all of the objects the same as the pure Python dumper;
+        the pure Python dumper otherwise
+    """
+    if CNoAliasDumper is not None and all( is_c_emitter_compatible( data ) for data in objects ):
+        return CNoAliasDumper
+    return NoAliasDumper
+
+def is_c_emitter_compatible( data ):
+    """
+    Checks if the libyaml emitter formats an object the same as the pure Python emitter
+
+    The emitters differ in how they fold strings that need escaping or contain line breaks, and in which mapping keys
+    they write in the "? key" form
+
+    Args:
+        data: The object to check
+
+    Returns:
+        True if the output of the emitters is the same, False otherwise
+    """
+    stack = [ data ]
+    while stack:
+        item = stack.pop()
+        if isinstance( item, dict ):
+            for key, value in item.items():
+                # Empty keys, and keys of 123 to 128 characters, are only written as simple keys by libyaml
+                if not isinstance( key, str ) or len( key ) == 0 or 123 <= len( key ) <= 128:
+                    return False
+                if not EMITTER_SAFE_STRING.fullmatch( key ):
+                    return False
+                stack.append( value )
+        elif isinstance( item, list ):
+            stack.extend( item )
+        elif isinstance( item, str ):
+            if not EMITTER_SAFE_STRING.fullmatch( item ):
+                return False
+    return True
+
 if __name__ == '__main__':
 
     # Get the input arguments
@@ -926,6 +1451,8 @@ if __name__ == '__main__':
     argget.add_argument( "--config", "-C", type = str, required = True, help = "The JSON file that describes configuration options for the output" )
     argget.add_argument( "--base", "-B", type = str, required = False, help = "The base OpenAPI Service Document if extending an existing one" )
     argget.add_argument( "--overwrite", "-W", type = str, help = "Overwrite the versioned files in the output directory if they already exist (default is True)" )
+    argget.add_argument( "--workers", "-J", type = int, default = 1, help = "The number of worker processes to use when converting the JSON files (default is 1)" )
+    argget.add_argument( "--fragments", "-F", type = str, required = False, help = "The folder to store converted JSON files in; unchanged JSON files are not converted again on later runs" )
     args = argget.parse_args()
 
     # Get the overwrite flag
@@ -958,11 +1485,13 @@ if __name__ == '__main__':
         config_data["Extensions"] = CONFIG_DEF_EXTENSIONS
     if "DoNotWrite" not in config_data:
         config_data["DoNotWrite"] = []
+    if "SharedComponents" not in config_data:
+        config_data["SharedComponents"] = False
     if "info" not in config_data:
         print( "ERROR: Configuration file does not contain 'info' data" )
         sys.exit( 1 )
 
     # Funnel everything to the translator
-    JSONToYAML( args.input, args.output, overwrite, args.base, config_data["OutputFile"], config_data["ODataSchema"], config_data["MessageRef"], config_data["TaskRef"], config_data["info"], config_data["Extensions"], config_data["DoNotWrite"] )
+    JSONToYAML( args.input, args.output, overwrite, args.base, config_data["OutputFile"], config_data["ODataSchema"], config_data["MessageRef"], config_data["TaskRef"], config_data["info"], config_data["Extensions"], config_data["DoNotWrite"], args.workers, args.fragments, config_data["SharedComponents"] )
 
     sys.exit( 0 )
@@ -12,6 +12,9 @@ Brief : A tool used to processes Redfish JSON Schema files and integrate any OEM
 """
 
 import argparse
+import collections
+import concurrent.futures
+import copyreg
 import json
 import os
 import sys
@@ -41,6 +44,9 @@ def get_logger():
         filehandler.setLevel(logging.DEBUG)
     return g_logger
 
+# Loggers can only be pickled from Python 3.7; send them to worker processes by name, as later versions do
+copyreg.pickle(logging.Logger, lambda logger: (logging.getLogger, (logger.name,)))
+
 class UnsupportedFeatureException(Exception):
     "Raised when it hits some feature which is not developed yet"
     pass
@@ -50,18 +56,13 @@ class IllegalSchemaModificationRequestException(Exception):
     pass
 
 class JsonSchemaConfigHelper:
-    def __init__(self, schema_file, on_change_write_to=None, enabled_by_default=True, logger: logging.Logger=None):
+    def __init__(self, schema_file, enabled_by_default=True, logger: logging.Logger=None):
         if logger:
             self.__logger = logger
         else:
             self.__logger = get_logger()
         self.__schema_filepath = schema_file
-        if on_change_write_to:
-            self.__schema_out_file_path = os.path.abspath(on_change_write_to)
-        else:
-            self.__schema_out_file_path = on_change_write_to
         self.__schema_name = schema_file.rsplit("/",1)[-1].split(".",1)[0]
-        self.__schema_in_file_path = os.path.abspath(schema_file.rsplit("/",1)[0])
         with open(self.__schema_filepath, "r") as fd:
             self.__schema = json.loads(fd.read())
         if "$ref" in self.__schema:
@@ -78,6 +79,7 @@ class JsonSchemaConfigHelper:
         self.__enabled = enabled_by_default
         self.__array_items_support = {}
         self.__strlen_support = {}
+        self.__property_index = {} # {<property path>: (<parent properties>, <property>, <property definition>, <parent entry>)}
 
     def __get_ext_references(self, d):
         ext_refs = []
@@ -99,7 +101,8 @@ class JsonSchemaConfigHelper:
     def get_external_references(self):
         return set(self.__get_ext_references(self.__schema))
 
-    def __del__(self):
+    def apply_changes(self):
+        '''Apply the queued property modifications to the schema'''
         # Process the minItems/maxItems if any
         for prop_to_modify in self.__array_items_support:
             minItems = self.__array_items_support[prop_to_modify].get("minItems")
@@ -125,29 +128,38 @@ class JsonSchemaConfigHelper:
                 # Someone is using it, do not delete
                 continue
             do_delete_property = True
-            for deleted_prop_base_path in deleted_prop_base_paths:
+            base_path = prop_to_del.rsplit("/",1)[0]
+            while base_path != "#":
                 # If a complex property is already deleted from the base of the resource tree,
                 # members of the complex type need not be deleted as they may be referred from external schemas.
                 # For instance,
                 # if #/Prop1 is deleted,
                 # no point in deleting #/Prop1/SubProp1
-                if prop_to_del.startswith(deleted_prop_base_path+"/"):
+                if base_path in deleted_prop_base_paths:
                     do_delete_property = False
                     break
+                base_path = base_path.rsplit("/",1)[0]
 
             if do_delete_property:
                 self.__logger.debug("Removing Property: {}".format(prop_to_del))
                 self.__remove_property(prop_to_del)
                 deleted_prop_base_paths.add(prop_to_del)
 
-        if (self.__is_changed or
-            (self.__schema_out_file_path != self.__schema_in_file_path)) and self.__schema_out_file_path != None:
-            if self.__is_changed:
-                self.__logger.debug("Info: {}: Schema modified, writing to {}".format(self.__schema_name, self.__schema_out_file_path))
-            else:
-                self.__logger.debug("Info: {}: Copying schema from source to {}".format(self.__schema_name, self.__schema_out_file_path))
-            with open(self.__schema_out_file_path, "w") as fd:
-                json.dump(self.__schema, fd, sort_keys=True, indent=4, separators = ( ",", ": " ))
+        self.__array_items_support = {}
+        self.__strlen_support = {}
+        self.__read_only_props = []
+        self.__deleted_props = []
+
+    def is_changed(self):
+        return self.__is_changed
+
+    def write(self, schema_file):
+        if self.__is_changed:
+            self.__logger.debug("Info: {}: Schema modified, writing to {}".format(self.__schema_name, schema_file))
+        else:
+            self.__logger.debug("Info: {}: Copying schema from source to {}".format(self.__schema_name, schema_file))
+        with open(schema_file, "w") as fd:
+            json.dump(self.__schema, fd, sort_keys=True, indent=4, separators = ( ",", ": " ))
 
     def __get_ref(self, d):
         ref = None
@@ -177,6 +189,7 @@ class JsonSchemaConfigHelper:
     def add_oem_schema_link(self, prop, oem_name, oem_schema_path):
         oem_prop_key = prop + "_Oem"
         self.__schema["definitions"][prop]["properties"]["Oem"]["$ref"] = "#/definitions/{}".format(oem_prop_key)
+        self.__property_index = {} # Oem properties now resolve to a different definition
         self.__schema["definitions"][oem_prop_key] = {
             "additionalProperties": False,
             "description": "An OEM extension to the {} resource.".format(self.get_name()),
@@ -205,6 +218,22 @@ class JsonSchemaConfigHelper:
         }
         self.__is_changed = True
 
+    def add_oem_definition(self, target, oem_prop_key, oem_definition):
+        '''Add an OEM definition and link it from the Oem property of the specified Entity or ComplexType'''
+        oem_prop_d = self.__schema["definitions"][target]["properties"]["Oem"]
+        self.__schema["definitions"][oem_prop_key] = oem_definition
+        oem_prop_d["$ref"] = "#/definitions/{}".format(oem_prop_key)
+        self.__property_index = {} # Oem properties now resolve to a different definition
+        self.__is_changed = True
+
+    def set_oem_actions(self, oem_actions):
+        '''Replace the actions in the OemActions definition'''
+        self.__schema["definitions"]["OemActions"]["properties"] = oem_actions
+        self.__is_changed = True
+
+    def get_schema(self):
+        return self.__schema
+
     def get_definition(self, object=None):
         if not object:
             return self.__definition
@@ -381,32 +410,43 @@ class JsonSchemaConfigHelper:
     def mark_property_in_use(self, property_path):
         self.__properties_in_use.add(property_path)
 
+    def __resolve_property(self, property_path):
+        '''Resolve a property path, such as #/Prop/SubProp, to the properties object containing it and its definition.
+        Resolved paths are indexed, so a path is only walked from its parent's entry and never again from the root.'''
+        entry = self.__property_index.get(property_path)
+        if entry is not None and self.__is_indexed_property_present(entry):
+            return entry
+        parent_path, prop = property_path.rsplit("/",1)
+        parent_prop_d, parent_entry = self.__resolve_parent_properties(parent_path)
+        entry = (parent_prop_d, prop, parent_prop_d[prop], parent_entry)
+        self.__property_index[property_path] = entry
+        return entry
+
+    def __resolve_parent_properties(self, parent_path):
+        '''Resolve the properties object of the type of a property path, along with the index entry of the property'''
+        if parent_path == "#":
+            return self.__definition["properties"], None
+        parent_entry = self.__resolve_property(parent_path)
+        ref = self.__get_ref(parent_entry[2])
+        assert(ref.startswith("#/definitions/"))
+        return self.__schema["definitions"][ref.rsplit("/",1)[-1]]["properties"], parent_entry
+
+    def __is_indexed_property_present(self, entry):
+        '''Check that an indexed property, and each property on its path, has not been removed since it was indexed'''
+        while entry is not None:
+            parent_prop_d, prop, prop_d, entry = entry
+            if parent_prop_d.get(prop) is not prop_d:
+                return False
+        return True
+
     def __mark_property_metainfo(self, property_path, key, value):
         try:
-            prop_path = property_path.split("/")[1:] # skip the '#'
-            prop_d = {}
-            # self.__logger.debug("prop paths: {}".format(prop_path))
-            prop_d = self.__definition["properties"][prop_path[0]]
-            # self.__logger.debug("range: {}".format(list(range(len(prop_path)))))
-            for i in range(len(prop_path)):
-            # prop in prop_path[1:]:
-                # self.__logger.debug("i={}".format(i))
-                # prop = prop_path[i]
-                if i+1 == len(prop_path):
-                    # self.__logger.debug("Setting ../{} as ReadOnly".format(prop))
-                    prop_d[key]=value
-                    self.__is_changed= True
-                else:
-                    ref = self.__get_ref(prop_d)
-                    # self.__logger.debug("Resolving ref {}".format(ref))
-                    assert(ref.startswith("#/definitions/"))
-                    ref = ref.rsplit("/",1)[-1]
-                    # self.__logger.debug("Traversing from ../{}/.. to ../{}/{}/..".format(prop, prop, prop_path[i+1]))
-                    prop_d = self.__schema["definitions"][ref]["properties"][prop_path[i+1]]
+            _, _, prop_d, _ = self.__resolve_property(property_path)
+            prop_d[key]=value
+            self.__is_changed= True
         except Exception as e:
             #self.__logger.debug(self.__schema_name)
             #self.__logger.debug(property_path)
-            #self.__logger.debug(prop_d)
             #raise(e)
             pass
 
@@ -422,6 +462,7 @@ class JsonSchemaConfigHelper:
             self.__schema["definitions"].pop(actionresponse_def_key)
         self.__schema["definitions"].pop(action_def_key)
         self.__schema["definitions"]["Actions"]["properties"].pop(action)
+        self.__property_index = {} # Indexed properties may belong to the removed definitions
         self.__is_changed= True
 
     def remove_action_params(self, action, param, is_input_param):
@@ -452,30 +493,14 @@ class JsonSchemaConfigHelper:
 
     def __remove_property(self, property_path):
         try:
-            prop_path = property_path.split("/")[1:] # skip the '#'
-            parent_prop_d = self.__definition["properties"]
-            # self.__logger.debug("prop paths: {}".format(prop_path))
-            # self.__logger.debug("range: {}".format(list(range(len(prop_path)))))
-            for i in range(len(prop_path)):
-            #prop in prop_path[1:]:
-                # self.__logger.debug("i={}".format(i))
-                prop = prop_path[i]
-                if i+1 == len(prop_path):
-                    self.__logger.info("Removing ../{}".format(prop))
-                    #prop_d["readonly"]=True
-                    parent_prop_d.pop(prop)
-                    self.__is_changed= True
-                else:
-                    ref = self.__get_ref(parent_prop_d[prop])
-                    #self.__logger.debug("Resolving ref {}".format(ref))
-                    assert(ref.startswith("#/definitions/"))
-                    ref = ref.rsplit("/",1)[-1]
-                    #self.__logger.debug("Traversing from ../{}/.. to ../{}/{}/..".format(prop, prop, prop_path[i+1]))
-                    parent_prop_d = self.__schema["definitions"][ref]["properties"]
+            parent_path, prop = property_path.rsplit("/",1)
+            parent_prop_d, _ = self.__resolve_parent_properties(parent_path)
+            self.__logger.info("Removing ../{}".format(prop))
+            parent_prop_d.pop(prop)
+            self.__is_changed= True
         except Exception as _:
             #self.__logger.debug(self.__schema_name)
             #self.__logger.debug(property_path)
-            #self.__logger.debug(parent_prop_d[prop])
             #raise(e)
             self.__logger.warning("{} could not be removed/was already removed".format(property_path))
 
@@ -627,8 +652,102 @@ class JsonSchemaConfigHelper:
         self.versions()
         return self.__max_version
 
+class JsonSchemaWorkspace:
+    """
+    Class for holding the JSON Schema files being processed in memory
+
+    Each schema is loaded from the source directory once, the first time it is needed, and shared by all processing
+    steps. Nothing is written until flush() is called, which writes every remaining schema to the destination directory.
+
+    Args:
+        schema_source_path: The path to the JSON Schema files to process
+        schema_dest_path: The path to write the processed JSON Schema files to
+        enabled_by_default: Flag to indicate if new additions are enabled in generated configs
+    """
+
+    def __init__(self, schema_source_path, schema_dest_path, enabled_by_default=True, logger: logging.Logger=None):
+        if logger:
+            self.__logger = logger
+        else:
+            self.__logger = get_logger()
+        self.__schema_source_path = schema_source_path
+        self.__schema_dest_path = schema_dest_path
+        self.__enabled_by_default = enabled_by_default
+        self.__files = sorted(os.listdir(schema_source_path))
+        self.__schemas = {}
+        self.__deleted = set()
+
+    def files(self):
+        '''List the schema files in the workspace, in sorted order'''
+        return [f for f in self.__files if f not in self.__deleted]
+
+    def get(self, schema_file):
+        '''Get the helper for a schema file, loading it from the source directory if needed'''
+        schema_obj = self.__schemas.get(schema_file)
+        if schema_obj == None:
+            schema_obj = JsonSchemaConfigHelper(
+                schema_file=os.path.join(self.__schema_source_path, schema_file),
+                enabled_by_default=self.__enabled_by_default,
+                logger=self.__logger)
+            self.__schemas[schema_file] = schema_obj
+        return schema_obj
+
+    def put(self, schema_file, schema_obj):
+        '''Replace the helper for a schema file, such as with one processed by a worker process'''
+        self.__schemas[schema_file] = schema_obj
+
+    def share(self, schema_files):
+        '''Make a workspace holding only the helpers for the given schema files, such as to send to a worker process'''
+        share = copy.copy(self)
+        share.__files = list(schema_files)
+        share.__schemas = {schema_file: self.get(schema_file) for schema_file in schema_files}
+        share.__deleted = set()
+        return share
+
+    def get_dest_path(self, schema_file):
+        return os.path.join(self.__schema_dest_path, schema_file)
+
+    def get_reference_graph(self):
+        '''Build the graph of references between the schemas in the workspace, along with the files of each schema
+        Returns ({<schema>: [<list of schema files>]}, {<schema>: {<set of schemas that the key references>}})'''
+        schema_files_map = {}
+        reference_graph = {}
+        for schema_file in self.files():
+            if not schema_file.endswith(".json"):
+                continue
+            schema_name = schema_file.split(".",1)[0]
+            if schema_name not in schema_files_map:
+                schema_files_map[schema_name] = []
+                reference_graph[schema_name] = set()
+            schema_files_map[schema_name].append(schema_file)
+            # References to any version of a schema are references to the schema
+            for ext_ref in self.get(schema_file).get_external_references():
+                ref_schema_name = ext_ref.split(".",1)[0]
+                if ref_schema_name != schema_name:
+                    reference_graph[schema_name].add(ref_schema_name)
+        return schema_files_map, reference_graph
+
+    def delete(self, schema_file):
+        '''Remove a schema file from the workspace; it will not be written, and is deleted from the destination directory on flush'''
+        self.__deleted.add(schema_file)
+
+    def flush(self):
+        '''Write the schemas to the destination directory'''
+        in_place = os.path.abspath(self.__schema_source_path) == os.path.abspath(self.__schema_dest_path)
+        for schema_file in self.__files:
+            dest_path = self.get_dest_path(schema_file)
+            if schema_file in self.__deleted:
+                if os.path.exists(dest_path):
+                    os.remove(dest_path)
+                continue
+            schema_obj = self.get(schema_file)
+            schema_obj.apply_changes()
+            # Schemas that are not modified only need to be written when copying them to a different directory
+            if schema_obj.is_changed() or not in_place:
+                schema_obj.write(dest_path)
+
 class JSONSchemaConfigManager:
-    def __init__(self, schema_source_path, schema_dest_path, cfg, logger: logging.Logger=None):
+    def __init__(self, schema_source_path, schema_dest_path, cfg, logger: logging.Logger=None, workspace=None):
         if logger:
             self.__logger = logger
         else:
@@ -645,18 +764,18 @@ class JSONSchemaConfigManager:
             }
         self.__enabled_default_value = cfg["EnableNewAdditionsByDefault"]
         self.__unimplemented_schemas = [] # Will contain schemas for which no uris have been implemented yet. If chosen, these files may be removed
+        if workspace:
+            self.__workspace = workspace
+        else:
+            self.__workspace = JsonSchemaWorkspace(schema_source_path, schema_dest_path, self.__enabled_default_value, self.__logger)
 
     def generate_config(self):
         """"""
-        for file in sorted(os.listdir(self.__schema_source_path)):
+        for file in self.__workspace.files():
             if ".v" in file:
                 continue #Will load up only the latest versions as extracted from the base schemas
             schema_name = file.split(".",1)[0]
-            f_path = os.path.abspath(os.path.join(self.__schema_source_path, file))
-            json_schema = JsonSchemaConfigHelper(
-                schema_file=f_path,
-                on_change_write_to=None,
-                enabled_by_default=self.__enabled_default_value)
+            json_schema = self.__workspace.get(file)
             '''if json_schema.isOem():
                 # Skip schema
                 continue'''
@@ -685,11 +804,7 @@ class JSONSchemaConfigManager:
                 # TODO: Check if this is really needed
                 #self.__config_d[schema_name]["versions_supported"] = {x: {"@meta.Enabled": True} for x in json_schema.versions()}
                 latest_schema = json_schema.latest_schema()
-                latest_schema_path = os.path.abspath(os.path.join(self.__schema_source_path, latest_schema))
-                inst_schema = JsonSchemaConfigHelper(
-                    schema_file=latest_schema_path,
-                    on_change_write_to=None,
-                    enabled_by_default=self.__enabled_default_value)
+                inst_schema = self.__workspace.get(latest_schema)
                 if inst_schema.is_versioned_entity():
                     self.__config_d[schema_name]["actions"] = inst_schema.actions()
                     self.__config_d[schema_name]["properties"] = inst_schema.properties()
@@ -988,160 +1103,167 @@ class JSONSchemaConfigManager:
                     action_name = action.rsplit(".",1)[-1]
                     schema_obj.remove_action_params(action_name, param, is_input)
 
-    def process_configs(self):
-        """"""
+    def share(self, schema_files):
+        """Make a config manager for a share of the schema files, holding only their schemas and configuration, such as to send to a worker process"""
+        share = copy.copy(self)
+        share.__workspace = self.__workspace.share(schema_files)
+        schema_names = set(schema_file.split(".",1)[0] for schema_file in schema_files)
+        share.__config_d = {schema_name: schema_conf_d for schema_name, schema_conf_d in self.__config_d.items() if schema_name in schema_names}
+        share.__diff = {
+                "new_schemas": [],
+                "old_schemas": {}
+            }
+        share.__unimplemented_schemas = []
+        return share
+
+    def process_configs(self, workers=1):
+        """Apply the configuration to each schema, using a pool of worker processes if workers is more than 1"""
+        schema_files = self.__workspace.files()
+        if workers > 1 and len(schema_files) > 1:
+            # Each schema is processed independently, so each worker gets one share of the schema files, with only the
+            # configuration for those schemas; the processed schemas are put back in the workspace in order
+            share_size = -(-len(schema_files) // workers)
+            shares = [schema_files[i:i + share_size] for i in range(0, len(schema_files), share_size)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=len(shares)) as executor:
+                share_results = executor.map(process_schema_configs_in_worker, [self.share(share) for share in shares], shares)
+                results = [result for share_result in share_results for result in share_result]
+            for schema_file, (schema_obj, unimplemented_schemas) in zip(schema_files, results):
+                self.__workspace.put(schema_file, schema_obj)
+                self.__unimplemented_schemas.extend(unimplemented_schemas)
+        else:
+            for schema_file in schema_files:
+                _, unimplemented_schemas = self.process_schema_config(schema_file)
+                self.__unimplemented_schemas.extend(unimplemented_schemas)
+
+    def process_schema_config(self, schema_file):
+        """Apply the configuration to a schema; returns the schema and the list of schemas left with no URIs"""
+        unimplemented_schemas = []
+        schema_name = schema_file.split(".",1)[0]
+        schema_conf_d = None
         try:
-            for schema_file in sorted(os.listdir(self.__schema_source_path)):
-                schema_name = schema_file.split(".",1)[0]
-                in_schema_path = os.path.join(self.__schema_source_path, schema_file)
-                out_schema_path = os.path.join(self.__schema_dest_path, schema_file)
-                schema_obj = JsonSchemaConfigHelper(
-                    schema_file = in_schema_path,
-                    on_change_write_to = out_schema_path,
-                    enabled_by_default = self.__enabled_default_value)
-                # self.__logger.debug ("Processing: {}".format(schema_file))
-
-                if schema_obj.is_collection() or schema_obj.is_base_entity():
-                    if schema_name in self.__config_d:
-                        schema_conf_d = self.__config_d[schema_name]
-
-                        # Perform unsupported URIs removal and Oem uris addition
-                        for uri, uri_info in schema_conf_d["uris"].items():
-                            is_enabled = uri_info["@meta.Enabled"]
-                            if not is_enabled:
-                                self.__logger.info("{}: Removing URI {}".format(schema_name, uri))
-                                _, is_empty = schema_obj.remove_uri(uri)
-                                if is_empty:
-                                    self.__logger.info("{}: Schema is Empty now!".format(schema_name))
-                                    self.__unimplemented_schemas.append(schema_name)
-                            elif uri not in schema_obj.uris() and is_enabled:
-                                self.__logger.info("{}: Adding URI {}".format(schema_name, uri))
-                                schema_obj.add_uri(uri)
-
-                        # Change Schema capability
-                        for cap, cap_conf in schema_conf_d["capabilities"].items():
-                            if ("@meta.oem" in cap_conf) and (cap_conf["@meta.oem"] != cap_conf["dmtf"]):
-                                assert(cap in ["updatable", "deletable", "insertable"])
-                                if cap == "updatable":
-                                    if cap_conf["@meta.oem"] == True:
-                                        schema_obj.enable_update_capability()
-                                    else:
-                                        schema_obj.disable_update_capability()
-                                elif cap_conf["@meta.oem"] == False:
-                                    if cap == "deletable":
-                                        schema_obj.disable_delete_capability()
-                                    else:
-                                        schema_obj.disable_insert_capability()
+            schema_obj = self.__workspace.get(schema_file)
+            # self.__logger.debug ("Processing: {}".format(schema_file))
+
+            if schema_obj.is_collection() or schema_obj.is_base_entity():
+                if schema_name in self.__config_d:
+                    schema_conf_d = self.__config_d[schema_name]
+
+                    # Perform unsupported URIs removal and Oem uris addition
+                    for uri, uri_info in schema_conf_d["uris"].items():
+                        is_enabled = uri_info["@meta.Enabled"]
+                        if not is_enabled:
+                            self.__logger.info("{}: Removing URI {}".format(schema_name, uri))
+                            _, is_empty = schema_obj.remove_uri(uri)
+                            if is_empty:
+                                self.__logger.info("{}: Schema is Empty now!".format(schema_name))
+                                unimplemented_schemas.append(schema_name)
+                        elif uri not in schema_obj.uris() and is_enabled:
+                            self.__logger.info("{}: Adding URI {}".format(schema_name, uri))
+                            schema_obj.add_uri(uri)
+
+                    # Change Schema capability
+                    for cap, cap_conf in schema_conf_d["capabilities"].items():
+                        if ("@meta.oem" in cap_conf) and (cap_conf["@meta.oem"] != cap_conf["dmtf"]):
+                            assert(cap in ["updatable", "deletable", "insertable"])
+                            if cap == "updatable":
+                                if cap_conf["@meta.oem"] == True:
+                                    schema_obj.enable_update_capability()
                                 else:
-                                    raise(IllegalSchemaModificationRequestException)
-                elif schema_obj.is_versioned_entity():
-                    if schema_name in self.__config_d:
-                        # Perform property Updates (RW->RO) and Deletions
-                        for property, prop_d in schema_conf_d["properties"].items():
-                            self.__process_properties(schema_obj, property, prop_d)
-
-                        # Process Actions
-                        if "actions" in schema_conf_d:
-                            for action, action_d in schema_conf_d["actions"].items():
-                                if action.startswith("@"):
-                                    continue
-                                # Process only if action is supported
-                                if ("Actions" not in schema_conf_d["properties"] or
-                                    action not in schema_conf_d["properties"]["Actions"] or
-                                    "@meta.Enabled" not in schema_conf_d["properties"]["Actions"][action]):
-                                    continue
-                                if schema_conf_d["properties"]["Actions"][action].get("@meta.Enabled") != True:
-                                    continue
-                                self.__process_action_params(schema_obj, action, action_d)
-
-                                # self.__process_actions(schema_obj, action, action_d)
-
-
-                # Versions
-                # Always go latest
-
-                '''elif schema_obj.isBaseEntity():
-                    #pass#print("\tBase Schema.... Update Capabilities and supported URIs")
-                    if schema_name in self.__config_d:
-                        schema_conf_d = self.__config_d[schema_name]
-                        #Remove unsupported URIs
-                        for uri, is_enabled in schema_conf_d["uris"].items():
-                            if not is_enabled:
-                                self.__logger.info("{}: Removing URI {}".format(schema_name, uri))
-                                schema_obj.removeUri(uri)
-                elif schema_obj.isVersionedEntity():
-                    #pass#print("\tVersioned Schema.... Remove unsupported properties, parameters and enums, update capabilities, etc")
+                                    schema_obj.disable_update_capability()
+                            elif cap_conf["@meta.oem"] == False:
+                                if cap == "deletable":
+                                    schema_obj.disable_delete_capability()
+                                else:
+                                    schema_obj.disable_insert_capability()
+                            else:
+                                raise(IllegalSchemaModificationRequestException)
+            elif schema_obj.is_versioned_entity():
+                if schema_name in self.__config_d:
+                    schema_conf_d = self.__config_d[schema_name]
+
+                    # Perform property Updates (RW->RO) and Deletions
                     for property, prop_d in schema_conf_d["properties"].items():
                         self.__process_properties(schema_obj, property, prop_d)
-                else:
-                    pass#print("Skipped!!!")'''
+
+                    # Process Actions
+                    if "actions" in schema_conf_d:
+                        for action, action_d in schema_conf_d["actions"].items():
+                            if action.startswith("@"):
+                                continue
+                            # Process only if action is supported
+                            if ("Actions" not in schema_conf_d["properties"] or
+                                action not in schema_conf_d["properties"]["Actions"] or
+                                "@meta.Enabled" not in schema_conf_d["properties"]["Actions"][action]):
+                                continue
+                            if schema_conf_d["properties"]["Actions"][action].get("@meta.Enabled") != True:
+                                continue
+                            self.__process_action_params(schema_obj, action, action_d)
+
+                            # self.__process_actions(schema_obj, action, action_d)
+
+            schema_obj.apply_changes()
+
+            # Versions
+            # Always go latest
+
+            '''elif schema_obj.isBaseEntity():
+                #pass#print("\tBase Schema.... Update Capabilities and supported URIs")
+                if schema_name in self.__config_d:
+                    schema_conf_d = self.__config_d[schema_name]
+                    #Remove unsupported URIs
+                    for uri, is_enabled in schema_conf_d["uris"].items():
+                        if not is_enabled:
+                            self.__logger.info("{}: Removing URI {}".format(schema_name, uri))
+                            schema_obj.removeUri(uri)
+            elif schema_obj.isVersionedEntity():
+                #pass#print("\tVersioned Schema.... Remove unsupported properties, parameters and enums, update capabilities, etc")
+                for property, prop_d in schema_conf_d["properties"].items():
+                    self.__process_properties(schema_obj, property, prop_d)
+            else:
+                pass#print("Skipped!!!")'''
         except Exception as e:
             self.__logger.critical("SchemaName: {}".format(schema_name))
             self.__logger.critical(schema_conf_d)
             raise(e)
+        return schema_obj, unimplemented_schemas
 
     def delete_unimplemented(self):
-        # Build a dependency between all the schemas so the we know we are not
-        # deleting a referenced schema just becase the schema itself is not
-        # implemented directly. Also build a map to ease deletion of corresponding
-        # versioned schemas as well.
-        versioned_schema_map = {}
-        schema_dependency_map = {} # {<schema>: {<set of schemas that are dependent on the key>}}
-        rev_schema_dependency_map = {} # {<schema>: {<set of schemas that the key depend on>}}, reverse of the above for faster lookup
-        for f in os.listdir(self.__schema_dest_path):
-            if f.endswith(".json"):
-                schema_name = f.split(".",1)[0]
-                if schema_name not in versioned_schema_map:
-                    versioned_schema_map[schema_name] = []
-                versioned_schema_map[schema_name].append(f)
-                # Now load it and fetch the dependencies
-                schema_obj = JsonSchemaConfigHelper(
-                    schema_file=os.path.join(self.__schema_dest_path, f),
-                    logger=self.__logger
-                    )
-                ext_refs = schema_obj.get_external_references()
-                rev_schema_dependency_map[schema_name] = ext_refs
-                if schema_name not in rev_schema_dependency_map:
-                    rev_schema_dependency_map[schema_name] = set()
-                for ext_ref in ext_refs:
-                    if ext_ref not in schema_dependency_map:
-                        schema_dependency_map[ext_ref] = set()
-                    schema_dependency_map[ext_ref].add(schema_name)
-
-
-        # The Deletion needs to happen in multiple passes, as the dependencies also need to be processed
-        n_pass = 0
-        deleted_schemas = set()
+        # Use the reference graph of the schemas so that we know we are not
+        # deleting a referenced schema just because the schema itself is not
+        # implemented directly.
+        schema_files_map, reference_graph = self.__workspace.get_reference_graph()
+        referenced_by = {} # {<schema>: {<set of schemas that reference the key>}}
+        for schema_name, ref_schemas in reference_graph.items():
+            for ref_schema in ref_schemas:
+                if ref_schema not in referenced_by:
+                    referenced_by[ref_schema] = set()
+                referenced_by[ref_schema].add(schema_name)
+
         schemas_to_keep = [
             "Event"
         ]
+        candidates = set(self.__unimplemented_schemas).difference(schemas_to_keep)
 
-        while True:
-            n_pass += 1
-            self.__logger.warning("Pass: {}".format(n_pass))
-            deleted_in_pass = False
-            for schema_name in self.__unimplemented_schemas:
-                if schema_name in schemas_to_keep:
-                    continue
-                for schema_file in versioned_schema_map.get(schema_name, []):
-                    if schema_file in deleted_schemas:
-                        continue
-                    # If some other shcema depends on this, we cannot delete this, atleast in this pass
-                    if len(schema_dependency_map.get(schema_name, [])) > 0:
-                        self.__logger.info("Skipping {} as it is in use by {}".format(schema_name, schema_dependency_map[schema_name]))
-                        continue
-                    schema_path = os.path.join(self.__schema_dest_path, schema_file)
-                    self.__logger.info("Deleting {}".format(schema_path))
-                    os.remove(schema_path)
-                    deleted_schemas.add(schema_file)
-                    deleted_in_pass = True
-                    # Update the dependencies by using rev_schema_dependency_map
-                    for ext_ref in rev_schema_dependency_map[schema_name]:
-                        if ext_ref in schema_dependency_map:
-                            if schema_name in schema_dependency_map[ext_ref]:
-                                schema_dependency_map[ext_ref].remove(schema_name)
-            if not deleted_in_pass:
-                break
+        # An unimplemented schema can be deleted once every schema referencing it has been deleted
+        # Deleting a schema releases the schemas it references, so all deletions are found in a single pass over the graph
+        remaining_referrers = {schema_name: len(referenced_by.get(schema_name, [])) for schema_name in candidates}
+        deletable = collections.deque(sorted(schema_name for schema_name in candidates if remaining_referrers[schema_name] == 0))
+        deleted_schemas = set()
+        while deletable:
+            schema_name = deletable.popleft()
+            deleted_schemas.add(schema_name)
+            for schema_file in schema_files_map.get(schema_name, []):
+                self.__logger.info("Deleting {}".format(self.__workspace.get_dest_path(schema_file)))
+                self.__workspace.delete(schema_file)
+            for ref_schema in sorted(reference_graph.get(schema_name, [])):
+                if ref_schema in remaining_referrers:
+                    remaining_referrers[ref_schema] -= 1
+                    if remaining_referrers[ref_schema] == 0:
+                        deletable.append(ref_schema)
+
+        for schema_name in sorted(candidates.difference(deleted_schemas)):
+            if schema_name in schema_files_map:
+                self.__logger.info("Skipping {} as it is in use by {}".format(schema_name, sorted(referenced_by[schema_name].difference(deleted_schemas))))
 
 '''if __name__ == "__main__":
     with open("dmtf-config.json", "r") as fd:
@@ -1151,6 +1273,12 @@ class JSONSchemaConfigManager:
     cfgmgr.merge_configs()
     cfgmgr.write_config()'''
 
+def process_schema_configs_in_worker(cfgmgr, schema_files):
+    """
+    Applies the configuration to a share of the schemas in a worker process
+    """
+    return [cfgmgr.process_schema_config(schema_file) for schema_file in schema_files]
+
 #######
 
 class DMTFOemIntegrator:
@@ -1161,9 +1289,10 @@ class DMTFOemIntegrator:
         json_in_file_path: The path to Redfish JSON Schema files to reference
         json_out_file_path: The path to Redfish JSON Schema files which will be generated
         dmtf_oem_bindings: Config file with all dmtf-to-oem bindings
+        workers: The number of worker processes to use when applying the configuration to the schemas
     """
 
-    def __init__( self, json_in_file_path, json_out_file_path, config, logger: logging.Logger=None):
+    def __init__( self, json_in_file_path, json_out_file_path, config, logger: logging.Logger=None, workers=1):
         if logger:
             self.__logger = logger
         else:
@@ -1171,11 +1300,12 @@ class DMTFOemIntegrator:
         self.config = config
         self.json_in_file_path = json_in_file_path
         self.json_out_file_path = json_out_file_path
-        self.cfgmgr = JSONSchemaConfigManager(json_in_file_path, json_out_file_path, config)
+        self.workspace = JsonSchemaWorkspace(json_in_file_path, json_out_file_path, config["EnableNewAdditionsByDefault"], logger)
+        self.cfgmgr = JSONSchemaConfigManager(json_in_file_path, json_out_file_path, config, workspace=self.workspace)
         self.cfgmgr.generate_config()
         self.cfgmgr.merge_configs()
         self.cfgmgr.write_config()
-        self.cfgmgr.process_configs()
+        self.cfgmgr.process_configs(workers)
         oem_binding_file_path = config.get("OemBindingsFilePath", None)
         if oem_binding_file_path:
             with open(config["OemBindingsFilePath"]) as fd:
@@ -1192,10 +1322,16 @@ class DMTFOemIntegrator:
     def delete_unimplemented_schemas(self):
         self.cfgmgr.delete_unimplemented()
 
+    def write_schemas(self):
+        """
+        Write all the processed schemas to json_out_file_path
+        """
+        self.workspace.flush()
+
     def integrate_oems(self):
         """
         Process all the DMTF-Oem bindings.
-        Read files from json_out_file_path and overwrite the files
+        Modify the processed schemas in the workspace
         """
         def get_paths(d, path=[]):
             paths = []
@@ -1212,29 +1348,20 @@ class DMTFOemIntegrator:
                     self.__logger.info("Found OemAction extension for the %s resource" %(schema))
                     # Now Open the Json file and write it
                     file_pat = "%s.v" %schema
-                    for fname in sorted(os.listdir(self.json_out_file_path)):
+                    for fname in self.workspace.files():
                         try:
                             if fname.startswith(file_pat):
                                 self.__logger.info("Extending %s with OemActions %s" %(fname, ", ".join(sorted(binding.keys()))))
-                                in_schema_path = os.path.join(self.json_out_file_path, fname)
-                                out_schema_path = os.path.join(self.json_out_file_path, fname)
-                                with open(in_schema_path, "r") as fd:
-                                    jsonschema = json.load(fd)
+                                json_schema = self.workspace.get(fname)
                                 new_binding = {}
                                 for action_schema_name in binding:
                                     action_name = action_schema_name.split(".")[-1]
                                     old_ref = binding[action_schema_name]["$ref"]
                                     old_ref_file = old_ref.split("#",1)[0].rsplit("/",1)[-1]
-                                    old_ref_file_path = os.path.join(self.json_in_file_path, old_ref_file)
-
-                                    with open(old_ref_file_path) as fd:
-                                        old_ref_file_obj = json.load(fd)
-                                        action_ref_latest = old_ref_file_obj["definitions"][action_name]["anyOf"][-1]["$ref"]
-                                        new_binding[action_schema_name] = {"$ref":action_ref_latest}
-                                jsonschema["definitions"]["OemActions"]["properties"] = new_binding
-
-                                with open(out_schema_path, "w") as fd:
-                                    json.dump(jsonschema, fd, indent = 4, sort_keys=True, separators=(',', ': '))
+                                    old_ref_file_obj = self.workspace.get(old_ref_file).get_schema()
+                                    action_ref_latest = old_ref_file_obj["definitions"][action_name]["anyOf"][-1]["$ref"]
+                                    new_binding[action_schema_name] = {"$ref":action_ref_latest}
+                                json_schema.set_oem_actions(new_binding)
                         except Exception as e:
                             self.__logger.info("Unable to extend %s with OemActions %s: Exception (%s)" %(fname, ", ".join(sorted(binding.keys())), e))
                 elif prop == "Oem":
@@ -1269,19 +1396,12 @@ class DMTFOemIntegrator:
                                             }
                     # Now Open the Json file and write it
                     file_pat = "%s.v" %schema
-                    for fname in sorted(os.listdir(self.json_out_file_path)):
+                    for fname in self.workspace.files():
                         try:
                             if fname.startswith(file_pat):
                                 self.__logger.info("Extending %s with Oem %s" %(fname, key_name))
-                                in_schema_path = os.path.join(self.json_out_file_path, fname)
-                                out_schema_path = os.path.join(self.json_out_file_path, fname)
-                                with open(in_schema_path, "r") as fd:
-                                    jsonschema = json.load(fd)
-                                jsonschema["definitions"][key_name] = new_json_data
-                                jsonschema["definitions"][jsonschema["$ref"].rsplit("/",1)[-1]]["properties"]["Oem"]["$ref"] = "#/definitions/%s" %(key_name)
-
-                                with open(out_schema_path, "w") as fd:
-                                    json.dump(jsonschema, fd, indent = 4, sort_keys=True, separators=(',', ': '))
+                                json_schema = self.workspace.get(fname)
+                                json_schema.add_oem_definition(json_schema.get_schema()["$ref"].rsplit("/",1)[-1], key_name, new_json_data)
                         except Exception as e:
                             self.__logger.info("Unable to extend %s with Oem %s: Exception (%s)" %(fname, key_name, e))
                 elif prop == "Links":
@@ -1317,26 +1437,17 @@ class DMTFOemIntegrator:
                                                 }
                     # Now Open the Json file and write it
                     file_pat = "%s.v" %schema
-                    for fname in sorted(os.listdir(self.json_out_file_path)):
+                    for fname in self.workspace.files():
                         try:
                             if fname.startswith(file_pat):
                                 self.__logger.info("Extending %s with Oem %s" %(fname, key_name))
-                                in_schema_path = os.path.join(self.json_out_file_path, fname)
-                                out_schema_path = os.path.join(self.json_out_file_path, fname)
-                                with open(in_schema_path, "r") as fd:
-                                    jsonschema = json.load(fd)
-                                jsonschema["definitions"][key_name] = new_json_data
-                                jsonschema["definitions"]["Links"]["properties"]["Oem"]["$ref"] = "#/definitions/%s" %(key_name)
-
-                                with open(out_schema_path, "w") as fd:
-                                    json.dump(jsonschema, fd, indent = 4, sort_keys=True, separators=(',', ': '))
+                                self.workspace.get(fname).add_oem_definition("Links", key_name, new_json_data)
                         except Exception as e:
                             self.__logger.info("Unable to extend %s with Oem %s: Exception (%s)" %(fname, key_name, e))
                 else:
                     # Generic, traverse down the properties in the schema
                     # TODO: This logic below should be able to take care of all the if-elif cases above
                     self.__logger.info("Found generic Oem extension(s) for the %s resource" %(schema))
-                    schema_cache = {} # Use a cache to batch all the schema changes in one shot
                     file_pat = "%s.v" %schema
                     key_name = "%s_%s_Oem" %(schema, prop)
                     paths = get_paths(binding, [prop])
@@ -1363,16 +1474,11 @@ class DMTFOemIntegrator:
                                 keys_to_oem.append(k)
                             x = x[k]
                         key_name = "%s_%s_Oem" %(schema,"_".join(keys_to_oem))
-                        for fname in sorted(os.listdir(self.json_out_file_path)):
+                        for fname in self.workspace.files():
                             try:
                                 if fname.startswith(file_pat):
                                     self.__logger.info("Extending %s with Oem %s" %(fname, key_name))
-                                    in_schema_path = os.path.join(self.json_out_file_path, fname)
-                                    out_schema_path = os.path.join(self.json_out_file_path, fname)
-                                    json_schema = schema_cache.get(in_schema_path)
-                                    if json_schema == None:
-                                        json_schema = JsonSchemaConfigHelper(in_schema_path, out_schema_path)
-                                        schema_cache[in_schema_path] = json_schema
+                                    json_schema = self.workspace.get(fname)
                                     _prop_d = None
                                     referenced_type_to_modify = None
                                     parent_prop_d = None # Initial None will indicate it is a property in the root
@@ -1391,10 +1497,8 @@ class DMTFOemIntegrator:
 
     def inject_annotations(self):
         def load_supported_annotations():
-            annotation_file = os.path.join(self.json_out_file_path, "redfish-payload-annotations-v1.json")
             supported_annotations = {}
-            with open(annotation_file, "r") as fd:
-                data = json.load(fd)
+            data = self.workspace.get("redfish-payload-annotations-v1.json").get_schema()
             supported_annotations["properties"] = data["properties"]
             supported_annotations["patternProperties"] = data["patternProperties"]
             supported_annotations["patternRegexes"] = {}
@@ -1420,20 +1524,20 @@ class DMTFOemIntegrator:
             return
         supported_annotations = load_supported_annotations()
         json_schema_files_map = {} # Prefix  based map for faster lookup: ServiceRoot.v -> [ServiceRoot.v1_1_0.json, ServiceRoot.v1_2_0.json]
-        for f in sorted(os.listdir(self.json_out_file_path)):
+        for f in self.workspace.files():
             if not f.endswith(".json") or ".v" not in f:
                 continue
             schema_name = f.split(".v")[0]
             k = schema_name+".v"
             if k not in json_schema_files_map:
                 json_schema_files_map[k] = []
-            json_schema_files_map[k].append(os.path.join(self.json_out_file_path, f))
+            json_schema_files_map[k].append(f)
         for schema_name, annotation_details in self.__annotations.items():
             schema_key = schema_name + ".v"
             if schema_key not in json_schema_files_map:
                 continue
             for f in json_schema_files_map[schema_key]:
-                json_schema = JsonSchemaConfigHelper(f, f)
+                json_schema = self.workspace.get(f)
                 for target, annotation in annotation_details.items():
                     for annotation_prop in annotation:
                         annotation_detail = get_annotation_details(supported_annotations, annotation_prop)
@@ -1450,6 +1554,7 @@ def main(logger):
     arg_get.add_argument( "--input", "-I", type = str, required = True, help = "The folder containing the JSON files to convert" )
     arg_get.add_argument( "--output", "-O",  type = str, required = True, help = "The folder to write the OEM integrated JSON files" )
     arg_get.add_argument( "--config", "-C", type = str, help = "The configuration file containing various OEM bindings in JSON format" )
+    arg_get.add_argument( "--workers", "-J", type = int, default = 1, help = "The number of worker processes to use when applying the configuration to the schemas (default is 1)" )
     args = arg_get.parse_args()
 
     # Create the output directory (if needed)
@@ -1475,11 +1580,12 @@ def main(logger):
             sys.exit( 1 )
 
     # Step through each file in the input directory
-    integrator = DMTFOemIntegrator(args.input, args.output, config_data, logger)
+    integrator = DMTFOemIntegrator(args.input, args.output, config_data, logger, args.workers)
     integrator.integrate_oems()
     integrator.inject_annotations()
     if config_data.get("DeleteUnimplementedSchemas", False):
         integrator.delete_unimplemented_schemas()
+    integrator.write_schemas()
     return 0
 
 if __name__ == '__main__':